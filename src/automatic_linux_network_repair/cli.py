@@ -7,7 +7,7 @@ from rich.console import Console
 
 from automatic_linux_network_repair import systemd_panel
 from automatic_linux_network_repair.eth_repair.cli import DEFAULT_RUNNER
-from automatic_linux_network_repair.systemd_validation import validate_systemd_tree
+from automatic_linux_network_repair.systemd_validation import SYSTEMD_VERIFY_CACHE, validate_systemd_tree
 from automatic_linux_network_repair.wifi import SecurityType, WirelessManager
 
 
@@ -255,10 +255,18 @@ class NetworkRepairCLI:
             "-p",
             help="Path to the systemd configuration directory to validate.",
         ),
+        cache: bool = typer.Option(
+            False,
+            "--cache",
+            help=(
+                "Reuse verdicts for unit files unchanged since the last cached run. "
+                "Changes to drop-ins, referenced units or binaries are not detected."
+            ),
+        ),
     ) -> None:
         """Validate systemd unit files when systemd tools are installed."""
 
-        report = validate_systemd_tree(base_dir=path)
+        report = validate_systemd_tree(base_dir=path, cache_path=SYSTEMD_VERIFY_CACHE if cache else None)
 
         for issue in report.config_issues:
             typer.echo(f"[CONFIG] {issue}", err=True)
@@ -2,19 +2,46 @@
 
 from __future__ import annotations
 
+from collections.abc import Callable
+
 from automatic_linux_network_repair.eth_repair.logging_utils import DEFAULT_LOGGER
+from automatic_linux_network_repair.eth_repair.probes import invalidate_iface_cache, invalidate_managers_cache
 from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL
 
+# systemctl verbs that can change which network managers are active.
+_SYSTEMCTL_STATE_VERBS = frozenset({"restart", "start", "stop", "enable", "disable"})
+# Commands that can add, remove or rename links.
+_LINK_CHANGING_COMMANDS = frozenset({"ifup", "ifdown", "dhclient"})
+
+
+def apply_action(
+    desc: str,
+    cmd: list[str],
+    dry_run: bool,
+    *,
+    verify: Callable[[], bool] | None = None,
+) -> bool:
+    """Run a repair command, optionally confirming its effect afterwards.
 
-def apply_action(desc: str, cmd: list[str], dry_run: bool) -> bool:
+    Without ``verify`` the result reflects the command's exit status (dry runs
+    count as success). With ``verify`` the callback runs once after the command,
+    whatever its exit status, and its result is returned; dry runs return False
+    because nothing was changed that could be verified.
+    """
     DEFAULT_LOGGER.log(f"[ACTION] {desc}")
     DEFAULT_LOGGER.log(f"         {DEFAULT_SHELL.cmd_str(cmd)}")
     if dry_run:
-        return True
+        return verify is None
     res = DEFAULT_SHELL.run_cmd(cmd, timeout=20)
-    if res.returncode != 0:
+    if cmd[0] == "systemctl" and len(cmd) > 1 and cmd[1] in _SYSTEMCTL_STATE_VERBS:
+        invalidate_managers_cache()
+    if cmd[0] in _LINK_CHANGING_COMMANDS or cmd[:3] == ["ip", "link", "set"]:
+        invalidate_iface_cache()
+    ok = res.returncode == 0
+    if not ok:
         DEFAULT_LOGGER.log(
             f"[WARN] Action failed (rc={res.returncode}): {DEFAULT_SHELL.cmd_str(cmd)} stderr={res.stderr.strip()}",
         )
-        return False
-    return True
+    if verify is not None:
+        return verify()
+    return ok
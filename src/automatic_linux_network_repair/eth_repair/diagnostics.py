@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 from automatic_linux_network_repair.eth_repair.dns_config import (
     detect_resolv_conf_mode,
     systemd_resolved_status,
@@ -10,12 +12,17 @@ from automatic_linux_network_repair.eth_repair.logging_utils import DEFAULT_LOGG
 from automatic_linux_network_repair.eth_repair.probes import (
     dns_resolves,
     has_default_route,
-    interface_exists,
-    interface_has_ipv4,
-    interface_link_up,
     ping_host,
+    probe_iface,
+)
+from automatic_linux_network_repair.eth_repair.types import (
+    RESOLV_CONF_MODE_VALUE_STR,
+    Diagnosis,
+    ResolvConfMode,
+    Suspicion,
 )
-from automatic_linux_network_repair.eth_repair.types import Diagnosis, ResolvConfMode, Suspicion
+
+_PROBE_WORKERS = 8
 
 
 def fuzzy_diagnose(iface: str) -> Diagnosis:
@@ -28,20 +35,35 @@ def fuzzy_diagnose(iface: str) -> Diagnosis:
         Suspicion.DNS_BROKEN: 0.0,
     }
 
-    exists = interface_exists(iface)
-    link_up = interface_link_up(iface) if exists else False
-    has_ip = interface_has_ipv4(iface) if exists else False
-    default_route = has_default_route()
-    can_ping_ip = ping_host("8.8.8.8")
-    can_resolve = dns_resolves()
+    # The interface probe is cheap; checking it first avoids paying for the
+    # ping/DNS timeouts when there is no interface to repair.
+    snapshot = probe_iface(iface)
+    if not snapshot.exists:
+        DEFAULT_LOGGER.debug("Diag raw: exists=False iface=%s", iface)
+        scores[Suspicion.INTERFACE_MISSING] = 1.0
+        return Diagnosis(iface, scores)
+
+    # The remaining probes are independent, mostly I/O-bound calls; run them
+    # concurrently so the total wait is roughly the slowest probe (ping).
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as executor:
+        route_future = executor.submit(has_default_route)
+        ping_future = executor.submit(ping_host, "8.8.8.8")
+        dns_future = executor.submit(dns_resolves)
+        sd_future = executor.submit(systemd_resolved_status)
+        rc_future = executor.submit(detect_resolv_conf_mode)
+
+        default_route = route_future.result()
+        can_ping_ip = ping_future.result()
+        can_resolve = dns_future.result()
+        sd_status = sd_future.result()
+        rc_mode, rc_detail = rc_future.result()
 
-    sd_status = systemd_resolved_status()
-    rc_mode, rc_detail = detect_resolv_conf_mode()
+    link_up = snapshot.link_up
+    has_ip = bool(snapshot.ipv4)
 
     DEFAULT_LOGGER.debug(
-        "Diag raw: exists=%s link_up=%s has_ip=%s default_route=%s "
+        "Diag raw: exists=True link_up=%s has_ip=%s default_route=%s "
         "ping_ip=%s dns=%s sd_active=%s sd_enabled=%s rc_mode=%s rc_detail=%s",
-        exists,
         link_up,
         has_ip,
         default_route,
@@ -49,14 +71,10 @@ def fuzzy_diagnose(iface: str) -> Diagnosis:
         can_resolve,
         sd_status["active"],
         sd_status["enabled"],
-        rc_mode.value,
+        RESOLV_CONF_MODE_VALUE_STR[rc_mode],
         rc_detail,
     )
 
-    if not exists:
-        scores[Suspicion.INTERFACE_MISSING] = 1.0
-        return Diagnosis(iface, scores)
-
     if not link_up:
         scores[Suspicion.LINK_DOWN] = 0.8
 
@@ -3,37 +3,86 @@
 from __future__ import annotations
 
 import os
+import time
 
 from automatic_linux_network_repair.eth_repair.actions import apply_action
 from automatic_linux_network_repair.eth_repair.logging_utils import DEFAULT_LOGGER
-from automatic_linux_network_repair.eth_repair.probes import read_resolv_conf_summary
+from automatic_linux_network_repair.eth_repair.probes import dbus_unit_properties, read_resolv_conf_summary
 from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL
-from automatic_linux_network_repair.eth_repair.types import ResolvConfMode
+from automatic_linux_network_repair.eth_repair.types import RESOLV_CONF_MODE_VALUE_STR, ResolvConfMode
+
+_RESOLV_CONF_PATH = "/etc/resolv.conf"
+_MANUAL_RESOLV_CONF = "nameserver 1.1.1.1\nnameserver 8.8.8.8\n"
+
+# UnitFileState values that `systemctl is-enabled` reports with exit 0; every
+# other state, including the empty one of a missing unit, exits non-zero.
+_ENABLED_UNIT_FILE_STATES = frozenset(
+    {"enabled", "enabled-runtime", "static", "alias", "indirect", "generated", "transient"}
+)
+
+_DNS_STATUS_TTL = 2.0
+_RESOLVED_STATUS_CACHE: tuple[float, dict[str, bool | None]] | None = None
+_RESOLV_CONF_MODE_CACHE: tuple[float, tuple[ResolvConfMode, str]] | None = None
+
+
+def invalidate_dns_status_cache() -> None:
+    """Forget cached systemd-resolved and resolv.conf state after a change."""
+    global _RESOLVED_STATUS_CACHE, _RESOLV_CONF_MODE_CACHE
+    _RESOLVED_STATUS_CACHE = None
+    _RESOLV_CONF_MODE_CACHE = None
 
 
 def systemd_resolved_status() -> dict[str, bool | None]:
-    """Return dict with keys: active (bool), enabled (bool or None if unknown)."""
-    active_res = DEFAULT_SHELL.run_cmd(["systemctl", "is-active", "systemd-resolved"])
-    enabled_res = DEFAULT_SHELL.run_cmd(["systemctl", "is-enabled", "systemd-resolved"])
-
-    active = active_res.returncode == 0
-    enabled: bool | None
-    if enabled_res.returncode == 0:
-        enabled = True
-    elif enabled_res.returncode == 1:
-        enabled = False
-    else:
-        enabled = None
+    """Return dict with keys: active (bool), enabled (bool or None if unknown).
 
-    return {"active": active, "enabled": enabled}
+    ``enabled`` is None only when the unit properties could not be read.
+    Results are reused for ``_DNS_STATUS_TTL`` seconds; treat them as read-only.
+    """
+    global _RESOLVED_STATUS_CACHE
+    now = time.monotonic()
+    if _RESOLVED_STATUS_CACHE is not None and now - _RESOLVED_STATUS_CACHE[0] < _DNS_STATUS_TTL:
+        return _RESOLVED_STATUS_CACHE[1]
+
+    props = dbus_unit_properties("systemd-resolved", ("ActiveState", "UnitFileState"))
+    if props is None:
+        res = DEFAULT_SHELL.run_cmd(
+            ["systemctl", "show", "-p", "ActiveState,UnitFileState", "systemd-resolved"],
+        )
+        if res.returncode == 0:
+            props = {}
+            for line in res.stdout.splitlines():
+                key, _, value = line.partition("=")
+                props[key] = value.strip()
+
+    enabled: bool | None = None
+    active = False
+    if props is not None:
+        active = props.get("ActiveState") == "active"
+        enabled = props.get("UnitFileState", "") in _ENABLED_UNIT_FILE_STATES
+
+    status: dict[str, bool | None] = {"active": active, "enabled": enabled}
+    _RESOLVED_STATUS_CACHE = (now, status)
+    return status
 
 
 def detect_resolv_conf_mode() -> tuple[ResolvConfMode, str]:
     """
     Detect how /etc/resolv.conf is wired.
     Returns (mode, detail), where detail is target path or explanation.
+    Results are reused for ``_DNS_STATUS_TTL`` seconds.
     """
-    path = "/etc/resolv.conf"
+    global _RESOLV_CONF_MODE_CACHE
+    now = time.monotonic()
+    if _RESOLV_CONF_MODE_CACHE is not None and now - _RESOLV_CONF_MODE_CACHE[0] < _DNS_STATUS_TTL:
+        return _RESOLV_CONF_MODE_CACHE[1]
+
+    result = _detect_resolv_conf_mode_uncached()
+    _RESOLV_CONF_MODE_CACHE = (now, result)
+    return result
+
+
+def _detect_resolv_conf_mode_uncached() -> tuple[ResolvConfMode, str]:
+    path = _RESOLV_CONF_PATH
 
     if not os.path.exists(path):
         return (ResolvConfMode.OTHER, "[missing]")
@@ -50,35 +99,50 @@ def detect_resolv_conf_mode() -> tuple[ResolvConfMode, str]:
 
 
 def backup_resolv_conf(dry_run: bool) -> None:
-    if not os.path.exists("/etc/resolv.conf"):
+    if not os.path.exists(_RESOLV_CONF_PATH):
         return
+    backup_path = f"{_RESOLV_CONF_PATH}.bak"
     apply_action(
-        "Backup /etc/resolv.conf to /etc/resolv.conf.bak",
-        ["cp", "/etc/resolv.conf", "/etc/resolv.conf.bak"],
+        f"Backup {_RESOLV_CONF_PATH} to {backup_path}",
+        ["cp", _RESOLV_CONF_PATH, backup_path],
         dry_run,
     )
+    invalidate_dns_status_cache()
 
 
 def set_resolv_conf_symlink(target: str, dry_run: bool) -> None:
     backup_resolv_conf(dry_run)
     apply_action(
-        f"Point /etc/resolv.conf symlink to {target}",
-        ["ln", "-sf", target, "/etc/resolv.conf"],
+        f"Point {_RESOLV_CONF_PATH} symlink to {target}",
+        ["ln", "-sf", target, _RESOLV_CONF_PATH],
         dry_run,
     )
+    invalidate_dns_status_cache()
 
 
 def set_resolv_conf_manual_public(dry_run: bool) -> None:
+    """Replace /etc/resolv.conf with a static file pointing at public resolvers.
+
+    The file is written in-process to a sibling temp file and renamed over the
+    original, so a stub symlink is replaced rather than written through.
+    """
     backup_resolv_conf(dry_run)
-    apply_action(
-        "Write manual resolv.conf (1.1.1.1 / 8.8.8.8)",
-        [
-            "bash",
-            "-c",
-            ("printf '%s\n' 'nameserver 1.1.1.1' 'nameserver 8.8.8.8' > /etc/resolv.conf"),
-        ],
-        dry_run,
-    )
+    DEFAULT_LOGGER.log("[ACTION] Write manual resolv.conf (1.1.1.1 / 8.8.8.8)")
+    DEFAULT_LOGGER.log(f"         write {_RESOLV_CONF_PATH}")
+    if dry_run:
+        return
+    tmp_path = f"{_RESOLV_CONF_PATH}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="ascii") as fh:
+            fh.write(_MANUAL_RESOLV_CONF)
+        os.replace(tmp_path, _RESOLV_CONF_PATH)
+    except OSError as exc:
+        DEFAULT_LOGGER.log(f"[WARN] Action failed: write {_RESOLV_CONF_PATH}: {exc}")
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+    invalidate_dns_status_cache()
 
 
 def set_systemd_resolved_enabled(enabled: bool, dry_run: bool) -> None:
@@ -94,19 +158,35 @@ def set_systemd_resolved_enabled(enabled: bool, dry_run: bool) -> None:
             ["systemctl", "disable", "--now", "systemd-resolved"],
             dry_run,
         )
+    invalidate_dns_status_cache()
+
+
+def resolved_status_lines(status: dict[str, bool | None]) -> list[str]:
+    """Format systemd-resolved state the same way for every status report."""
+    return [
+        f"systemd-resolved active : {status['active']}",
+        f"systemd-resolved enabled: {status['enabled']}",
+    ]
+
+
+def resolv_conf_mode_line(mode: ResolvConfMode, detail: str) -> str:
+    """Format the resolv.conf mode aligned with :func:`resolved_status_lines`."""
+    return f"{_RESOLV_CONF_PATH} mode   : {RESOLV_CONF_MODE_VALUE_STR[mode]} ({detail})"
 
 
 def show_systemd_dns_status() -> None:
     status = systemd_resolved_status()
     mode, detail = detect_resolv_conf_mode()
 
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("=== systemd / DNS status ===")
-    DEFAULT_LOGGER.log(f"systemd-resolved active : {status['active']}")
-    DEFAULT_LOGGER.log(f"systemd-resolved enabled: {status['enabled']}")
-    DEFAULT_LOGGER.log(f"/etc/resolv.conf mode   : {mode.value} ({detail})")
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("/etc/resolv.conf (first lines):")
-    for line in read_resolv_conf_summary():
-        DEFAULT_LOGGER.log(f"  {line}")
-    DEFAULT_LOGGER.log("=======================================")
+    DEFAULT_LOGGER.log_block(
+        [
+            "",
+            "=== systemd / DNS status ===",
+            *resolved_status_lines(status),
+            resolv_conf_mode_line(mode, detail),
+            "",
+            f"{_RESOLV_CONF_PATH} (first lines):",
+            *(f"  {line}" for line in read_resolv_conf_summary()),
+            "=======================================",
+        ]
+    )
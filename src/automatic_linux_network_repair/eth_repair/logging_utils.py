@@ -44,6 +44,17 @@ class LoggingManager:
         """Log an informational message."""
         self.logger.info(msg)
 
+    def log_block(self, lines: list[str]) -> None:
+        """Log several informational lines, one record per line.
+
+        Each line gets its own record so the timestamp and level prefix
+        appear on every line of the console and file output.
+        """
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        for line in lines:
+            self.logger.info(line)
+
     def debug(self, msg: str, *args: object) -> None:
         """Log a debug message with optional formatting arguments."""
         self.logger.debug(msg, *args)
@@ -132,8 +132,9 @@ class EthernetRepairMenu:
                 repair_no_ipv4(self.current_iface, managers, self.dry_run)
                 show_status(self.current_iface)
             elif choice == "5":
-                repair_no_route(self.dry_run)
-                repair_no_internet(self.dry_run)
+                managers = detect_network_managers()
+                repair_no_route(self.dry_run, managers)
+                repair_no_internet(self.dry_run, managers)
                 show_status(self.current_iface)
             elif choice == "6":
                 repair_dns_interactive(self.dry_run)
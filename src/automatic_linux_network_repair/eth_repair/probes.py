@@ -2,52 +2,176 @@
 
 from __future__ import annotations
 
-import shutil
+import os
+import re
+import socket
+import struct
+import threading
+import time
+from collections.abc import Sequence
+from typing import Any
 
 from automatic_linux_network_repair.eth_repair.logging_utils import DEFAULT_LOGGER
-from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL
+from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, which
+from automatic_linux_network_repair.eth_repair.types import IfaceSnapshot, NetworkManagers
 
+_UNSET = object()
+# Shared pyroute2 IPRoute socket once opened, None when pyroute2 is unusable.
+_NETLINK: Any = _UNSET
+# IPRoute is not safe for concurrent requests from the probe thread pool.
+_NETLINK_LOCK = threading.Lock()
 
-def interface_exists(iface: str) -> bool:
-    res = DEFAULT_SHELL.run_cmd(["ip", "link", "show", "dev", iface])
-    return res.returncode == 0
 
+def _netlink() -> Any:
+    global _NETLINK
+    with _NETLINK_LOCK:
+        if _NETLINK is _UNSET:
+            try:
+                from pyroute2 import IPRoute
 
-def interface_link_up(iface: str) -> bool:
-    res = DEFAULT_SHELL.run_cmd(["ip", "link", "show", "dev", iface])
-    if res.returncode != 0:
-        return False
-    for line in res.stdout.splitlines():
-        if "state UP" in line:
-            return True
-    return False
+                _NETLINK = IPRoute()
+            except (ImportError, OSError):
+                _NETLINK = None
+    return _NETLINK
 
 
-def interface_ip_addrs(iface: str, family: int) -> list[str]:
-    """Return a list of IP address strings for iface."""
-    if family == 4:
-        res = DEFAULT_SHELL.run_cmd(["ip", "-4", "addr", "show", "dev", iface])
-    else:
-        res = DEFAULT_SHELL.run_cmd(["ip", "-6", "addr", "show", "dev", iface])
+def _probe_iface_netlink(nl: Any, iface: str) -> IfaceSnapshot | None:
+    """Build an IfaceSnapshot from one netlink link + address dump, or None on error."""
+    try:
+        with _NETLINK_LOCK:
+            indices = nl.link_lookup(ifname=iface)
+            if not indices:
+                return IfaceSnapshot(iface=iface, exists=False)
+            links = nl.get_links(indices[0])
+            addrs = nl.get_addr(index=indices[0])
+    except Exception as exc:  # noqa: BLE001 - fall back to ip on any netlink error
+        DEFAULT_LOGGER.debug(f"netlink probe for {iface} failed: {exc}")
+        return None
+
+    link_up = bool(links) and links[0].get_attr("IFLA_OPERSTATE") == "UP"
+    ipv4: list[str] = []
+    ipv6: list[str] = []
+    for msg in addrs:
+        cidr = f"{msg.get_attr('IFA_ADDRESS')}/{msg['prefixlen']}"
+        if msg["family"] == socket.AF_INET:
+            ipv4.append(cidr)
+        elif msg["family"] == socket.AF_INET6:
+            ipv6.append(cidr)
+    return IfaceSnapshot(iface=iface, exists=True, link_up=link_up, ipv4=tuple(ipv4), ipv6=tuple(ipv6))
+
+
+def probe_iface(iface: str) -> IfaceSnapshot:
+    """Return existence, link state and addresses of iface in one query.
+
+    An invalid name, or one sysfs does not list, is reported missing without
+    any query. With pyroute2 installed this is a netlink dump. Otherwise ``ip
+    addr show dev`` prints the link line (carrying ``state UP``) followed by
+    the ``inet``/``inet6`` address lines, and fails when iface is absent.
+    """
+    if not _valid_iface_name(iface) or _sysfs_lacks_iface(iface):
+        return IfaceSnapshot(iface=iface, exists=False)
+
+    nl = _netlink()
+    if nl is not None:
+        snapshot = _probe_iface_netlink(nl, iface)
+        if snapshot is not None:
+            return snapshot
 
+    res = DEFAULT_SHELL.run_cmd(["ip", "addr", "show", "dev", iface])
     if res.returncode != 0:
-        return []
+        return IfaceSnapshot(iface=iface, exists=False)
 
-    addrs: list[str] = []
+    link_up = False
+    ipv4: list[str] = []
+    ipv6: list[str] = []
     for line in res.stdout.splitlines():
-        line = line.strip()
-        if line.startswith("inet ") or line.startswith("inet6 "):
-            parts = line.split()
+        stripped = line.strip()
+        if stripped.startswith("inet "):
+            parts = stripped.split()
+            if len(parts) >= 2:
+                ipv4.append(parts[1])
+        elif stripped.startswith("inet6 "):
+            parts = stripped.split()
             if len(parts) >= 2:
-                addrs.append(parts[1])
-    return addrs
+                ipv6.append(parts[1])
+        elif "state UP" in line:
+            link_up = True
+
+    return IfaceSnapshot(iface=iface, exists=True, link_up=link_up, ipv4=tuple(ipv4), ipv6=tuple(ipv6))
+
+
+_SYS_CLASS_NET = "/sys/class/net"
+_PROC_NET_ROUTE = "/proc/net/route"
+_RTF_UP = 0x1
+
+
+def _valid_iface_name(iface: str) -> bool:
+    # Kernel interface names never contain "/" and are never "." or "..";
+    # rejecting those also keeps sysfs lookups inside _SYS_CLASS_NET.
+    return bool(iface) and "/" not in iface and iface not in (".", "..")
+
+
+def _sysfs_lacks_iface(iface: str) -> bool:
+    """Return True when sysfs is mounted and has no entry for iface."""
+    return not os.path.isdir(os.path.join(_SYS_CLASS_NET, iface)) and os.path.isdir(_SYS_CLASS_NET)
+
+
+def interface_exists(iface: str) -> bool:
+    """Return whether iface exists, from sysfs when it is mounted."""
+    if not _valid_iface_name(iface):
+        return False
+    if os.path.isdir(_SYS_CLASS_NET):
+        return os.path.isdir(os.path.join(_SYS_CLASS_NET, iface))
+    return probe_iface(iface).exists
+
+
+def interface_link_up(iface: str) -> bool:
+    """Return whether iface is operationally up, from sysfs when available."""
+    if not _valid_iface_name(iface):
+        return False
+    try:
+        with open(os.path.join(_SYS_CLASS_NET, iface, "operstate"), encoding="ascii") as fh:
+            return fh.read().strip() == "up"
+    except OSError:
+        return probe_iface(iface).link_up
+
+
+def interface_ip_addrs(iface: str, family: int) -> list[str]:
+    """Return a list of IP address strings for iface."""
+    snapshot = probe_iface(iface)
+    return list(snapshot.ipv4 if family == 4 else snapshot.ipv6)
 
 
 def interface_has_ipv4(iface: str) -> bool:
-    return bool(interface_ip_addrs(iface, family=4))
+    return bool(probe_iface(iface).ipv4)
 
 
 def has_default_route() -> bool:
+    """Return whether the main table has an IPv4 default route.
+
+    Reads ``/proc/net/route`` (destination and mask both ``00000000``) and only
+    falls back to netlink, then ``ip route``, when procfs is unavailable.
+    """
+    try:
+        with open(_PROC_NET_ROUTE, encoding="ascii") as fh:
+            next(fh, None)  # header
+            for line in fh:
+                fields = line.split()
+                if len(fields) >= 8 and fields[1] == "00000000" and fields[7] == "00000000":
+                    if int(fields[3], 16) & _RTF_UP:
+                        return True
+        return False
+    except (OSError, ValueError):
+        pass
+
+    nl = _netlink()
+    if nl is not None:
+        try:
+            with _NETLINK_LOCK:
+                return any(True for _ in nl.get_default_routes(family=socket.AF_INET))
+        except Exception as exc:  # noqa: BLE001 - fall back to ip on any netlink error
+            DEFAULT_LOGGER.debug(f"netlink default route query failed: {exc}")
+
     res = DEFAULT_SHELL.run_cmd(["ip", "route", "show", "default"])
     if res.returncode != 0:
         return False
@@ -57,44 +181,177 @@ def has_default_route() -> bool:
     return False
 
 
-def ping_host(host: str, count: int = 1, timeout: int = 3) -> bool:
-    res = DEFAULT_SHELL.run_cmd(
-        ["ping", "-c", str(count), "-w", str(timeout), host],
-        timeout=timeout + 1,
-    )
-    return res.returncode == 0
+_ICMP_ECHO_REQUEST = 8
+_ICMP_ECHO_REPLY = 0
+_TCP_FALLBACK_PORT = 53
+_TCP_FALLBACK_TIMEOUT = 1.5
 
 
-def dns_resolves(name: str = "deb.debian.org") -> bool:
-    res = DEFAULT_SHELL.run_cmd(["getent", "hosts", name])
-    if res.returncode != 0:
+def _icmp_checksum(data: bytes) -> int:
+    """Return the RFC 1071 internet checksum of data."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def _icmp_ping(host: str, count: int, timeout: float) -> bool:
+    """Send ICMP echo requests over an unprivileged datagram socket.
+
+    Raises OSError (typically PermissionError) when the kernel does not allow
+    ping sockets for this user (see ``net.ipv4.ping_group_range``).
+    """
+    deadline = time.monotonic() + timeout
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP) as sock:
+        for seq in range(1, count + 1):
+            header = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, 0, 0, seq)
+            payload = b"eth_repair-ping!"
+            checksum = _icmp_checksum(header + payload)
+            packet = struct.pack("!BBHHH", _ICMP_ECHO_REQUEST, 0, checksum, 0, seq) + payload
+            sock.sendto(packet, (host, 0))
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            sock.settimeout(remaining)
+            try:
+                reply, _ = sock.recvfrom(1024)
+            except TimeoutError:
+                return False
+            if reply and reply[0] == _ICMP_ECHO_REPLY:
+                return True
+
+
+def _tcp_reachable(host: str) -> bool:
+    try:
+        with socket.create_connection((host, _TCP_FALLBACK_PORT), timeout=_TCP_FALLBACK_TIMEOUT):
+            return True
+    except OSError:
         return False
-    return bool(res.stdout.strip())
 
 
-def detect_network_managers() -> dict[str, bool]:
-    managers = {
-        "NetworkManager": False,
-        "systemd-networkd": False,
-        "ifupdown": False,
-    }
+def ping_host(host: str, count: int = 1, timeout: int = 3) -> bool:
+    """Return True when host answers an ICMP echo within timeout seconds.
+
+    Uses an in-process ping socket instead of forking ``ping``; when ping sockets
+    are not permitted, a TCP connect to port 53 serves as the reachability check.
+    """
+    try:
+        return _icmp_ping(host, count, timeout)
+    except OSError as exc:
+        DEFAULT_LOGGER.debug(f"ICMP ping to {host} unavailable ({exc}); falling back to TCP/{_TCP_FALLBACK_PORT}")
+    return _tcp_reachable(host)
+
+
+def dns_resolves(name: str = "deb.debian.org", timeout: float = 3.0) -> bool:
+    """Return True when the system resolver answers for name within timeout.
+
+    ``getaddrinfo`` has no timeout of its own, so it runs on a daemon thread.
+    A lookup that hangs past timeout leaves that thread behind, and being a
+    daemon it does not hold up interpreter exit.
+    """
+    done = threading.Event()
+    answered: list[bool] = []
+
+    def _lookup() -> None:
+        try:
+            answered.append(bool(socket.getaddrinfo(name, None, type=socket.SOCK_STREAM)))
+        except OSError:
+            pass
+        finally:
+            done.set()
+
+    threading.Thread(target=_lookup, name="dns-resolves", daemon=True).start()
+    return done.wait(timeout) and bool(answered) and answered[0]
+
+
+# pystemd.systemd1.Unit once imported, None when pystemd is not installed.
+_PYSTEMD_UNIT: Any = _UNSET
+
+
+def _pystemd_unit_class() -> Any:
+    global _PYSTEMD_UNIT
+    if _PYSTEMD_UNIT is _UNSET:
+        try:
+            from pystemd.systemd1 import Unit
+        except ImportError:
+            Unit = None
+        _PYSTEMD_UNIT = Unit
+    return _PYSTEMD_UNIT
+
+
+def dbus_unit_properties(unit: str, props: Sequence[str]) -> dict[str, str] | None:
+    """Read systemd unit properties over D-Bus when pystemd is installed.
+
+    Returns None when pystemd is missing or the bus call fails, so callers can
+    fall back to ``systemctl``.
+    """
+    unit_cls = _pystemd_unit_class()
+    if unit_cls is None:
+        return None
+    name = unit if "." in unit else f"{unit}.service"
+    try:
+        loaded = unit_cls(name.encode(), _autoload=True)
+        values = {prop: getattr(loaded.Unit, prop) for prop in props}
+    except Exception as exc:  # noqa: BLE001 - any bus error means "use systemctl"
+        DEFAULT_LOGGER.debug(f"D-Bus query for {name} failed: {exc}")
+        return None
+    return {prop: value.decode() if isinstance(value, bytes) else str(value) for prop, value in values.items()}
+
+
+def units_active(units: list[str]) -> dict[str, bool]:
+    """Return the active state of several systemd units via one systemctl call.
+
+    With pystemd installed the states are read over D-Bus instead. Otherwise
+    ``systemctl is-active`` prints one state per unit in argument order; its
+    exit status only reflects whether *all* units are active, so the state of
+    each unit is read from stdout instead.
+    """
+    bus_states = [dbus_unit_properties(unit, ("ActiveState",)) for unit in units]
+    if all(props is not None for props in bus_states):
+        return {unit: props["ActiveState"] == "active" for unit, props in zip(units, bus_states, strict=True)}
+
+    res = DEFAULT_SHELL.run_cmd(["systemctl", "is-active", *units])
+    states = res.stdout.splitlines()
+    return {unit: idx < len(states) and states[idx].strip() == "active" for idx, unit in enumerate(units)}
+
+
+_MGR_TTL = 5.0
+_MGR_CACHE: tuple[float, NetworkManagers] | None = None
+
+
+def invalidate_managers_cache() -> None:
+    """Forget cached network manager state (e.g. after restarting a service)."""
+    global _MGR_CACHE
+    _MGR_CACHE = None
 
-    nm = DEFAULT_SHELL.run_cmd(["systemctl", "is-active", "NetworkManager"])
-    managers["NetworkManager"] = nm.returncode == 0
 
-    sn = DEFAULT_SHELL.run_cmd(["systemctl", "is-active", "systemd-networkd"])
-    managers["systemd-networkd"] = sn.returncode == 0
+def detect_network_managers() -> NetworkManagers:
+    """Return available network managers, cached for ``_MGR_TTL`` seconds."""
+    global _MGR_CACHE
+    now = time.monotonic()
+    if _MGR_CACHE is not None and now - _MGR_CACHE[0] < _MGR_TTL:
+        return _MGR_CACHE[1]
 
-    managers["ifupdown"] = shutil.which("ifup") is not None
+    active = units_active(["NetworkManager", "systemd-networkd"])
+    managers = NetworkManagers(
+        network_manager=active["NetworkManager"],
+        systemd_networkd=active["systemd-networkd"],
+        ifupdown=which("ifup") is not None,
+    )
 
     DEFAULT_LOGGER.debug(f"Network managers detected: {managers}")
+    _MGR_CACHE = (now, managers)
     return managers
 
 
 def tailscale_status() -> dict[str, bool]:
     """Return whether Tailscale is installed and whether tailscaled is active."""
 
-    installed = shutil.which("tailscale") is not None
+    installed = which("tailscale") is not None
     active = False
 
     if installed:
@@ -109,12 +366,15 @@ def tailscale_status() -> dict[str, bool]:
 def detect_active_vpn_services() -> list[str]:
     """Return a sorted list of running VPN-related systemd services."""
 
-    res = DEFAULT_SHELL.run_cmd(["systemctl", "list-units", "--type=service", "--state=running"])
+    keywords = ("vpn", "wireguard", "wg-quick", "zerotier")
+    patterns = [f"*{keyword}*" for keyword in keywords]
+    res = DEFAULT_SHELL.run_cmd(
+        ["systemctl", "list-units", "--type=service", "--state=running", "--no-legend", "--plain", *patterns]
+    )
     if res.returncode != 0 or not res.stdout:
         DEFAULT_LOGGER.debug(f"VPN service detection failed rc={res.returncode}: {res.stderr!r}")
         return []
 
-    keywords = ("vpn", "wireguard", "wg-quick", "zerotier")
     matches: set[str] = set()
 
     for line in res.stdout.splitlines():
@@ -135,52 +395,58 @@ def detect_active_vpn_services() -> list[str]:
     return detected
 
 
+_IFACE_TTL = 2.0
+_IFACE_CACHE: tuple[float, list[str]] | None = None
+_SKIP_IFACE_RE = re.compile(r"(?:veth|docker|br-|virbr|wg|tun|tap)")
+_WIRED_PREFIXES = ("eth", "en", "em")
+_WIRELESS_PREFIXES = ("wlan", "wl")
+
+
+def _iface_priority(iface: str) -> tuple[int, str]:
+    if iface.startswith(_WIRED_PREFIXES):
+        return (0, iface)
+    if iface.startswith(_WIRELESS_PREFIXES):
+        return (1, iface)
+    return (2, iface)
+
+
+def invalidate_iface_cache() -> None:
+    """Forget the cached candidate interface list (e.g. after ifup/ifdown)."""
+    global _IFACE_CACHE
+    _IFACE_CACHE = None
+
+
 def list_candidate_interfaces() -> list[str]:
     """
     Return real physical interface names, stripping @physdev suffixes
     and excluding common virtual/tunnel/docker links.
+
+    The list is reused for ``_IFACE_TTL`` seconds.
     """
+    global _IFACE_CACHE
+    now = time.monotonic()
+    if _IFACE_CACHE is not None and now - _IFACE_CACHE[0] < _IFACE_TTL:
+        return list(_IFACE_CACHE[1])
+
     res = DEFAULT_SHELL.run_cmd(["ip", "-o", "link", "show"])
     if res.returncode != 0:
         return []
 
     names: list[str] = []
     for line in res.stdout.splitlines():
-        parts = line.split(":")
-        if len(parts) < 2:
-            continue
-
-        raw = parts[1].strip()
-        name = raw.split("@")[0]
-
-        if name == "lo":
+        # "2: eth0@if5: <...>" -> "eth0"
+        name = line.partition(":")[2].partition(":")[0].strip().partition("@")[0]
+        if not name or name == "lo":
             continue
 
-        skip_prefixes = (
-            "veth",
-            "docker",
-            "br-",
-            "virbr",
-            "wg",
-            "tun",
-            "tap",
-        )
-        if any(name.startswith(prefix) for prefix in skip_prefixes):
+        if _SKIP_IFACE_RE.match(name):
             continue
 
         names.append(name)
 
-    def _priority(iface: str) -> tuple[int, str]:
-        wired_prefixes = ("eth", "en", "em")
-        wireless_prefixes = ("wlan", "wl")
-
-        if iface.startswith(wired_prefixes):
-            return (0, iface)
-        if iface.startswith(wireless_prefixes):
-            return (1, iface)
-        return (2, iface)
-
-    return sorted(names, key=_priority)
+    ordered = sorted(names, key=_iface_priority)
+    _IFACE_CACHE = (now, ordered)
+    return list(ordered)
 
 
 def list_all_interfaces_detailed() -> list[str]:
@@ -3,12 +3,17 @@
 from __future__ import annotations
 
 import sys
+import time
+from collections.abc import Callable
 
 from automatic_linux_network_repair.eth_repair.actions import apply_action
 from automatic_linux_network_repair.eth_repair.diagnostics import fuzzy_diagnose
 from automatic_linux_network_repair.eth_repair.dns_config import (
     backup_resolv_conf,
     detect_resolv_conf_mode,
+    invalidate_dns_status_cache,
+    resolv_conf_mode_line,
+    resolved_status_lines,
     set_resolv_conf_manual_public,
     systemd_resolved_status,
 )
@@ -23,6 +28,7 @@ from automatic_linux_network_repair.eth_repair.probes import (
 from automatic_linux_network_repair.eth_repair.types import (
     SUSPICION_LABELS,
     Diagnosis,
+    NetworkManagers,
     Suspicion,
 )
 
@@ -37,21 +43,38 @@ class DnsRepairSideEffects:
         input_func=None,
     ) -> None:
         self.logger = logger
-        self.stdin = stdin or sys.stdin
+        self._stdin = stdin
         self._input = input_func or input
 
+    @property
+    def stdin(self):
+        # Resolved per access so a shared default instance follows sys.stdin swaps.
+        return self._stdin or sys.stdin
+
     def log_fuzzy_intro(self) -> None:
         self.logger.log("[INFO] Fuzzy DNS repair...")
 
     def log_dns_ok_after_limited(self) -> None:
         self.logger.log("[INFO] DNS OK after limited DNS repair.")
 
+    def _log_lines(self, lines: list[str]) -> None:
+        # Injected loggers only have to provide .log; use log_block when offered.
+        log_block = getattr(self.logger, "log_block", None)
+        if log_block is not None:
+            log_block(lines)
+            return
+        for line in lines:
+            self.logger.log(line)
+
     def log_dns_broken_details(self, status: dict, mode, detail: str) -> None:
-        self.logger.log("")
-        self.logger.log("DNS still appears broken after limited repair.")
-        self.logger.log(f"systemd-resolved active : {status['active']}")
-        self.logger.log(f"systemd-resolved enabled: {status['enabled']}")
-        self.logger.log(f"/etc/resolv.conf mode   : {mode.value} ({detail})")
+        self._log_lines(
+            [
+                "",
+                "DNS still appears broken after limited repair.",
+                *resolved_status_lines(status),
+                resolv_conf_mode_line(mode, detail),
+            ]
+        )
 
     def is_tty(self) -> bool:
         return self.stdin.isatty()
@@ -68,17 +91,63 @@ class DnsRepairSideEffects:
         self.logger.log(f"[INFO] Not running on a TTY; skipping {context}")
 
     def log_menu_intro(self, status: dict) -> None:
-        self.logger.log("[INFO] DNS repair menu...")
-        self.logger.log(f"systemd-resolved active : {status['active']}")
-        self.logger.log(f"systemd-resolved enabled: {status['enabled']}")
+        self._log_lines(
+            [
+                "[INFO] DNS repair menu...",
+                *resolved_status_lines(status),
+            ]
+        )
 
     def log_resolv_conf_mode(self, mode, detail: str) -> None:
-        self.logger.log(f"/etc/resolv.conf mode: {mode.value} ({detail})")
+        self.logger.log(resolv_conf_mode_line(mode, detail))
 
     def log_user_declined_manual(self) -> None:
         self.logger.log("[INFO] User declined manual resolv.conf rewrite.")
 
 
+_DEFAULT_SIDE_EFFECTS: DnsRepairSideEffects | None = None
+
+
+def _default_side_effects() -> DnsRepairSideEffects:
+    """Return the shared DnsRepairSideEffects used when callers pass none."""
+    global _DEFAULT_SIDE_EFFECTS
+    if _DEFAULT_SIDE_EFFECTS is None:
+        _DEFAULT_SIDE_EFFECTS = DnsRepairSideEffects()
+    return _DEFAULT_SIDE_EFFECTS
+
+
+# Total seconds repair_no_ipv4 may spend polling for an address across all of
+# its stages, so the all-fail path does not sleep a full deadline per stage.
+_IPV4_WAIT_BUDGET = 6.0
+# Upper bound for a single resolver check while polling after a DNS repair.
+_DNS_CHECK_TIMEOUT = 3.0
+
+
+def _wait_until(pred: Callable[[float], bool], deadline: float = 4.0, start: float = 0.25) -> bool:
+    """Poll pred with exponential backoff until it holds or deadline seconds pass.
+
+    DHCP leases and resolver restarts often need a moment to settle, so a
+    single immediate check after an action tends to report a false failure.
+    The deadline is measured with ``time.monotonic()`` and includes the time
+    spent inside pred, which receives the seconds left so a blocking check
+    can cap its own timeout. Sleeps grow 0.25, 0.5, 1, 2, ... seconds.
+    """
+    end = time.monotonic() + deadline
+    delay = start
+    while True:
+        if pred(max(0.0, end - time.monotonic())):
+            return True
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay *= 2
+
+
+def _dns_resolves_within(remaining: float) -> bool:
+    return dns_resolves(timeout=min(_DNS_CHECK_TIMEOUT, remaining))
+
+
 def repair_interface_missing(iface: str) -> None:
     DEFAULT_LOGGER.log(
         "[INFO] Interface does not exist. This is usually a driver, hardware or VM configuration issue.",
@@ -96,7 +165,7 @@ def repair_link_down(iface: str, dry_run: bool) -> None:
 
 def repair_no_ipv4(
     iface: str,
-    managers: dict[str, bool],
+    managers: NetworkManagers,
     dry_run: bool,
 ) -> None:
     """
@@ -106,22 +175,30 @@ def repair_no_ipv4(
     3) ifdown/ifup (if available)
     4) dhclient as final fallback
     """
-    if managers.get("NetworkManager", False):
-        apply_action(
+
+    wait_end = time.monotonic() + _IPV4_WAIT_BUDGET
+
+    def has_ipv4() -> bool:
+        # Once the shared budget is spent, later stages get a single check.
+        remaining = max(0.0, wait_end - time.monotonic())
+        return _wait_until(lambda _remaining: interface_has_ipv4(iface), deadline=min(4.0, remaining))
+
+    if managers.network_manager:
+        if apply_action(
             f"Reapply NetworkManager profile for {iface}",
             ["nmcli", "device", "reapply", iface],
             dry_run,
-        )
-        if not dry_run and interface_has_ipv4(iface):
+            verify=has_ipv4,
+        ):
             DEFAULT_LOGGER.log("[OK] IPv4 obtained after NetworkManager reapply.")
             return
 
-        apply_action(
+        if apply_action(
             f"Reconnect {iface} via NetworkManager",
             ["nmcli", "device", "connect", iface],
             dry_run,
-        )
-        if not dry_run and interface_has_ipv4(iface):
+            verify=has_ipv4,
+        ):
             DEFAULT_LOGGER.log("[OK] IPv4 obtained after NetworkManager reconnect.")
             return
 
@@ -130,13 +207,13 @@ def repair_no_ipv4(
                 "[INFO] No IPv4 after NetworkManager reapply/reconnect; falling back to other managers.",
             )
 
-    if managers.get("systemd-networkd", False):
-        apply_action(
+    if managers.systemd_networkd:
+        if apply_action(
             "Restart systemd-networkd",
             ["systemctl", "restart", "systemd-networkd"],
             dry_run,
-        )
-        if not dry_run and interface_has_ipv4(iface):
+            verify=has_ipv4,
+        ):
             DEFAULT_LOGGER.log("[OK] IPv4 obtained after systemd-networkd restart.")
             return
         if not dry_run:
@@ -144,27 +221,27 @@ def repair_no_ipv4(
                 "[INFO] No IPv4 after systemd-networkd restart; falling back to ifup / dhclient.",
             )
 
-    if managers.get("ifupdown", False):
+    if managers.ifupdown:
         apply_action(
             f"ifdown {iface}",
             ["ifdown", iface],
             dry_run,
         )
-        apply_action(
+        if apply_action(
             f"ifup {iface}",
             ["ifup", iface],
             dry_run,
-        )
-        if not dry_run and interface_has_ipv4(iface):
+            verify=has_ipv4,
+        ):
             DEFAULT_LOGGER.log("[OK] IPv4 obtained after ifup.")
             return
 
-    apply_action(
+    if apply_action(
         f"Run dhclient on {iface}",
         ["dhclient", "-v", iface],
         dry_run,
-    )
-    if not dry_run and interface_has_ipv4(iface):
+        verify=has_ipv4,
+    ):
         DEFAULT_LOGGER.log("[OK] IPv4 obtained after dhclient.")
     elif not dry_run:
         DEFAULT_LOGGER.log(
@@ -172,10 +249,11 @@ def repair_no_ipv4(
         )
 
 
-def repair_no_route(dry_run: bool) -> None:
-    managers = detect_network_managers()
+def repair_no_route(dry_run: bool, managers: NetworkManagers | None = None) -> None:
+    if managers is None:
+        managers = detect_network_managers()
 
-    if managers.get("NetworkManager", False):
+    if managers.network_manager:
         apply_action(
             "Restart NetworkManager",
             ["systemctl", "restart", "NetworkManager"],
@@ -183,7 +261,7 @@ def repair_no_route(dry_run: bool) -> None:
         )
         return
 
-    if managers.get("systemd-networkd", False):
+    if managers.systemd_networkd:
         apply_action(
             "Restart systemd-networkd",
             ["systemctl", "restart", "systemd-networkd"],
@@ -191,7 +269,7 @@ def repair_no_route(dry_run: bool) -> None:
         )
         return
 
-    if managers.get("ifupdown", False):
+    if managers.ifupdown:
         apply_action(
             "Restart networking (ifupdown)",
             ["systemctl", "restart", "networking"],
@@ -204,23 +282,27 @@ def repair_no_route(dry_run: bool) -> None:
     )
 
 
-def repair_no_internet(dry_run: bool) -> None:
-    """Attempt general connectivity recovery when ICMP fails."""
+def repair_no_internet(dry_run: bool, managers: NetworkManagers | None = None) -> None:
+    """Attempt general connectivity recovery when ICMP fails.
+
+    ``managers`` may be passed by callers that already probed them.
+    """
 
     DEFAULT_LOGGER.log("[INFO] Attempting general internet connectivity repair.")
-    managers = detect_network_managers()
+    if managers is None:
+        managers = detect_network_managers()
     tailscale = tailscale_status()
     active_vpn_services = detect_active_vpn_services()
 
-    if managers.get("NetworkManager", False):
+    if managers.network_manager:
         apply_action("Restart NetworkManager", ["systemctl", "restart", "NetworkManager"], dry_run)
         return
 
-    if managers.get("systemd-networkd", False):
+    if managers.systemd_networkd:
         apply_action("Restart systemd-networkd", ["systemctl", "restart", "systemd-networkd"], dry_run)
         return
 
-    if managers.get("ifupdown", False):
+    if managers.ifupdown:
         apply_action("Restart networking (ifupdown)", ["systemctl", "restart", "networking"], dry_run)
         return
 
@@ -260,7 +342,8 @@ def repair_dns_core(allow_resolv_conf_edit: bool, dry_run: bool) -> None:
             ["systemctl", "restart", "systemd-resolved"],
             dry_run,
         )
-        if not dry_run and dns_resolves():
+        invalidate_dns_status_cache()
+        if not dry_run and _wait_until(_dns_resolves_within):
             DEFAULT_LOGGER.log("[OK] DNS fixed after systemd-resolved restart.")
             return
 
@@ -293,7 +376,7 @@ def repair_dns_fuzzy_with_confirm(dry_run: bool, side_effects: DnsRepairSideEffe
       with public DNS. If user says yes, do so; otherwise just log and exit.
     - In non-interactive contexts, never overwrite resolv.conf here.
     """
-    side_effects = side_effects or DnsRepairSideEffects()
+    side_effects = side_effects or _default_side_effects()
 
     side_effects.log_fuzzy_intro()
     repair_dns_core(allow_resolv_conf_edit=False, dry_run=dry_run)
@@ -331,7 +414,7 @@ def repair_dns_interactive(dry_run: bool, side_effects: DnsRepairSideEffects | N
     - If DNS still broken, ask user for permission before editing resolv.conf.
     - If user agrees, create manual resolv.conf with public DNS.
     """
-    side_effects = side_effects or DnsRepairSideEffects()
+    side_effects = side_effects or _default_side_effects()
 
     status = systemd_resolved_status()
     side_effects.log_menu_intro(status)
@@ -341,7 +424,8 @@ def repair_dns_interactive(dry_run: bool, side_effects: DnsRepairSideEffects | N
         ["systemctl", "restart", "systemd-resolved"],
         dry_run,
     )
-    if not dry_run and dns_resolves():
+    invalidate_dns_status_cache()
+    if not dry_run and _wait_until(_dns_resolves_within):
         DEFAULT_LOGGER.log("[OK] DNS fixed after systemd-resolved restart.")
         return
 
@@ -375,6 +459,13 @@ class EthernetRepairCoordinator:
         self.iface = iface
         self.dry_run = dry_run
         self.allow_resolv_conf_edit = allow_resolv_conf_edit
+        self._managers: NetworkManagers | None = None
+
+    def _network_managers(self) -> NetworkManagers:
+        """Probe the network managers once and reuse them for later repairs."""
+        if self._managers is None:
+            self._managers = detect_network_managers()
+        return self._managers
 
     def perform_repairs(self, diagnosis: Diagnosis) -> None:
         """Apply the most appropriate fix for a diagnosis."""
@@ -385,16 +476,15 @@ class EthernetRepairCoordinator:
         current_diagnosis = diagnosis
 
         while True:
-            ordered = current_diagnosis.sorted_scores()
             DEFAULT_LOGGER.log(f"[INFO] Repair iteration {iteration}: suspicion scores:")
-            for suspicion, score in ordered:
+            actionable: list[Suspicion] = []
+            for suspicion, score in current_diagnosis.sorted_scores():
                 label = SUSPICION_LABELS[suspicion]
                 DEFAULT_LOGGER.log(f"  {label}: {score:.2f}")
+                if score >= self.ACTIONABLE_SUSPICION_THRESHOLD:
+                    actionable.append(suspicion)
 
-            actionable = [
-                (suspicion, score) for suspicion, score in ordered if score >= self.ACTIONABLE_SUSPICION_THRESHOLD
-            ]
-            next_suspicion = next((suspicion for suspicion, _ in actionable if suspicion not in attempted), None)
+            next_suspicion = next((suspicion for suspicion in actionable if suspicion not in attempted), None)
 
             if next_suspicion is None:
                 if not actionable:
@@ -422,10 +512,9 @@ class EthernetRepairCoordinator:
         elif suspicion == Suspicion.LINK_DOWN:
             repair_link_down(self.iface, dry_run=self.dry_run)
         elif suspicion == Suspicion.NO_IPV4:
-            managers = detect_network_managers()
-            repair_no_ipv4(self.iface, managers=managers, dry_run=self.dry_run)
+            repair_no_ipv4(self.iface, managers=self._network_managers(), dry_run=self.dry_run)
         elif suspicion == Suspicion.NO_ROUTE:
-            repair_no_route(dry_run=self.dry_run)
+            repair_no_route(dry_run=self.dry_run, managers=self._network_managers())
         elif suspicion == Suspicion.NO_INTERNET:
             DEFAULT_LOGGER.log(
                 "[INFO] Unable to ping internet; if DHCP is OK, check upstream gateway / firewall.",
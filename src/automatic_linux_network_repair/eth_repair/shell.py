@@ -2,8 +2,8 @@
 
 from __future__ import annotations
 
-import shlex
-import subprocess
+import functools
+import shutil
 
 from automatic_linux_network_repair.eth_repair.logging_utils import (
     DEFAULT_LOGGER,
@@ -11,6 +11,33 @@ from automatic_linux_network_repair.eth_repair.logging_utils import (
 )
 from automatic_linux_network_repair.eth_repair.types import CommandResult
 
+# shlex and subprocess are imported inside the functions that use them, so
+# CLI start-up (--help, fully mocked paths) does not pay for them.
+
+
+@functools.cache
+def which(binary: str) -> str | None:
+    """Resolve ``binary`` on PATH once per process.
+
+    Shared by every module that probes for optional tools, so tests that
+    patch ``shutil.which`` only need ``which.cache_clear()``.
+    """
+    return shutil.which(binary)
+
+
+class _DisplayCmd:
+    """Defer shell-quoting a command until a log record actually renders it."""
+
+    __slots__ = ("cmd",)
+
+    def __init__(self, cmd: list[str]) -> None:
+        self.cmd = cmd
+
+    def __str__(self) -> str:
+        import shlex
+
+        return shlex.join(self.cmd)
+
 
 class ShellRunner:
     """Execute shell commands with consistent logging."""
@@ -20,23 +47,31 @@ class ShellRunner:
 
     def cmd_str(self, cmd: list[str]) -> str:
         """Return a shell-escaped string for display."""
+        import shlex
+
         return " ".join(shlex.quote(part) for part in cmd)
 
     def run_cmd(
         self,
         cmd: list[str],
         timeout: int = 5,
+        input: str | None = None,
     ) -> CommandResult:
-        """Run command and capture stdout/stderr."""
-        self.logger.debug(f"Running: {self.cmd_str(cmd)}")
+        """Run command and capture stdout/stderr, optionally feeding ``input`` on stdin."""
+        import subprocess
+
+        self.logger.debug("Running: %s", _DisplayCmd(cmd))
         try:
-            proc = subprocess.run(
-                cmd,
-                stdin=subprocess.DEVNULL,
-                capture_output=True,
-                timeout=timeout,
-                text=True,
-            )
+            # Capture bytes and decode once below: text=True goes through the
+            # locale codec in strict mode, so a stray non-UTF-8 byte in an
+            # interface alias or hostname would abort the whole command.
+            # Keep this call free of preexec_fn/user/group/umask: without them
+            # CPython launches the child with vfork() on Linux instead of
+            # copying our page tables with fork().
+            if input is None:
+                proc = subprocess.run(cmd, stdin=subprocess.DEVNULL, capture_output=True, timeout=timeout)
+            else:
+                proc = subprocess.run(cmd, input=input.encode("utf-8"), capture_output=True, timeout=timeout)
         except Exception as exc:  # noqa: BLE001 - broad to log spawn issues
             self.logger.debug(f"Command failed to start: {exc}")
             return CommandResult(
@@ -46,14 +81,14 @@ class ShellRunner:
                 stderr=str(exc),
             )
 
-        self.logger.debug(
-            f"Command rc={proc.returncode} stdout={proc.stdout!r} stderr={proc.stderr!r}",
-        )
+        stdout = proc.stdout.decode("utf-8", "replace")
+        stderr = proc.stderr.decode("utf-8", "replace")
+        self.logger.debug("Command rc=%s stdout=%r stderr=%r", proc.returncode, stdout, stderr)
         return CommandResult(
             cmd=cmd,
             returncode=proc.returncode,
-            stdout=proc.stdout,
-            stderr=proc.stderr,
+            stdout=stdout,
+            stderr=stderr,
         )
 
 
@@ -2,76 +2,115 @@
 
 from __future__ import annotations
 
+from concurrent.futures import Executor, ThreadPoolExecutor
+
 from automatic_linux_network_repair.eth_repair.logging_utils import DEFAULT_LOGGER
 from automatic_linux_network_repair.eth_repair.probes import (
     detect_active_vpn_services,
     detect_network_managers,
     dns_resolves,
     has_default_route,
-    interface_exists,
-    interface_ip_addrs,
-    interface_link_up,
     list_all_interfaces_detailed,
     ping_host,
+    probe_iface,
     read_resolv_conf_summary,
     tailscale_status,
 )
 
+_ACTIVE_ROW = "  {:17s}: active"
+_INACTIVE_ROW = "  {:17s}: inactive"
+_NO_ADDRESSES = "None"
+_PROBE_WORKERS = 8
+
 
 def show_status(iface: str) -> None:
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("=== Interface & connectivity status ===")
-    exists = interface_exists(iface)
-    link_up = interface_link_up(iface) if exists else False
-    ipv4_addrs = interface_ip_addrs(iface, family=4) if exists else []
-    ipv6_addrs = interface_ip_addrs(iface, family=6) if exists else []
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as executor:
+        _show_status(iface, executor)
+
+
+def _show_status(iface: str, executor: Executor) -> None:
+    """Run the independent status probes on ``executor`` and render them."""
+    iface_future = executor.submit(probe_iface, iface)
+    route_future = executor.submit(has_default_route)
+    ping_future = executor.submit(ping_host, "8.8.8.8")
+    dns_future = executor.submit(dns_resolves)
+    managers_future = executor.submit(detect_network_managers)
+    tailscale_future = executor.submit(tailscale_status)
+    vpn_future = executor.submit(detect_active_vpn_services)
+
+    snapshot = iface_future.result()
+    exists = snapshot.exists
+    link_up = snapshot.link_up
+    ipv4_addrs = snapshot.ipv4
+    ipv6_addrs = snapshot.ipv6
     has_ip = bool(ipv4_addrs)
-    default_route = has_default_route()
-    ping_ip_ok = ping_host("8.8.8.8")
-    dns_ok = dns_resolves()
-    managers = detect_network_managers()
-    tailscale = tailscale_status()
-    active_vpn_services = detect_active_vpn_services()
-
-    DEFAULT_LOGGER.log(f"Interface:           {iface}")
-    DEFAULT_LOGGER.log(f"Exists:              {exists}")
-    DEFAULT_LOGGER.log(f"Link up:             {link_up}")
-    DEFAULT_LOGGER.log(f"IPv4 addresses:      {', '.join(ipv4_addrs) or 'None'}")
-    DEFAULT_LOGGER.log(f"IPv6 addresses:      {', '.join(ipv6_addrs) or 'None'}")
-    DEFAULT_LOGGER.log(f"Has IPv4:            {has_ip}")
-    DEFAULT_LOGGER.log(f"Default route:       {default_route}")
-    DEFAULT_LOGGER.log(f"Ping 8.8.8.8:        {ping_ip_ok}")
-    DEFAULT_LOGGER.log(f"DNS deb.debian.org:  {dns_ok}")
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("Network managers:")
-    for name, active in managers.items():
-        DEFAULT_LOGGER.log(f"  {name:17s}: {'active' if active else 'inactive'}")
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("VPN services (systemd, running):")
+    default_route = route_future.result()
+    ping_ip_ok = ping_future.result()
+    dns_ok = dns_future.result()
+    managers = managers_future.result()
+    tailscale = tailscale_future.result()
+    active_vpn_services = vpn_future.result()
+
+    lines = [
+        "",
+        "=== Interface & connectivity status ===",
+        f"Interface:           {iface}",
+        f"Exists:              {exists}",
+        f"Link up:             {link_up}",
+        f"IPv4 addresses:      {', '.join(ipv4_addrs) or _NO_ADDRESSES}",
+        f"IPv6 addresses:      {', '.join(ipv6_addrs) or _NO_ADDRESSES}",
+        f"Has IPv4:            {has_ip}",
+        f"Default route:       {default_route}",
+        f"Ping 8.8.8.8:        {ping_ip_ok}",
+        f"DNS deb.debian.org:  {dns_ok}",
+        "",
+        "Network managers:",
+    ]
+    lines.extend((_ACTIVE_ROW if active else _INACTIVE_ROW).format(name) for name, active in managers.as_dict().items())
+    lines.append("")
+    lines.append("VPN services (systemd, running):")
     if active_vpn_services:
-        for unit in active_vpn_services:
-            DEFAULT_LOGGER.log(f"  {unit}")
-        DEFAULT_LOGGER.log("  Hint: suspend VPN tunnels if they block local/internet connectivity.")
+        lines.extend(f"  {unit}" for unit in active_vpn_services)
+        lines.append("  Hint: suspend VPN tunnels if they block local/internet connectivity.")
     else:
-        DEFAULT_LOGGER.log("  None detected")
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("Tailscale:")
-    DEFAULT_LOGGER.log(f"  Installed        : {'yes' if tailscale['installed'] else 'no'}")
-    DEFAULT_LOGGER.log(f"  tailscaled active: {'yes' if tailscale['active'] else 'no'}")
+        lines.append("  None detected")
+    lines.append("")
+    lines.append("Tailscale:")
+    lines.append(f"  Installed        : {'yes' if tailscale['installed'] else 'no'}")
+    lines.append(f"  tailscaled active: {'yes' if tailscale['active'] else 'no'}")
     if tailscale["installed"] and not tailscale["active"]:
-        DEFAULT_LOGGER.log(
+        lines.append(
             "  Hint: tailscale installed but inactive; run 'sudo tailscale up' if you expect VPN connectivity."
         )
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("/etc/resolv.conf (first lines):")
-    for line in read_resolv_conf_summary():
-        DEFAULT_LOGGER.log(f"  {line}")
-    DEFAULT_LOGGER.log("=======================================")
+    lines.append("")
+    lines.append("/etc/resolv.conf (first lines):")
+    lines.extend(f"  {line}" for line in read_resolv_conf_summary())
+    lines.append("=======================================")
+    DEFAULT_LOGGER.log_block(lines)
+
+
+def _log_adapters(lines: list[str]) -> None:
+    DEFAULT_LOGGER.log_block(
+        [
+            "",
+            "=== All adapters & addresses (ip -br addr show) ===",
+            *(f"  {line}" for line in lines),
+            "==================================================",
+        ]
+    )
 
 
 def show_all_adapters() -> None:
-    DEFAULT_LOGGER.log("")
-    DEFAULT_LOGGER.log("=== All adapters & addresses (ip -br addr show) ===")
-    for line in list_all_interfaces_detailed():
-        DEFAULT_LOGGER.log(f"  {line}")
-    DEFAULT_LOGGER.log("==================================================")
+    _log_adapters(list_all_interfaces_detailed())
+
+
+def show_full_report(iface: str) -> None:
+    """Show interface status followed by the full adapter listing.
+
+    The ``ip -br addr show`` dump is independent of the status probes, so it is
+    submitted to the same executor and fetched alongside them.
+    """
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as executor:
+        adapters_future = executor.submit(list_all_interfaces_detailed)
+        _show_status(iface, executor)
+        _log_adapters(adapters_future.result())
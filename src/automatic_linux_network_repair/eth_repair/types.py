@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import dataclasses
 import enum
+from typing import NamedTuple
 
 
 @dataclasses.dataclass
@@ -14,13 +15,50 @@ class CommandResult:
     stderr: str
 
 
-class Suspicion(enum.Enum):
-    INTERFACE_MISSING = "interface_missing"
-    LINK_DOWN = "link_down"
-    NO_IPV4 = "no_ipv4"
-    NO_ROUTE = "no_route"
-    NO_INTERNET = "no_internet"
-    DNS_BROKEN = "dns_broken"
+@dataclasses.dataclass(frozen=True)
+class IfaceSnapshot:
+    """State of one interface parsed from a single ``ip addr show`` call."""
+
+    iface: str
+    exists: bool
+    link_up: bool = False
+    ipv4: tuple[str, ...] = ()
+    ipv6: tuple[str, ...] = ()
+
+
+MANAGER_KEYS: tuple[str, ...] = ("NetworkManager", "systemd-networkd", "ifupdown")
+
+
+class NetworkManagers(NamedTuple):
+    """Which network managers are available, in ``MANAGER_KEYS`` order."""
+
+    network_manager: bool = False
+    systemd_networkd: bool = False
+    ifupdown: bool = False
+
+    def as_dict(self) -> dict[str, bool]:
+        """Return the states keyed by their display names for rendering."""
+        return dict(zip(MANAGER_KEYS, self, strict=True))
+
+
+class Suspicion(enum.IntEnum):
+    INTERFACE_MISSING = 0
+    LINK_DOWN = 1
+    NO_IPV4 = 2
+    NO_ROUTE = 3
+    NO_INTERNET = 4
+    DNS_BROKEN = 5
+
+
+# String identifiers formerly carried by ``Suspicion.value``.
+SUSPICION_VALUE_STR: dict[Suspicion, str] = {
+    Suspicion.INTERFACE_MISSING: "interface_missing",
+    Suspicion.LINK_DOWN: "link_down",
+    Suspicion.NO_IPV4: "no_ipv4",
+    Suspicion.NO_ROUTE: "no_route",
+    Suspicion.NO_INTERNET: "no_internet",
+    Suspicion.DNS_BROKEN: "dns_broken",
+}
 
 
 SUSPICION_LABELS: dict[Suspicion, str] = {
@@ -33,6 +71,11 @@ SUSPICION_LABELS: dict[Suspicion, str] = {
 }
 
 
+def _score_sort_key(item: tuple[Suspicion, float]) -> tuple[float, int]:
+    # Equal scores fall back to enum order, so lower-level faults come first.
+    return (-item[1], item[0].value)
+
+
 @dataclasses.dataclass
 class Diagnosis:
     """Capture the results of a fuzzy connectivity diagnosis."""
@@ -42,21 +85,27 @@ class Diagnosis:
 
     def sorted_scores(self) -> list[tuple[Suspicion, float]]:
         """Return suspicion scores ordered by severity (highest first)."""
-        return sorted(
-            self.suspicion_scores.items(),
-            key=lambda item: item[1],
-            reverse=True,
-        )
+        return sorted(self.suspicion_scores.items(), key=_score_sort_key)
 
     @property
     def top_suspicion(self) -> Suspicion:
         """Convenience accessor for the most likely root cause."""
-        ordered = self.sorted_scores()
-        return ordered[0][0] if ordered else Suspicion.NO_INTERNET
+        if not self.suspicion_scores:
+            return Suspicion.NO_INTERNET
+        return min(self.suspicion_scores.items(), key=_score_sort_key)[0]
+
 
+class ResolvConfMode(enum.IntEnum):
+    SYSTEMD_STUB = 0
+    SYSTEMD_FULL = 1
+    MANUAL = 2
+    OTHER = 3
 
-class ResolvConfMode(enum.Enum):
-    SYSTEMD_STUB = "systemd_stub"
-    SYSTEMD_FULL = "systemd_full"
-    MANUAL = "manual"
-    OTHER = "other"
+
+# String identifiers formerly carried by ``ResolvConfMode.value``.
+RESOLV_CONF_MODE_VALUE_STR: dict[ResolvConfMode, str] = {
+    ResolvConfMode.SYSTEMD_STUB: "systemd_stub",
+    ResolvConfMode.SYSTEMD_FULL: "systemd_full",
+    ResolvConfMode.MANUAL: "manual",
+    ResolvConfMode.OTHER: "other",
+}
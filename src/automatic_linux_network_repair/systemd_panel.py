@@ -2,19 +2,26 @@
 
 from __future__ import annotations
 
-import configparser
+import functools
 import os
-import shutil
+import re
 import stat
-from collections.abc import Callable, Mapping
+import sys
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from typing import Any
 
 from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
-from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner
+from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner, which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
+from automatic_linux_network_repair.systemd_validation import iter_tree_entries, parse_systemd_ini
+
+_DUMP_SEPARATOR = "########################################"
+# ``# FILE: <path>`` markers from generated dumps, or the ``# /path`` and ``#/path``
+# headers that ``systemd-analyze cat-config`` prints before each file.
+_DUMP_HEADER_RE = re.compile(r"^#(?: FILE: ([^\n]*)|(?: [^\S\n]*)?(/[^\n]*))$", re.MULTILINE)
 
 
 def parse_systemd_dump(dump: str) -> dict[str, str]:
@@ -27,120 +34,110 @@ def parse_systemd_dump(dump: str) -> dict[str, str]:
     but the original line ordering is preserved.
     """
 
-    files: dict[str, list[str]] = {}
-    current_path: str | None = None
-    buffer: list[str] = []
+    dump = _normalize_newlines(dump)
+    return {path: dump[start:end].strip("\n") for path, start, end in _iter_dump_sections(dump)}
 
-    def _extract_path(header_line: str) -> str | None:
-        if header_line.startswith("# FILE: "):
-            return header_line.split("# FILE: ", 1)[1].strip()
 
-        if header_line.startswith("#/"):
-            candidate = header_line[1:].strip()
-            if candidate.startswith("/"):
-                return candidate
+def _normalize_newlines(dump: str) -> str:
+    return "\n".join(dump.splitlines()) if "\r" in dump else dump
 
-        if header_line.startswith("# "):
-            candidate = header_line[2:].strip()
-            if candidate.startswith("/"):
-                return candidate
 
-        return None
+def _iter_dump_sections(dump: str) -> Iterator[tuple[str, int, int]]:
+    """Yield ``(path, start, end)`` so that ``dump[start:end]`` is each file body.
 
-    for line in dump.splitlines():
-        path = _extract_path(line)
-        if path:
-            if current_path is not None:
-                files[current_path] = "\n".join(buffer).strip("\n")
-            current_path = path
-            buffer = []
-            continue
+    Headers are located with one regex scan and bodies are only delimited here;
+    slicing them out is left to the caller so files that are never looked at
+    cost nothing. A separator banner directly below a header is skipped.
+    """
 
-        if current_path is None:
-            continue
+    current_path: str | None = None
+    start = 0
+    size = len(dump)
 
-        if not buffer and line.startswith("########################################"):
+    for match in _DUMP_HEADER_RE.finditer(dump):
+        path = (match.group(1) if match.group(1) is not None else match.group(2)).strip()
+        if not path:
             continue
-
-        buffer.append(line)
+        if current_path is not None:
+            yield current_path, start, match.start()
+        current_path = path
+        start = min(match.end() + 1, size)
+        while dump.startswith(_DUMP_SEPARATOR, start):
+            newline = dump.find("\n", start)
+            start = size if newline < 0 else newline + 1
 
     if current_path is not None:
-        files[current_path] = "\n".join(buffer).strip("\n")
-
-    return files
+        yield current_path, start, size
 
 
-def _extract_active_settings(body: str) -> dict[str, dict[str, str]]:
-    """Parse non-comment INI settings from a systemd config body.
-
-    Commented and empty lines are ignored. If parsing fails, an empty mapping is
-    returned so that the caller can display "No active settings" for that file.
-    """
-
-    cleaned: list[str] = []
-    for line in body.splitlines():
-        stripped = line.strip()
-        if not stripped or stripped.startswith("#") or stripped.startswith(";"):
-            continue
-        cleaned.append(stripped)
+def _split_active_commented(body: str) -> tuple[str, dict[str, dict[str, str]]]:
+    return _split_active_commented_lines(body.splitlines())
 
-    if not cleaned:
-        return {}
 
-    parser = configparser.ConfigParser(interpolation=None, strict=False)
-    parser.optionxform = str
+def _split_active_commented_lines(lines: Iterable[str]) -> tuple[str, dict[str, dict[str, str]]]:
+    """Walk a config body once, separating active lines from commented settings.
 
-    try:
-        parser.read_string("\n".join(cleaned))
-    except configparser.Error:
-        return {}
-
-    settings: dict[str, dict[str, str]] = {}
-    for section in parser.sections():
-        settings[section] = dict(parser.items(section))
-    return settings
-
-
-def _extract_commented_settings(body: str) -> dict[str, dict[str, str]]:
-    """Return commented-out settings organized by section.
-
-    Only lines that look like ``#Key=value`` are captured. Other comment lines
-    (e.g., descriptive prose or URLs) are ignored to avoid polluting the schema
-    with non-config data.
+    Returns the active (non-comment, non-empty) lines joined for the INI parser
+    and the commented-out ``#Key=value`` settings organized by section. Other
+    comment lines (e.g., descriptive prose or URLs) are ignored to avoid
+    polluting the schema with non-config data.
     """
 
+    active: list[str] = []
     commented: dict[str, dict[str, str]] = {}
     section: str | None = None
 
-    for raw_line in body.splitlines():
+    for raw_line in lines:
         line = raw_line.strip()
-        if line.startswith("[") and line.endswith("]"):
-            section = line.strip("[]")
+        if not line:
             continue
 
-        if not section:
+        c0 = line[0]
+        if c0 not in "#;":
+            active.append(line)
+            if c0 == "[" and line[-1] == "]":
+                section = sys.intern(line.strip("[]"))
             continue
 
-        if not (line.startswith("#") or line.startswith(";")):
+        if not section:
             continue
 
-        candidate = line.lstrip("#;").strip()
-        if not candidate or candidate.startswith("#"):
+        # Prose such as "# # note" leaves a key like "# note", which fails
+        # isidentifier() just like other non-setting comments.
+        key, sep, value = line.lstrip("#;").partition("=")
+        key = key.strip()
+        if not sep or not key.isidentifier():
             continue
 
-        if "=" not in candidate:
-            continue
+        commented.setdefault(section, {})[sys.intern(key)] = value.strip()
 
-        key, value = candidate.split("=", 1)
-        key = key.strip()
-        value = value.strip()
+    return "\n".join(active), {section: values for section, values in commented.items() if values}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_active_lines(cleaned: str) -> tuple[tuple[str, tuple[tuple[str, str], ...]], ...]:
+    """Parse active INI lines once per distinct body; the result is immutable so it can be shared."""
+
+    try:
+        sections = parse_systemd_ini(cleaned)
+    except ValueError:
+        return ()
+
+    return tuple((section, tuple(values.items())) for section, values in sections.items())
 
-        if not key.isidentifier():
-            continue
 
-        commented.setdefault(section, {})[key] = value
+def _active_settings_from_lines(cleaned: str) -> dict[str, dict[str, str]]:
+    return {section: dict(items) for section, items in _parse_active_lines(cleaned)}
 
-    return {section: values for section, values in commented.items() if values}
+
+def _extract_active_settings(body: str) -> dict[str, dict[str, str]]:
+    """Parse non-comment INI settings from a systemd config body.
+
+    Commented and empty lines are ignored. If parsing fails, an empty mapping is
+    returned so that the caller can display "No active settings" for that file.
+    """
+
+    return _active_settings_from_lines(_split_active_commented(body)[0])
 
 
 def render_systemd_panel(files: Mapping[str, str]) -> Panel:
@@ -163,26 +160,69 @@ def render_systemd_panel(files: Mapping[str, str]) -> Panel:
     return Panel(table, title="Systemd configuration", subtitle="Active values from dump")
 
 
+def render_systemd_text(files: Mapping[str, str]) -> str:
+    """Build a plain-text summary of active settings from parsed files."""
+
+    lines: list[str] = []
+    for path, body in files.items():
+        lines.append(f"=== {path} ===")
+        settings = _extract_active_settings(body)
+        if not settings:
+            lines.append("No active settings")
+        for section, values in settings.items():
+            lines.append(f"[{section}]")
+            lines.extend(f"{key}={value}" for key, value in values.items())
+        lines.append("")
+    return "\n".join(lines)
+
+
 def print_systemd_panel(dump: str, console: Console | None = None) -> None:
-    """Render and print a systemd configuration panel to the provided console."""
+    """Render and print a systemd configuration panel to the provided console.
+
+    Without a console and with stdout redirected, a plain-text summary is
+    written instead so pipes and files skip Rich's table layout.
+    """
 
     parsed = parse_systemd_dump(dump)
+    if console is None and not sys.stdout.isatty():
+        sys.stdout.write(render_systemd_text(parsed))
+        return
     output_console = console or Console(force_terminal=False)
     printer = output_console.print
     printer(render_systemd_panel(parsed))
 
 
+_Settings = tuple[tuple[str, tuple[tuple[str, str], ...]], ...]
+
+
+@functools.lru_cache(maxsize=8)
+def _schema_entries(dump: str) -> tuple[tuple[str, _Settings, _Settings], ...]:
+    """Parse a dump once per distinct text; the result is immutable so it can be shared."""
+
+    # Split raw body slices directly; the splitter skips blank lines, so the
+    # stripped bodies from parse_systemd_dump are not needed.
+    dump = _normalize_newlines(dump)
+    entries = {}
+    for path, start, end in _iter_dump_sections(dump):
+        cleaned, commented = _split_active_commented_lines(dump[start:end].splitlines())
+        entries[path] = (
+            _parse_active_lines(cleaned),
+            tuple((section, tuple(values.items())) for section, values in commented.items()),
+        )
+    return tuple((path, active, commented) for path, (active, commented) in entries.items())
+
+
 def systemd_schema_from_dump(dump: str) -> dict[str, dict[str, Any]]:
     """Return a JSON-serializable schema from a dump string."""
 
-    parsed = parse_systemd_dump(dump)
-    schema: dict[str, dict[str, Any]] = {}
-    for path, body in parsed.items():
-        schema[path] = {
-            "active_settings": _extract_active_settings(body),
-            "commented_settings": _extract_commented_settings(body),
+    # Fresh dicts per call keep callers free to mutate the schema they get back.
+    return {
+        path: {
+            "active_settings": {section: dict(items) for section, items in active},
+            "commented_settings": {section: dict(items) for section, items in commented},
         }
-    return schema
+        for path, active, commented in _schema_entries(dump)
+    }
 
 
 def systemd_dump_from_schema(schema: Mapping[str, Mapping[str, Any]]) -> str:
@@ -200,16 +240,10 @@ def systemd_dump_from_schema(schema: Mapping[str, Mapping[str, Any]]) -> str:
 
         lines.append(f"# {path}")
 
-        sections = sorted(set(active_settings) | set(commented_settings))
-        for section in sections:
-            lines.append("")
-            lines.append(f"[{section}]")
-
-            for key, value in sorted(commented_settings.get(section, {}).items()):
-                lines.append(f"#{key}={value}")
-
-            for key, value in sorted(active_settings.get(section, {}).items()):
-                lines.append(f"{key}={value}")
+        for section in sorted({*active_settings, *commented_settings}):
+            lines.extend(("", f"[{section}]"))
+            lines.extend(f"#{key}={value}" for key, value in sorted(commented_settings.get(section, {}).items()))
+            lines.extend(f"{key}={value}" for key, value in sorted(active_settings.get(section, {}).items()))
 
         lines.append("")
 
@@ -219,17 +253,11 @@ def systemd_dump_from_schema(schema: Mapping[str, Mapping[str, Any]]) -> str:
 def collect_systemd_files(base_dir: str = "/etc/systemd") -> list[str]:
     """Return sorted list of regular files under the given systemd directory."""
 
-    if not os.path.isdir(base_dir):
-        return []
+    # iter_tree_entries yields nothing for a missing or non-directory base_dir.
+    return sorted(entry.path for entry in iter_tree_entries(base_dir) if entry.is_file())
 
-    files: list[str] = []
-    for root, _, names in os.walk(base_dir):
-        for name in names:
-            path = os.path.join(root, name)
-            if os.path.isfile(path):
-                files.append(path)
 
-    return sorted(files)
+_CAT_CONFIG_CHUNK = 200
 
 
 def generate_systemd_dump(base_dir: str = "/etc/systemd", *, shell: ShellRunner = DEFAULT_SHELL) -> CommandResult:
@@ -241,10 +269,24 @@ def generate_systemd_dump(base_dir: str = "/etc/systemd", *, shell: ShellRunner
     if not files:
         return CommandResult(cmd=cmd, returncode=1, stdout="", stderr=f"No files found under {base_dir}")
 
-    if shutil.which("systemd-analyze") is None:
+    if which("systemd-analyze") is None:
         return CommandResult(cmd=cmd, returncode=127, stdout="", stderr="systemd-analyze not available")
 
-    return shell.run_cmd(cmd, timeout=30)
+    if len(files) <= _CAT_CONFIG_CHUNK:
+        return shell.run_cmd(cmd, timeout=30)
+
+    # Keep argv bounded on large trees; every file keeps its own "# /path"
+    # header, so the chunk outputs concatenate into one valid dump.
+    results = [
+        shell.run_cmd(["systemd-analyze", "cat-config", *files[i : i + _CAT_CONFIG_CHUNK]], timeout=30)
+        for i in range(0, len(files), _CAT_CONFIG_CHUNK)
+    ]
+    return CommandResult(
+        cmd=cmd,
+        returncode=max((res.returncode for res in results), key=abs),
+        stdout="".join(res.stdout for res in results),
+        stderr="".join(res.stderr for res in results),
+    )
 
 
 def _ensure_secure_directory(directory: str) -> str:
@@ -300,14 +342,16 @@ def interactive_edit_systemd_dump(
     output_console = console or Console(force_terminal=False)
     emit = output_console.print
 
-    parsed = parse_systemd_dump(dump)
-    if not parsed:
+    # Only locate file bodies up front; the chosen one is joined and parsed later.
+    dump = _normalize_newlines(dump)
+    spans = {path: (start, end) for path, start, end in _iter_dump_sections(dump)}
+    if not spans:
         emit("No files available in dump; nothing to edit.")
         return None
 
-    file_items = list(parsed.items())
+    file_paths = list(spans)
     emit("Available files:")
-    for idx, (path, _) in enumerate(file_items, start=1):
+    for idx, path in enumerate(file_paths, start=1):
         emit(f"  {idx}) {path}")
 
     while True:
@@ -319,21 +363,22 @@ def interactive_edit_systemd_dump(
         except ValueError:
             emit("Please enter a number from the list or 'q' to exit.")
             continue
-        if 0 <= file_index < len(file_items):
+        if 0 <= file_index < len(file_paths):
             break
         emit("Selection out of range; try again.")
 
-    target_path, body = file_items[file_index]
-    active_settings = _extract_active_settings(body)
+    target_path = file_paths[file_index]
+    start, end = spans[target_path]
+    active_settings = _active_settings_from_lines(_split_active_commented_lines(dump[start:end].splitlines())[0])
     if not active_settings:
         emit(f"No active settings found in {target_path}; nothing to edit.")
         return None
 
     sections = sorted(active_settings)
+    keys_by_section = {section: sorted(active_settings[section]) for section in sections}
     emit("Available sections and keys:")
     for s_idx, section in enumerate(sections, start=1):
-        keys = ", ".join(sorted(active_settings[section])) or "<no keys>"
-        emit(f"  {s_idx}) [{section}] -> {keys}")
+        emit(f"  {s_idx}) [{section}] -> {', '.join(keys_by_section[section]) or '<no keys>'}")
 
     while True:
         s_choice = prompt_fn("Select section number (or q to quit): ").strip()
@@ -349,7 +394,7 @@ def interactive_edit_systemd_dump(
         emit("Selection out of range; try again.")
 
     section = sections[section_index]
-    keys = sorted(active_settings[section])
+    keys = keys_by_section[section]
     for k_idx, key in enumerate(keys, start=1):
         emit(f"  {k_idx}) {key} = {active_settings[section][key]}")
 
@@ -2,18 +2,29 @@
 
 from __future__ import annotations
 
-import configparser
 import dataclasses
 import ipaddress
+import json
 import os
-import shutil
-import socket
-from collections.abc import Callable
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
 from automatic_linux_network_repair.eth_repair.logging_utils import LoggingManager
-from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner
+from automatic_linux_network_repair.eth_repair.probes import dns_resolves
+from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner, which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
 
+_VERIFY_WORKERS = 8
+# systemd logs unit-file problems it recovers from (unknown keys or sections,
+# deprecated options) as warnings phrased like this; they do not fail verify.
+_VERIFY_WARNING_MARKERS = ("ignoring", "ignored", "deprecated")
+
+SYSTEMD_VERIFY_CACHE = "/var/cache/automatic_linux_network_repair/systemd_verify.json"
+
 SYSTEMD_UNIT_EXTENSIONS = (
     ".service",
     ".socket",
@@ -27,6 +38,12 @@ SYSTEMD_UNIT_EXTENSIONS = (
     ".link",
     ".network",
 )
+_UNIT_EXT_SET = frozenset(ext[1:] for ext in SYSTEMD_UNIT_EXTENSIONS)
+
+
+def _is_unit_file_name(name: str) -> bool:
+    _, dot, ext = name.rpartition(".")
+    return bool(dot) and ext in _UNIT_EXT_SET
 
 
 @dataclasses.dataclass
@@ -54,11 +71,11 @@ def _log_issue(issue: str, logger: LoggingManager | None) -> None:
         logger.log(f"[FAIL] {issue}")
 
 
-def _validate_ip_list(values: str, path: str, key: str, logger: LoggingManager | None) -> list[str]:
-    """Return issues for a whitespace-delimited list of IP addresses."""
+def _validate_ip_list(tokens: list[str], path: str, key: str, logger: LoggingManager | None) -> list[str]:
+    """Return issues for the tokens of a whitespace-delimited list of IP addresses."""
 
     issues: list[str] = []
-    for token in values.split():
+    for token in tokens:
         try:
             ipaddress.ip_address(token)
         except ValueError:
@@ -68,25 +85,86 @@ def _validate_ip_list(values: str, path: str, key: str, logger: LoggingManager |
     return issues
 
 
-def _validate_choice(value: str, path: str, key: str, allowed: set[str], logger: LoggingManager | None) -> list[str]:
+# Allowed values for the enumerated [Resolve] keys, checked in this order.
+_RESOLVE_CHOICES: dict[str, frozenset[str]] = {
+    "DNSSEC": frozenset({"yes", "no", "allow-downgrade"}),
+    "DNSOverTLS": frozenset({"yes", "no", "opportunistic"}),
+    "LLMNR": frozenset({"yes", "no", "resolve"}),
+    "MulticastDNS": frozenset({"yes", "no"}),
+    "DNSStubListener": frozenset({"yes", "no", "udp", "tcp", "both"}),
+    "ReadEtcHosts": frozenset({"yes", "no"}),
+}
+_SORTED_CHOICES: dict[frozenset[str], list[str]] = {allowed: sorted(allowed) for allowed in _RESOLVE_CHOICES.values()}
+
+
+def _validate_choice(
+    value: str, path: str, key: str, allowed: frozenset[str], logger: LoggingManager | None
+) -> list[str]:
     """Return issues when a value is not within the expected set."""
 
     if value in allowed:
         return []
 
-    issue = f"{path}: {key} should be one of {sorted(allowed)}, got '{value}'"
+    choices = _SORTED_CHOICES.get(allowed) or sorted(allowed)
+    issue = f"{path}: {key} should be one of {choices}, got '{value}'"
     _log_issue(issue, logger)
     return [issue]
 
 
+_RESOLVE_TTL = 60.0
+_RESOLVE_TIMEOUT = 2.0
+_RESOLVE_CACHE: dict[str, tuple[float, bool]] = {}
+
+
 def _can_resolve_host(host: str) -> bool:
-    """Return True when the current resolver can resolve the given host."""
+    """Return True when the current resolver can resolve the given host.
 
-    try:
-        socket.getaddrinfo(host, None)
-    except OSError:
-        return False
-    return True
+    Lookups are bounded by ``_RESOLVE_TIMEOUT`` and their outcome is reused for
+    ``_RESOLVE_TTL`` seconds.
+    """
+
+    now = time.monotonic()
+    cached = _RESOLVE_CACHE.get(host)
+    if cached is not None and now - cached[0] < _RESOLVE_TTL:
+        return cached[1]
+
+    ok = dns_resolves(host, timeout=_RESOLVE_TIMEOUT)
+    _RESOLVE_CACHE[host] = (now, ok)
+    return ok
+
+
+def parse_systemd_ini(text: str) -> dict[str, dict[str, str]]:
+    """Parse the ``[Section]`` / ``Key=Value`` subset of INI that systemd uses.
+
+    Blank lines and ``#``/``;`` comments are skipped, repeated sections merge
+    and a repeated key keeps its last value. Section and key names are
+    interned, since the same few names recur across every file of a tree.
+    Raises ValueError for a setting outside any section or a line that is
+    neither a header nor an assignment.
+    """
+
+    sections: dict[str, dict[str, str]] = {}
+    current: dict[str, str] | None = None
+    for lineno, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line[0] in "#;":
+            continue
+
+        if line[0] == "[":
+            end = line.rfind("]")
+            if end > 1:
+                current = sections.setdefault(sys.intern(line[1:end]), {})
+                continue
+
+        key, sep, value = line.partition("=")
+        key = key.strip()
+        if not sep or not key:
+            raise ValueError(f"line {lineno}: expected [Section] or Key=Value, got {line!r}")
+        if current is None:
+            raise ValueError(f"line {lineno}: {key} appears before any [Section]")
+        current[sys.intern(key)] = value.strip()
+
+    return sections
 
 
 def validate_resolved_conf(
@@ -97,32 +175,29 @@ def validate_resolved_conf(
     """Lint /etc/systemd/resolved.conf for obvious misconfigurations."""
 
     path = os.path.join(base_dir, "resolved.conf")
-    if not os.path.exists(path):
-        return []
-
-    parser = configparser.ConfigParser(interpolation=None)
     try:
         with open(path, encoding="utf-8") as handle:
-            parser.read_file(handle)
-    except (OSError, configparser.Error) as exc:
+            sections = parse_systemd_ini(handle.read())
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as exc:
         issue = f"{path}: failed to parse ({exc})"
         _log_issue(issue, logger)
         return [issue]
 
     issues: list[str] = []
-    if not parser.has_section("Resolve"):
+    resolve = sections.get("Resolve")
+    if resolve is None:
         issue = f"{path}: missing [Resolve] section"
         issues.append(issue)
         _log_issue(issue, logger)
         return issues
 
-    dns_values = parser.get("Resolve", "DNS", fallback="")
-    issues.extend(_validate_ip_list(dns_values, path, "DNS", logger))
-    dns_tokens = dns_values.split()
+    dns_tokens = resolve.get("DNS", "").split()
+    issues.extend(_validate_ip_list(dns_tokens, path, "DNS", logger))
 
-    fallback_values = parser.get("Resolve", "FallbackDNS", fallback="")
-    issues.extend(_validate_ip_list(fallback_values, path, "FallbackDNS", logger))
-    fallback_tokens = fallback_values.split()
+    fallback_tokens = resolve.get("FallbackDNS", "").split()
+    issues.extend(_validate_ip_list(fallback_tokens, path, "FallbackDNS", logger))
 
     if not dns_tokens and not fallback_tokens:
         resolver_fn = resolver or _can_resolve_host
@@ -131,59 +206,161 @@ def validate_resolved_conf(
             issues.append(issue)
             _log_issue(issue, logger)
 
-    dnssec = parser.get("Resolve", "DNSSEC", fallback="")
-    if dnssec:
-        issues.extend(
-            _validate_choice(
-                dnssec,
-                path,
-                "DNSSEC",
-                {"yes", "no", "allow-downgrade"},
-                logger,
-            )
-        )
+    for key, allowed in _RESOLVE_CHOICES.items():
+        value = resolve.get(key, "")
+        if value:
+            issues.extend(_validate_choice(value, path, key, allowed, logger))
 
-    dns_over_tls = parser.get("Resolve", "DNSOverTLS", fallback="")
-    if dns_over_tls:
-        issues.extend(_validate_choice(dns_over_tls, path, "DNSOverTLS", {"yes", "no", "opportunistic"}, logger))
+    return issues
 
-    llmnr = parser.get("Resolve", "LLMNR", fallback="")
-    if llmnr:
-        issues.extend(_validate_choice(llmnr, path, "LLMNR", {"yes", "no", "resolve"}, logger))
 
-    mdns = parser.get("Resolve", "MulticastDNS", fallback="")
-    if mdns:
-        issues.extend(_validate_choice(mdns, path, "MulticastDNS", {"yes", "no"}, logger))
+def systemd_tools_available() -> bool:
+    """Return True if systemctl and systemd-analyze are present in PATH.
 
-    dns_stub = parser.get("Resolve", "DNSStubListener", fallback="")
-    if dns_stub:
-        issues.extend(_validate_choice(dns_stub, path, "DNSStubListener", {"yes", "no", "udp", "tcp", "both"}, logger))
+    The PATH lookups go through the shared memoized ``which``.
+    """
 
-    read_hosts = parser.get("Resolve", "ReadEtcHosts", fallback="")
-    if read_hosts:
-        issues.extend(_validate_choice(read_hosts, path, "ReadEtcHosts", {"yes", "no"}, logger))
+    return which("systemctl") is not None and which("systemd-analyze") is not None
 
-    return issues
 
+def iter_tree_entries(base_dir: str) -> Iterator[os.DirEntry[str]]:
+    """Yield every non-directory entry below base_dir.
 
-def systemd_tools_available() -> bool:
-    """Return True if systemctl and systemd-analyze are present in PATH."""
+    Matches what ``os.walk`` reports as files: symlinks are yielded but never
+    descended into, and unreadable directories are skipped silently. Uses
+    ``os.scandir`` directly so file types come from the cached ``d_type``
+    instead of an extra ``stat`` per entry.
+    """
 
-    return shutil.which("systemctl") is not None and shutil.which("systemd-analyze") is not None
+    stack = [base_dir]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir() and not entry.is_symlink():
+                        stack.append(entry.path)
+                    elif not entry.is_dir():
+                        yield entry
+        except OSError:
+            continue
 
 
 def find_systemd_unit_files(base_dir: str) -> list[str]:
     """Return sorted list of unit-like files under base_dir."""
 
-    if not os.path.isdir(base_dir):
-        return []
+    # iter_tree_entries already yields nothing for a missing or non-directory
+    # base_dir, so no separate isdir() probe is needed.
+    return sorted(entry.path for entry in iter_tree_entries(base_dir) if _is_unit_file_name(entry.name))
+
+
+def _is_verify_warning(line: str) -> bool:
+    lowered = line.lower()
+    return any(marker in lowered for marker in _VERIFY_WARNING_MARKERS)
+
 
-    matches: list[str] = []
-    for root, _, files in os.walk(base_dir):
-        for name in files:
-            if name.endswith(SYSTEMD_UNIT_EXTENSIONS):
-                matches.append(os.path.join(root, name))
-    return sorted(matches)
+def _verify_unit_files_batched(unit_files: list[str], shell: ShellRunner) -> list[SystemdFileValidation] | None:
+    """Verify all unit files with one systemd-analyze call.
+
+    Diagnostics are attributed to a file when the line starts with its path or
+    unit name, and a file only fails when one of its lines is an error rather
+    than a warning. Returns None when a failed call cannot be pinned on the
+    files: no attributable errors (e.g. a timeout) or output that names no
+    file, so the caller can fall back to per-file runs.
+    """
+
+    cmd = ["systemd-analyze", "verify", *unit_files]
+    batch = shell.run_cmd(cmd, timeout=15 + len(unit_files) // 20)
+
+    prefixes: dict[str, list[str]] = defaultdict(list)
+    for path in unit_files:
+        prefixes[f"{path}:"].append(path)
+        prefixes[f"{os.path.basename(path)}:"].append(path)
+
+    diagnostics: dict[str, list[str]] = defaultdict(list)
+    unattributed = False
+    for line in (batch.stderr + batch.stdout).splitlines():
+        prefix = line.split(" ", 1)[0]
+        prefix = prefix[: prefix.find(":") + 1]
+        paths = prefixes.get(prefix, ())
+        for path in paths:
+            diagnostics[path].append(line)
+        if not paths and line.strip():
+            unattributed = True
+
+    failed = (
+        {path for path, lines in diagnostics.items() if not all(map(_is_verify_warning, lines))}
+        if batch.returncode != 0
+        else set()
+    )
+    if batch.returncode != 0 and (unattributed or not failed):
+        return None
+
+    return [
+        SystemdFileValidation(
+            path=path,
+            result=CommandResult(
+                cmd=cmd,
+                returncode=1 if path in failed else 0,
+                stdout="",
+                stderr="\n".join(diagnostics.get(path, ())),
+            ),
+        )
+        for path in unit_files
+    ]
+
+
+def _verify_unit_files(unit_files: list[str], shell: ShellRunner) -> list[SystemdFileValidation]:
+    results = _verify_unit_files_batched(unit_files, shell)
+    if results is not None:
+        return results
+
+    # Per-file fallback: the verify runs are independent and mostly waiting on
+    # the child process, so overlap them. Results keep unit_files order.
+    def _verify_one(path: str) -> CommandResult:
+        return shell.run_cmd(["systemd-analyze", "verify", path], timeout=15)
+
+    with ThreadPoolExecutor(max_workers=min(_VERIFY_WORKERS, os.cpu_count() or 2)) as pool:
+        return [
+            SystemdFileValidation(path=path, result=result)
+            for path, result in zip(unit_files, pool.map(_verify_one, unit_files), strict=True)
+        ]
+
+
+def _verify_cache_key(path: str) -> str | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return f"{path}\0{st.st_mtime_ns}\0{st.st_size}"
+
+
+def _load_verify_cache(cache_path: str) -> dict[str, dict[str, Any]]:
+    try:
+        with open(cache_path, encoding="utf-8") as handle:
+            data = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {key: entry for key, entry in data.items() if _is_verify_cache_entry(entry)}
+
+
+def _is_verify_cache_entry(entry: Any) -> bool:
+    return isinstance(entry, dict) and type(entry.get("returncode")) is int and isinstance(entry.get("stderr"), str)
+
+
+def _store_verify_cache(cache_path: str, entries: dict[str, dict[str, Any]]) -> None:
+    """Write the cache atomically; failures (e.g. not running as root) are ignored."""
+
+    tmp_path = f"{cache_path}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            # Machine-only file: skip the default ", "/": " padding.
+            json.dump(entries, handle, separators=(",", ":"))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
 
 def validate_systemd_tree(
@@ -191,8 +368,22 @@ def validate_systemd_tree(
     *,
     shell: ShellRunner = DEFAULT_SHELL,
     logger: LoggingManager | None = None,
+    cache_path: str | None = None,
 ) -> SystemdValidationReport:
-    """Verify all systemd unit files under base_dir using systemd-analyze."""
+    """Verify all systemd unit files under base_dir using systemd-analyze.
+
+    With ``cache_path`` set, verdicts are persisted there keyed by path, mtime
+    and size, and files that have not changed since the last run are not
+    re-verified. The key does not cover drop-ins, referenced units or
+    binaries, so caching is opt-in and off by default.
+    """
+
+    try:
+        os.stat(base_dir)
+    except FileNotFoundError:
+        if logger:
+            logger.log(f"{base_dir} does not exist; skipping systemd validation.")
+        return SystemdValidationReport(available=False, unit_files=[], validations=[], config_issues=[])
 
     config_issues = validate_resolved_conf(base_dir, logger=logger)
     available = systemd_tools_available()
@@ -213,17 +404,42 @@ def validate_systemd_tree(
     if logger:
         logger.log(f"Validating {len(unit_files)} systemd files under {base_dir}...")
 
-    results: list[SystemdFileValidation] = []
-    for path in unit_files:
-        result = shell.run_cmd(["systemd-analyze", "verify", path], timeout=15)
-        results.append(SystemdFileValidation(path=path, result=result))
+    cache = _load_verify_cache(cache_path) if cache_path else {}
+    keys = {path: _verify_cache_key(path) for path in unit_files}
+    cached: dict[str, SystemdFileValidation] = {}
+    for path, key in keys.items():
+        entry = cache.get(key) if key else None
+        if entry is not None:
+            result = CommandResult(
+                cmd=["systemd-analyze", "verify", path],
+                returncode=entry["returncode"],
+                stdout="",
+                stderr=entry["stderr"],
+            )
+            cached[path] = SystemdFileValidation(path=path, result=result)
+
+    pending = [path for path in unit_files if path not in cached]
+    fresh = {validation.path: validation for validation in _verify_unit_files(pending, shell)} if pending else {}
+    results = [cached.get(path) or fresh[path] for path in unit_files]
+
+    if cache_path:
+        _store_verify_cache(
+            cache_path,
+            {
+                keys[v.path]: {"returncode": v.result.returncode, "stderr": v.result.stderr}
+                for v in results
+                if keys[v.path] and v.result.returncode in (0, 1)
+            },
+        )
 
-        if logger:
+    if logger:
+        for validation in results:
+            result = validation.result
             if result.returncode == 0:
-                logger.log(f"[OK] {path}")
+                logger.log(f"[OK] {validation.path}")
             else:
                 detail = result.stderr.strip() or result.stdout.strip() or f"rc={result.returncode}"
-                logger.log(f"[FAIL] {path}: {detail}")
+                logger.log(f"[FAIL] {validation.path}: {detail}")
 
     return SystemdValidationReport(
         available=True,
@@ -4,15 +4,28 @@ from __future__ import annotations
 
 import dataclasses
 import enum
+import functools
+import os
 import re
-import shutil
+import socket
+import tempfile
+import threading
+import time
 from collections.abc import Iterable, Sequence
+from typing import Literal
 
 from automatic_linux_network_repair.eth_repair.logging_utils import LoggingManager
-from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner
+from automatic_linux_network_repair.eth_repair.shell import DEFAULT_SHELL, ShellRunner, which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
 
 
+@functools.cache
+def _default_logger(name: str) -> LoggingManager:
+    """Return the process-wide fallback logger for ``name``, created on first use."""
+
+    return LoggingManager(name)
+
+
 class SecurityType(enum.Enum):
     """Supported Wi-Fi security options."""
 
@@ -28,21 +41,23 @@ class SecurityType(enum.Enum):
 
         if value is None:
             return cls.WPA2
-        normalized = value.lower().replace("-", "")
-        mapping = {
-            "open": cls.OPEN,
-            "none": cls.OPEN,
-            "wep": cls.WEP,
-            "wpa": cls.WPA,
-            "wpa1": cls.WPA,
-            "wpa2": cls.WPA2,
-            "wpa3": cls.WPA3,
-            "sae": cls.WPA3,
-        }
-        return mapping.get(normalized, cls.WPA2)
-
-
-@dataclasses.dataclass
+        return _SECURITY_LABELS.get(value.lower().translate(_LABEL_STRIP_TABLE), cls.WPA2)
+
+
+_SECURITY_LABELS: dict[str, SecurityType] = {
+    "open": SecurityType.OPEN,
+    "none": SecurityType.OPEN,
+    "wep": SecurityType.WEP,
+    "wpa": SecurityType.WPA,
+    "wpa1": SecurityType.WPA,
+    "wpa2": SecurityType.WPA2,
+    "wpa3": SecurityType.WPA3,
+    "sae": SecurityType.WPA3,
+}
+_LABEL_STRIP_TABLE = str.maketrans("", "", "-_ ")
+
+
+@dataclasses.dataclass(slots=True)
 class WirelessNetwork:
     """Observed Wi-Fi network entry."""
 
@@ -52,7 +67,7 @@ class WirelessNetwork:
     security: list[str]
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(slots=True)
 class ConnectionResult:
     """Outcome from a connection attempt."""
 
@@ -68,9 +83,15 @@ class WirelessBackend:
 
     def __init__(self, *, shell: ShellRunner = DEFAULT_SHELL, logger: LoggingManager | None = None) -> None:
         self.shell = shell
-        self.logger = logger or LoggingManager("wifi")
+        self._logger = logger
+
+    @property
+    def logger(self) -> LoggingManager:
+        return self._logger or _default_logger("wifi")
+
+    def scan(self, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:  # pragma: no cover
+        """Return visible networks; ``rescan`` forces a fresh radio scan where the tool can skip one."""
 
-    def scan(self, interface: str) -> list[WirelessNetwork]:  # pragma: no cover - interface contract
         raise NotImplementedError
 
     def connect(
@@ -88,12 +109,17 @@ class NmcliBackend(WirelessBackend):
 
     name = "nmcli"
 
-    def scan(self, interface: str) -> list[WirelessNetwork]:
+    def scan(self, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:
+        # Unescaped output with SSID last: maxsplit keeps any "|" inside the
+        # SSID intact, and "--rescan auto" lets NetworkManager answer from its
+        # recent scan list instead of always waiting for a new radio scan.
         cmd = [
             "nmcli",
             "-t",
+            "-e",
+            "no",
             "-f",
-            "BSSID,SSID,SECURITY,SIGNAL",
+            "BSSID,SECURITY,SIGNAL,SSID",
             "--separator",
             "|",
             "device",
@@ -101,6 +127,8 @@ class NmcliBackend(WirelessBackend):
             "list",
             "ifname",
             interface,
+            "--rescan",
+            "yes" if rescan else "auto",
         ]
         result = self.shell.run_cmd(cmd, timeout=20)
         if result.returncode != 0:
@@ -108,17 +136,20 @@ class NmcliBackend(WirelessBackend):
             return []
 
         networks: list[WirelessNetwork] = []
+        append = networks.append
         for line in result.stdout.splitlines():
-            if not line.strip():
+            if not line or line.isspace():
                 continue
-            parts = line.split("|")
-            bssid, ssid, security, signal = (parts + [None, None, None, None])[:4]
-            networks.append(
+            # SSID is last and may itself contain "|"; missing trailing fields come back empty.
+            bssid, _, rest = line.partition("|")
+            security, _, rest = rest.partition("|")
+            signal, _, ssid = rest.partition("|")
+            append(
                 WirelessNetwork(
-                    ssid=ssid or "",
+                    ssid=ssid,
                     bssid=bssid or None,
-                    signal=int(signal) if signal and signal.isdigit() else None,
-                    security=[sec for sec in (security or "").split(" ") if sec],
+                    signal=int(signal) if signal.isdigit() else None,
+                    security=security.split(),
                 )
             )
         return networks
@@ -144,6 +175,45 @@ class NmcliBackend(WirelessBackend):
         return ConnectionResult(self.name, True, res.stdout.strip() or "Connected")
 
 
+_WPA_CTRL_DIR = "/var/run/wpa_supplicant"
+
+
+class _WpaCtrl:
+    """Minimal client for wpa_supplicant's per-interface control socket.
+
+    Speaks the same request/reply datagram protocol as ``wpa_cli`` so a
+    connect sequence costs socket round trips instead of process spawns.
+    """
+
+    def __init__(self, ctrl_path: str, timeout: float = 10.0) -> None:
+        self._local_path = os.path.join(tempfile.gettempdir(), f"wpa_ctrl_{os.getpid()}_{id(self):x}")
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.bind(self._local_path)
+            self._sock.connect(ctrl_path)
+        except OSError:
+            self.close()
+            raise
+
+    def request(self, command: str) -> str:
+        self._sock.send(command.encode("utf-8"))
+        return self._sock.recv(4096).decode("utf-8", errors="replace").strip()
+
+    def close(self) -> None:
+        self._sock.close()
+        try:
+            os.unlink(self._local_path)
+        except OSError:
+            pass
+
+    def __enter__(self) -> _WpaCtrl:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
 class WpaCliBackend(WirelessBackend):
     """wpa_supplicant control via wpa_cli."""
 
@@ -153,7 +223,7 @@ class WpaCliBackend(WirelessBackend):
         cmd = ["wpa_cli", "-i", interface, *args]
         return self.shell.run_cmd(cmd, timeout=timeout)
 
-    def scan(self, interface: str) -> list[WirelessNetwork]:
+    def scan(self, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:
         self._call(interface, "scan", timeout=15)
         results = self._call(interface, "scan_results", timeout=15)
         if results.returncode != 0:
@@ -161,13 +231,14 @@ class WpaCliBackend(WirelessBackend):
             return []
 
         networks: list[WirelessNetwork] = []
+        append = networks.append
         for line in results.stdout.splitlines()[1:]:
             # Format: bssid / freq / signal level / flags / ssid
             parts = line.split("\t")
             if len(parts) < 5:
                 continue
             bssid, _, signal, flags, ssid = parts[:5]
-            networks.append(
+            append(
                 WirelessNetwork(
                     ssid=ssid,
                     bssid=bssid,
@@ -184,12 +255,61 @@ class WpaCliBackend(WirelessBackend):
         password: str | None,
         security: SecurityType,
     ) -> ConnectionResult:
+        try:
+            ctrl = _WpaCtrl(os.path.join(_WPA_CTRL_DIR, interface))
+        except OSError as exc:
+            self.logger.debug(f"wpa_supplicant control socket unavailable ({exc}); using wpa_cli")
+        else:
+            with ctrl:
+                return self._connect_via_ctrl(ctrl, ssid, password, security)
+
         add_res = self._call(interface, "add_network")
         if add_res.returncode != 0:
             msg = add_res.stderr.strip() or "Failed to add network"
             return ConnectionResult(self.name, False, msg)
         network_id = add_res.stdout.strip().splitlines()[-1]
+        commands = self._network_commands(network_id, ssid, password, security)
+
+        # Feed the whole configuration to one interactive wpa_cli instead of
+        # spawning it per command; each command answers with OK or FAIL.
+        script = "".join(" ".join(cmd) + "\n" for cmd in commands)
+        res = self.shell.run_cmd(["wpa_cli", "-i", interface], timeout=15, input=script)
+        if res.returncode != 0:
+            msg = res.stderr.strip() or "Failed to configure network"
+            return ConnectionResult(self.name, False, msg)
 
+        replies = [reply for line in res.stdout.splitlines() if (reply := line.lstrip("> ").strip()) in ("OK", "FAIL")]
+        for cmd, reply in zip(commands, replies, strict=False):
+            if reply == "FAIL":
+                return self._rejected(cmd)
+        if len(replies) < len(commands):
+            return ConnectionResult(self.name, False, "wpa_cli did not acknowledge every command")
+
+        return ConnectionResult(self.name, True, "Connected")
+
+    def _connect_via_ctrl(
+        self, ctrl: _WpaCtrl, ssid: str, password: str | None, security: SecurityType
+    ) -> ConnectionResult:
+        try:
+            network_id = ctrl.request("ADD_NETWORK")
+            if not network_id.isdigit():
+                return ConnectionResult(self.name, False, f"Failed to add network ({network_id or 'no reply'})")
+            for cmd in self._network_commands(network_id, ssid, password, security):
+                # Control-socket commands are the upper-case forms wpa_cli sends.
+                if ctrl.request(" ".join((cmd[0].upper(), *cmd[1:]))) != "OK":
+                    return self._rejected(cmd)
+        except OSError as exc:
+            return ConnectionResult(self.name, False, f"wpa_supplicant control socket error: {exc}")
+        return ConnectionResult(self.name, True, "Connected")
+
+    def _rejected(self, cmd: Sequence[str]) -> ConnectionResult:
+        # cmd[:3] stops before the value so keys never reach the message.
+        return ConnectionResult(self.name, False, f"wpa_cli rejected {' '.join(cmd[:3])}")
+
+    @staticmethod
+    def _network_commands(
+        network_id: str, ssid: str, password: str | None, security: SecurityType
+    ) -> list[Sequence[str]]:
         commands: list[Sequence[str]] = [
             ("set_network", network_id, "ssid", f'"{ssid}"'),
             ("set_network", network_id, "scan_ssid", "1"),
@@ -212,19 +332,12 @@ class WpaCliBackend(WirelessBackend):
             else:
                 commands.append(("set_network", network_id, "key_mgmt", "WPA-PSK"))
 
-        for cmd in commands:
-            res = self._call(interface, *cmd)
-            if res.returncode != 0:
-                msg = res.stderr.strip() or "Failed to configure network"
-                return ConnectionResult(self.name, False, msg)
+        commands.append(("enable_network", network_id))
+        commands.append(("select_network", network_id))
+        return commands
 
-        self._call(interface, "enable_network", network_id)
-        sel_res = self._call(interface, "select_network", network_id, timeout=15)
-        if sel_res.returncode != 0:
-            msg = sel_res.stderr.strip() or "Failed to select network"
-            return ConnectionResult(self.name, False, msg)
 
-        return ConnectionResult(self.name, True, "Connected")
+_ANSI_ESCAPE_RE = re.compile(r"\x1b\[[0-9;]*m")
 
 
 class IwctlBackend(WirelessBackend):
@@ -232,7 +345,7 @@ class IwctlBackend(WirelessBackend):
 
     name = "iwctl"
 
-    def scan(self, interface: str) -> list[WirelessNetwork]:
+    def scan(self, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:
         scan_res = self.shell.run_cmd(["iwctl", "station", interface, "scan"], timeout=15)
         if scan_res.returncode != 0:
             self.logger.debug(f"iwctl scan failed: {scan_res.stderr.strip()}")
@@ -243,18 +356,30 @@ class IwctlBackend(WirelessBackend):
             return []
 
         networks: list[WirelessNetwork] = []
-        for line in list_res.stdout.splitlines():
-            # Expected columns: Network name | Security | Signal | ...
-            parts = [part for part in line.split() if part]
-            if len(parts) < 3 or parts[0].lower() == "network":
+        append = networks.append
+        columns: tuple[int, int, int] | None = None
+        for line in _ANSI_ESCAPE_RE.sub("", list_res.stdout).splitlines():
+            # iwctl prints a fixed-width table; take the column offsets from the
+            # "Network name / Security / Signal" header and slice each row, so
+            # SSIDs containing spaces survive.
+            if columns is None:
+                if "Network name" in line and "Security" in line and "Signal" in line:
+                    columns = (line.index("Network name"), line.index("Security"), line.index("Signal"))
+                continue
+            name_col, sec_col, sig_col = columns
+            if len(line) <= sec_col or line.lstrip().startswith("-"):
                 continue
-            ssid, security, signal = parts[0], parts[1], parts[2]
-            networks.append(
+            ssid = line[name_col:sec_col].strip()
+            if not ssid:
+                continue
+            security = line[sec_col:sig_col].strip()
+            signal = line[sig_col:].strip().replace("*", "")
+            append(
                 WirelessNetwork(
                     ssid=ssid,
                     bssid=None,
-                    signal=int(signal.replace("*", "")) if signal.strip("*").isdigit() else None,
-                    security=[security],
+                    signal=int(signal) if signal.isdigit() else None,
+                    security=[security] if security else [],
                 )
             )
         return networks
@@ -281,51 +406,39 @@ class IwlistBackend(WirelessBackend):
 
     name = "iwlist"
 
-    _essid_re = re.compile(r"ESSID:\"?(.*?)\"?$")
-    _quality_re = re.compile(r"Quality=(\d+)/")
-    _enc_re = re.compile(r"Encryption key:(on|off)")
-
-    def scan(self, interface: str) -> list[WirelessNetwork]:
+    def scan(self, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:
         res = self.shell.run_cmd(["iwlist", interface, "scanning"], timeout=20)
         if res.returncode != 0:
             self.logger.debug(f"iwlist scan failed: {res.stderr.strip()}")
             return []
 
         networks: list[WirelessNetwork] = []
+        append = networks.append
         essid: str | None = None
+        bssid: str | None = None
         quality: int | None = None
         enc: list[str] = []
+
+        def flush() -> None:
+            if essid:
+                append(WirelessNetwork(ssid=essid, bssid=bssid, signal=quality, security=enc or ["open"]))
+
+        # Each "Cell NN - Address: ..." line opens a block; ESSID, Quality and
+        # Encryption key lines inside it are recognised by prefix alone.
         for line in res.stdout.splitlines():
-            if match := self._essid_re.search(line.strip()):
-                if essid:
-                    networks.append(
-                        WirelessNetwork(
-                            ssid=essid,
-                            bssid=None,
-                            signal=quality,
-                            security=enc or ["open"],
-                        )
-                    )
-                essid = match.group(1)
-                quality = None
-                enc = []
-                continue
-            if match := self._quality_re.search(line):
-                try:
-                    quality = int(match.group(1))
-                except ValueError:
-                    quality = None
-            if match := self._enc_re.search(line):
-                enc = ["wep"] if match.group(1) == "on" else ["open"]
-        if essid:
-            networks.append(
-                WirelessNetwork(
-                    ssid=essid,
-                    bssid=None,
-                    signal=quality,
-                    security=enc or ["open"],
-                )
-            )
+            s = line.strip()
+            if s.startswith("Cell "):
+                flush()
+                essid, quality, enc = None, None, []
+                bssid = s.partition("Address:")[2].strip() or None
+            elif s.startswith("ESSID:"):
+                essid = s[6:].removeprefix('"').removesuffix('"')
+            elif s.startswith("Quality="):
+                level = s[8:].partition("/")[0]
+                quality = int(level) if level.isdigit() else None
+            elif s.startswith("Encryption key:"):
+                enc = ["wep"] if s[15:] == "on" else ["open"]
+        flush()
         return networks
 
     def connect(
@@ -353,6 +466,44 @@ class IwlistBackend(WirelessBackend):
         return ConnectionResult(self.name, True, "Connected")
 
 
+_SYS_CLASS_NET = "/sys/class/net"
+
+
+def _interface_present(name: str) -> bool:
+    """Return False only when sysfs is available and no longer lists ``name``."""
+
+    if not os.path.isdir(_SYS_CLASS_NET):
+        return True
+    return os.path.isdir(os.path.join(_SYS_CLASS_NET, name))
+
+
+def _signal_sort_key(network: WirelessNetwork) -> tuple[bool, int]:
+    return (network.signal is not None, network.signal or 0)
+
+
+def _unique_networks(
+    networks: Iterable[WirelessNetwork], unique_by: Literal["ssid", "bssid", "both"]
+) -> list[WirelessNetwork]:
+    """Return a new list keeping the first network for each ``unique_by`` key."""
+
+    seen: set[object] = set()
+    unique: list[WirelessNetwork] = []
+    for network in networks:
+        if unique_by == "ssid":
+            key: object = network.ssid
+        elif unique_by == "bssid":
+            key = network.bssid or network.ssid
+        else:
+            key = (network.ssid, network.bssid)
+        if key not in seen:
+            seen.add(key)
+            unique.append(network)
+    return unique
+
+
+_WIRELESS_NAME_PREFIXES = ("wlan", "wlp", "wlx", "wifi", "wwan")
+
+
 class WirelessManager:
     """Facade that selects available wireless backends and exposes simple APIs."""
 
@@ -362,28 +513,48 @@ class WirelessManager:
         shell: ShellRunner = DEFAULT_SHELL,
         logger: LoggingManager | None = None,
         backends: Iterable[WirelessBackend] | None = None,
+        scan_ttl: float = 10.0,
+        cache_interface: bool = True,
     ) -> None:
         self.shell = shell
-        self.logger = logger or LoggingManager("wifi_manager")
+        self._logger = logger
         self.backends = list(backends) if backends is not None else self._detect_backends()
+        # First backend wins when names repeat, matching iteration order.
+        self._backends_by_name = {backend.name: backend for backend in reversed(self.backends)}
+        self.scan_ttl = scan_ttl
+        self._scan_cache: dict[tuple[str, str], tuple[float, list[WirelessNetwork]]] = {}
+        self._scan_lock = threading.Lock()
+        self._scan_pending: dict[tuple[str, str], threading.Thread] = {}
+        self.cache_interface = cache_interface
+        self._interface: str | None = None
+
+    @property
+    def logger(self) -> LoggingManager:
+        return self._logger or _default_logger("wifi_manager")
 
     def detect_interface(self) -> str | None:
         """Heuristically determine a wireless interface name.
 
         The resolver prefers explicit wireless tooling (``iw`` or ``nmcli``) and
         falls back to parsing ``ip link`` output for commonly named interfaces.
-        Returns ``None`` when no plausible wireless adapter is found.
+        Returns ``None`` when no plausible wireless adapter is found. A detected
+        name is remembered for the lifetime of the manager unless it was built
+        with ``cache_interface=False``; it is re-detected if the interface
+        disappears from sysfs or after ``invalidate_interface_cache()``.
         """
 
-        interface = self._detect_with_iw()
-        if interface:
-            return interface
+        if self.cache_interface and self._interface and _interface_present(self._interface):
+            return self._interface
 
-        interface = self._detect_with_nmcli()
-        if interface:
-            return interface
+        interface = self._detect_with_iw() or self._detect_with_nmcli() or self._detect_with_ip_link()
+        if self.cache_interface:
+            self._interface = interface
+        return interface
 
-        return self._detect_with_ip_link()
+    def invalidate_interface_cache(self) -> None:
+        """Forget the remembered interface so the next detection re-probes."""
+
+        self._interface = None
 
     def _detect_backends(self) -> list[WirelessBackend]:
         ordered: list[tuple[str, type[WirelessBackend]]] = [
@@ -394,12 +565,12 @@ class WirelessManager:
         ]
         available: list[WirelessBackend] = []
         for binary, backend_cls in ordered:
-            if shutil.which(binary):
-                available.append(backend_cls(shell=self.shell, logger=self.logger))
+            if which(binary):
+                available.append(backend_cls(shell=self.shell, logger=self._logger))
         return available
 
     def _detect_with_iw(self) -> str | None:
-        if not shutil.which("iw"):
+        if not which("iw"):
             return None
 
         res = self.shell.run_cmd(["iw", "dev"], timeout=8)
@@ -408,13 +579,16 @@ class WirelessManager:
             return None
 
         for line in res.stdout.splitlines():
-            line = line.strip()
-            if line.startswith("Interface "):
-                return line.split()[1]
+            idx = line.find("Interface ")
+            if idx == -1 or (idx and not line[:idx].isspace()):
+                continue
+            name = line[idx + 10 :].split(None, 1)
+            if name:
+                return name[0]
         return None
 
     def _detect_with_nmcli(self) -> str | None:
-        if not shutil.which("nmcli"):
+        if not which("nmcli"):
             return None
 
         res = self.shell.run_cmd(["nmcli", "-t", "-f", "DEVICE,TYPE", "device", "status"], timeout=8)
@@ -423,9 +597,10 @@ class WirelessManager:
             return None
 
         for line in res.stdout.splitlines():
-            parts = line.split(":")
-            if len(parts) >= 2 and parts[1].strip() == "wifi" and parts[0].strip():
-                return parts[0].strip()
+            device, sep, rest = line.partition(":")
+            device = device.strip()
+            if sep and device and rest.partition(":")[0].strip() == "wifi":
+                return device
         return None
 
     def _detect_with_ip_link(self) -> str | None:
@@ -435,21 +610,98 @@ class WirelessManager:
             return None
 
         for line in res.stdout.splitlines():
-            parts = line.split(":", 2)
-            if len(parts) < 2:
+            _, sep, rest = line.partition(":")
+            if not sep:
                 continue
-            name = parts[1].strip().split("@")[0]
-            lowered = name.lower()
-            if lowered.startswith(("wlan", "wlp", "wlx", "wifi", "wwan")):
+            # Kernel interface names are lowercase by convention, so compare
+            # the prefixes directly instead of lowering every link name.
+            name = rest.partition(":")[0].strip().partition("@")[0]
+            if name.startswith(_WIRELESS_NAME_PREFIXES):
                 return name
         return None
 
-    def scan(self, interface: str, preferred_backend: str | None = None) -> list[WirelessNetwork]:
+    def scan(
+        self,
+        interface: str,
+        preferred_backend: str | None = None,
+        *,
+        force_refresh: bool = False,
+        unique_by: Literal["ssid", "bssid", "both"] = "both",
+    ) -> list[WirelessNetwork]:
+        """Return networks visible on ``interface``.
+
+        Networks come back strongest first. Non-empty results are cached per
+        backend and interface. Once an entry is older than half of
+        ``scan_ttl`` it is still returned, but a refresh is started in the
+        background; past ``scan_ttl`` the entry is never served and the call
+        blocks for a new scan. ``force_refresh`` always blocks and asks the
+        backend for a fresh radio scan. Duplicate rows are collapsed by ``unique_by``,
+        keeping the strongest entry for each SSID, BSSID or pair of both.
+        """
+
         backend = self._choose_backend(preferred_backend)
         if backend is None:
             self.logger.log("[ERROR] No wireless backend available for scanning.")
             return []
-        return backend.scan(interface)
+
+        cached = self._scan_cache.get((backend.name, interface))
+        if cached is not None and not force_refresh:
+            age = time.monotonic() - cached[0]
+            if age < self.scan_ttl / 2:
+                return _unique_networks(cached[1], unique_by)
+            if age < self.scan_ttl:
+                self._refresh_in_background(backend, interface)
+                return _unique_networks(cached[1], unique_by)
+
+        return _unique_networks(self._refresh_scan(backend, interface, rescan=force_refresh), unique_by)
+
+    def _refresh_scan(self, backend: WirelessBackend, interface: str, *, rescan: bool = False) -> list[WirelessNetwork]:
+        networks = backend.scan(interface, rescan=rescan)
+        # Strongest first; entries without a reading sort last. Each backend
+        # reports on its own scale, but one scan never mixes backends.
+        networks.sort(key=_signal_sort_key, reverse=True)
+        key = (backend.name, interface)
+        with self._scan_lock:
+            if networks:
+                self._scan_cache[key] = (time.monotonic(), list(networks))
+            else:
+                self._scan_cache.pop(key, None)
+        return networks
+
+    def _refresh_in_background(self, backend: WirelessBackend, interface: str) -> None:
+        key = (backend.name, interface)
+        with self._scan_lock:
+            pending = self._scan_pending.get(key)
+            if pending is not None and pending.is_alive():
+                return
+            # A daemon thread, unlike an executor worker, is not joined at
+            # interpreter exit, so an in-flight refresh cannot delay it.
+            thread = threading.Thread(
+                target=self._refresh_quietly, args=(backend, interface), name="wifi-scan", daemon=True
+            )
+            self._scan_pending[key] = thread
+            thread.start()
+
+    def _refresh_quietly(self, backend: WirelessBackend, interface: str) -> None:
+        try:
+            self._refresh_scan(backend, interface)
+        except Exception as exc:  # noqa: BLE001 - a failed refresh keeps the cached entry
+            self.logger.debug(f"Background {backend.name} scan on {interface} failed: {exc}")
+
+    def close(self, timeout: float | None = None) -> None:
+        """Wait up to ``timeout`` seconds for background scan refreshes to finish."""
+
+        with self._scan_lock:
+            pending = list(self._scan_pending.values())
+            self._scan_pending.clear()
+        for thread in pending:
+            thread.join(timeout)
+
+    def invalidate_scan_cache(self) -> None:
+        """Drop all cached scan results so the next scan hits the backend."""
+
+        with self._scan_lock:
+            self._scan_cache.clear()
 
     def connect(
         self,
@@ -463,20 +715,20 @@ class WirelessManager:
         for backend in self._candidate_backends(preferred_backend):
             result = backend.connect(interface, ssid, password, security_enum)
             if result.success:
+                self.invalidate_scan_cache()
                 return result
             self.logger.debug(f"Backend {backend.name} failed to connect to {ssid!r}: {result.message}")
         return ConnectionResult("none", False, "No wireless backend could establish the connection")
 
     def _candidate_backends(self, preferred_backend: str | None) -> Iterable[WirelessBackend]:
-        if preferred_backend:
-            for backend in self.backends:
-                if backend.name == preferred_backend:
-                    yield backend
-                    break
+        preferred = self._backends_by_name.get(preferred_backend) if preferred_backend else None
+        if preferred is None:
+            yield from self.backends
+            return
+        yield preferred
         for backend in self.backends:
-            if preferred_backend and backend.name == preferred_backend:
-                continue
-            yield backend
+            if backend.name != preferred_backend:
+                yield backend
 
     def _choose_backend(self, preferred_backend: str | None) -> WirelessBackend | None:
         for backend in self._candidate_backends(preferred_backend):
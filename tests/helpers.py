@@ -1,12 +1,19 @@
 """Reusable test utilities and recording stubs for the test suite."""
 
+import io
+from collections import deque
+
+from rich.console import Console
+
 
 class RecordingLogger:
     """In-memory logger capturing log messages and setup calls."""
 
     def __init__(self):
-        self.messages: list[str] = []
+        self.messages: deque[str] = deque()
         self.setup_calls: list[bool] = []
+        self._joined = ""
+        self._joined_count = 0
 
     def setup(self, verbose: bool) -> None:
         self.setup_calls.append(verbose)
@@ -14,5 +21,101 @@ class RecordingLogger:
     def log(self, msg: str) -> None:
         self.messages.append(msg)
 
+    def log_block(self, lines: list[str]) -> None:
+        self.messages.extend(lines)
+
     def debug(self, msg: str) -> None:  # pragma: no cover - simple passthrough
         self.messages.append(f"DEBUG:{msg}")
+
+    def _text(self) -> str:
+        # Rejoin only when messages grew since the last lookup.
+        if self._joined_count != len(self.messages):
+            self._joined = "\n".join(self.messages)
+            self._joined_count = len(self.messages)
+        return self._joined
+
+    def contains(self, text: str) -> bool:
+        """Return True if any recorded message contains ``text``."""
+
+        return text in self._text()
+
+    def contains_all(self, *texts: str) -> bool:
+        """Return True if every one of ``texts`` appears in the recorded messages."""
+
+        joined = self._text()
+        return all(text in joined for text in texts)
+
+    def last_matching(self, text: str) -> str | None:
+        """Return the most recent message containing ``text``, or None."""
+
+        return next((msg for msg in reversed(self.messages) if text in msg), None)
+
+    def assert_contains_all(self, *texts: str) -> None:
+        """Assert every one of ``texts`` was logged, reporting the ones that are missing."""
+
+        joined = self._text()
+        missing = [text for text in texts if text not in joined]
+        assert not missing, f"missing from log: {missing}"
+
+
+class ListSink:
+    """Minimal text stream that keeps each write as its own chunk."""
+
+    __slots__ = ("chunks",)
+
+    def __init__(self) -> None:
+        self.chunks: list[str] = []
+
+    def write(self, text: str) -> int:
+        self.chunks.append(text)
+        return len(text)
+
+    def flush(self) -> None:  # pragma: no cover - print() may call it
+        pass
+
+    def getvalue(self) -> str:
+        return "".join(self.chunks)
+
+
+class InputScript:
+    """Callable stand-in for ``input`` that replays scripted answers in order."""
+
+    __slots__ = ("answers", "index")
+
+    def __init__(self, *answers: str) -> None:
+        self.answers = answers
+        self.index = 0
+
+    def __call__(self, prompt: str = "") -> str:
+        answer = self.answers[self.index]
+        self.index += 1
+        return answer
+
+
+class ReturnSequence:
+    """Stub callable that returns ``values`` in order, repeating the last one once exhausted."""
+
+    __slots__ = ("values", "calls")
+
+    def __init__(self, *values: object) -> None:
+        self.values = values
+        self.calls = 0
+
+    def __call__(self, *args: object, **kwargs: object) -> object:
+        value = self.values[min(self.calls, len(self.values) - 1)]
+        self.calls += 1
+        return value
+
+
+def text_console(width: int = 200) -> tuple[Console, io.StringIO]:
+    """Return a plain-text console and the buffer it writes to."""
+
+    buffer = io.StringIO()
+    return Console(file=buffer, force_terminal=False, width=width), buffer
+
+
+def patch_many(monkeypatch, target: object, **attrs: object) -> None:
+    """Apply several ``monkeypatch.setattr`` calls against one target."""
+
+    for name, value in attrs.items():
+        monkeypatch.setattr(target, name, value)
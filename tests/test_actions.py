@@ -49,3 +49,46 @@ def test_apply_action_propagates_failure(monkeypatch):
 
     assert result is False
     assert fake_shell.calls == [["false"]]
+
+
+def test_apply_action_returns_verify_result(monkeypatch):
+    """A verify callback should run after the command and decide the result."""
+
+    fake_shell = _RecordingShell(returncode=1)
+    monkeypatch.setattr(actions, "DEFAULT_SHELL", fake_shell)
+    monkeypatch.setattr(actions, "DEFAULT_LOGGER", _NullLogger())
+
+    assert actions.apply_action("renew", ["dhclient"], dry_run=False, verify=lambda: True) is True
+    assert actions.apply_action("renew", ["dhclient"], dry_run=True, verify=lambda: True) is False
+    assert fake_shell.calls == [["dhclient"]]
+
+
+def test_apply_action_invalidates_manager_cache_on_systemctl_restart(monkeypatch):
+    """Restarting a service should drop cached network manager state."""
+
+    invalidations: list[bool] = []
+    monkeypatch.setattr(actions, "DEFAULT_SHELL", _RecordingShell())
+    monkeypatch.setattr(actions, "DEFAULT_LOGGER", _NullLogger())
+    monkeypatch.setattr(actions, "invalidate_managers_cache", lambda: invalidations.append(True))
+
+    actions.apply_action("ip", ["ip", "link", "set", "eth0", "up"], dry_run=False)
+    assert invalidations == []
+
+    actions.apply_action("restart", ["systemctl", "restart", "NetworkManager"], dry_run=False)
+    assert invalidations == [True]
+
+
+def test_apply_action_invalidates_iface_cache_on_link_changes(monkeypatch):
+    """Link-changing commands should drop the cached interface list."""
+
+    invalidations: list[bool] = []
+    monkeypatch.setattr(actions, "DEFAULT_SHELL", _RecordingShell())
+    monkeypatch.setattr(actions, "DEFAULT_LOGGER", _NullLogger())
+    monkeypatch.setattr(actions, "invalidate_iface_cache", lambda: invalidations.append(True))
+
+    actions.apply_action("restart", ["systemctl", "restart", "NetworkManager"], dry_run=False)
+    assert invalidations == []
+
+    actions.apply_action("link", ["ip", "link", "set", "eth0", "up"], dry_run=False)
+    actions.apply_action("ifup", ["ifup", "eth0"], dry_run=False)
+    assert invalidations == [True, True]
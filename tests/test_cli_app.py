@@ -65,7 +65,7 @@ def test_side_effects_warn_not_root_logs_and_prints():
     effects.warn_not_root()
 
     assert "must be run as root" in effects.stderr.getvalue()
-    assert any("Not running as root" in msg for msg in effects.logger.messages)
+    assert effects.logger.contains("Not running as root")
 
 
 def test_run_auto_mode_uses_side_effects():
@@ -98,7 +98,5 @@ def test_run_auto_mode_uses_side_effects():
 
     assert exit_code == 0
     assert effects.logger.setup_calls == [True]
-    assert any("starting for interface: eth1" in msg for msg in effects.logger.messages)
-    assert any("Dry-run mode enabled" in msg for msg in effects.logger.messages)
-    assert any("Log file" in msg for msg in effects.logger.messages)
+    effects.logger.assert_contains_all("starting for interface: eth1", "Dry-run mode enabled", "Log file")
     assert app.auto_runs == 1
@@ -1,7 +1,7 @@
 """Tests for fuzzy network diagnosis scoring logic."""
 
 from automatic_linux_network_repair.eth_repair import diagnostics
-from automatic_linux_network_repair.eth_repair.types import Diagnosis, ResolvConfMode, Suspicion
+from automatic_linux_network_repair.eth_repair.types import Diagnosis, IfaceSnapshot, ResolvConfMode, Suspicion
 
 
 class _SilentLogger:
@@ -13,7 +13,19 @@ def test_fuzzy_diagnose_interface_missing(monkeypatch):
     """Interface absence should return an immediate INTERFACE_MISSING diagnosis."""
 
     monkeypatch.setattr(diagnostics, "DEFAULT_LOGGER", _SilentLogger())
-    monkeypatch.setattr(diagnostics, "interface_exists", lambda iface: False)
+    monkeypatch.setattr(diagnostics, "probe_iface", lambda iface: IfaceSnapshot(iface=iface, exists=False))
+
+    def _unexpected_probe(*args):
+        raise AssertionError("connectivity probes should not run for a missing interface")
+
+    for name in (
+        "has_default_route",
+        "ping_host",
+        "dns_resolves",
+        "systemd_resolved_status",
+        "detect_resolv_conf_mode",
+    ):
+        monkeypatch.setattr(diagnostics, name, _unexpected_probe)
 
     diag = diagnostics.fuzzy_diagnose("eth0")
 
@@ -31,9 +43,11 @@ def test_fuzzy_diagnose_dns_prioritized_when_systemd_stub_inactive(monkeypatch):
     """DNS issues should be escalated when systemd stub is configured but inactive."""
 
     monkeypatch.setattr(diagnostics, "DEFAULT_LOGGER", _SilentLogger())
-    monkeypatch.setattr(diagnostics, "interface_exists", lambda iface: True)
-    monkeypatch.setattr(diagnostics, "interface_link_up", lambda iface: True)
-    monkeypatch.setattr(diagnostics, "interface_has_ipv4", lambda iface: True)
+    monkeypatch.setattr(
+        diagnostics,
+        "probe_iface",
+        lambda iface: IfaceSnapshot(iface=iface, exists=True, link_up=True, ipv4=("192.0.2.10/24",)),
+    )
     monkeypatch.setattr(diagnostics, "has_default_route", lambda: True)
     monkeypatch.setattr(diagnostics, "ping_host", lambda host: True)
     monkeypatch.setattr(diagnostics, "dns_resolves", lambda name="deb.debian.org": False)
@@ -61,3 +75,25 @@ def test_fuzzy_diagnose_dns_prioritized_when_systemd_stub_inactive(monkeypatch):
         Suspicion.NO_INTERNET,
     ):
         assert diag.suspicion_scores[suspicion] == 0.0
+
+
+def test_sorted_scores_breaks_ties_by_suspicion_order():
+    """Equal scores should be ordered from lower-level faults upward."""
+
+    diag = Diagnosis(
+        "eth0",
+        {
+            Suspicion.DNS_BROKEN: 0.6,
+            Suspicion.NO_INTERNET: 0.6,
+            Suspicion.NO_ROUTE: 0.6,
+            Suspicion.LINK_DOWN: 0.8,
+        },
+    )
+
+    assert [suspicion for suspicion, _ in diag.sorted_scores()] == [
+        Suspicion.LINK_DOWN,
+        Suspicion.NO_ROUTE,
+        Suspicion.NO_INTERNET,
+        Suspicion.DNS_BROKEN,
+    ]
+    assert diag.top_suspicion is Suspicion.LINK_DOWN
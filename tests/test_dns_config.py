@@ -0,0 +1,145 @@
+"""Tests for systemd-resolved and resolv.conf helpers."""
+
+import pytest
+
+from automatic_linux_network_repair.eth_repair import dns_config
+from automatic_linux_network_repair.eth_repair.repairs import DnsRepairSideEffects
+from automatic_linux_network_repair.eth_repair.types import CommandResult, ResolvConfMode
+from tests.helpers import RecordingLogger, patch_many
+
+
+class _CountingShell:
+    def __init__(self, stdout: str = "", returncode: int = 0) -> None:
+        self.stdout = stdout
+        self.returncode = returncode
+        self.calls: list[list[str]] = []
+
+    def run_cmd(self, cmd: list[str], timeout: int = 5) -> CommandResult:  # noqa: ARG002
+        self.calls.append(cmd)
+        return CommandResult(cmd=cmd, returncode=self.returncode, stdout=self.stdout, stderr="")
+
+
+def test_systemd_resolved_status_is_cached_until_invalidated(monkeypatch):
+    """Repeated status checks should reuse one systemctl show probe."""
+
+    shell = _CountingShell("ActiveState=active\nUnitFileState=enabled\n")
+    monkeypatch.setattr(dns_config, "DEFAULT_SHELL", shell)
+    dns_config.invalidate_dns_status_cache()
+
+    first = dns_config.systemd_resolved_status()
+    second = dns_config.systemd_resolved_status()
+
+    assert first == {"active": True, "enabled": True}
+    assert second is first
+    assert shell.calls == [["systemctl", "show", "-p", "ActiveState,UnitFileState", "systemd-resolved"]]
+
+    dns_config.set_systemd_resolved_enabled(True, dry_run=True)
+    dns_config.systemd_resolved_status()
+
+    assert len(shell.calls) == 2
+    dns_config.invalidate_dns_status_cache()
+
+
+@pytest.mark.parametrize(
+    ("stdout", "returncode", "expected"),
+    [
+        ("ActiveState=inactive\nUnitFileState=masked\n", 0, {"active": False, "enabled": False}),
+        ("ActiveState=inactive\nUnitFileState=\n", 0, {"active": False, "enabled": False}),
+        ("ActiveState=inactive\nUnitFileState=bad\n", 0, {"active": False, "enabled": False}),
+        ("ActiveState=active\nUnitFileState=transient\n", 0, {"active": True, "enabled": True}),
+        ("", 1, {"active": False, "enabled": None}),
+    ],
+)
+def test_systemd_resolved_status_maps_unit_file_states(monkeypatch, stdout, returncode, expected):
+    """Only enabled-like states count as enabled; enabled is unknown only when systemctl fails."""
+
+    monkeypatch.setattr(dns_config, "dbus_unit_properties", lambda unit, names: None)
+    monkeypatch.setattr(dns_config, "DEFAULT_SHELL", _CountingShell(stdout, returncode))
+    dns_config.invalidate_dns_status_cache()
+    try:
+        assert dns_config.systemd_resolved_status() == expected
+    finally:
+        dns_config.invalidate_dns_status_cache()
+
+
+def test_set_resolv_conf_manual_public_replaces_symlink(monkeypatch, tmp_path):
+    """The manual file should replace a stub symlink, not write through it."""
+
+    stub = tmp_path / "stub-resolv.conf"
+    stub.write_text("nameserver 127.0.0.53\n")
+    resolv = tmp_path / "resolv.conf"
+    resolv.symlink_to(stub)
+    monkeypatch.setattr(dns_config, "_RESOLV_CONF_PATH", str(resolv))
+    monkeypatch.setattr(dns_config, "backup_resolv_conf", lambda dry_run: None)
+
+    dns_config.set_resolv_conf_manual_public(dry_run=True)
+    assert resolv.is_symlink()
+
+    dns_config.set_resolv_conf_manual_public(dry_run=False)
+
+    assert not resolv.is_symlink()
+    assert resolv.read_text() == "nameserver 1.1.1.1\nnameserver 8.8.8.8\n"
+    assert stub.read_text() == "nameserver 127.0.0.53\n"
+
+
+def test_set_resolv_conf_manual_public_removes_temp_file_on_failure(monkeypatch, tmp_path):
+    """A failed rename should leave neither a temp file nor a changed resolv.conf behind."""
+
+    resolv = tmp_path / "resolv.conf"
+    resolv.write_text("nameserver 192.0.2.53\n")
+    logger = RecordingLogger()
+
+    def _fail_replace(src, dst):
+        raise PermissionError("read-only file system")
+
+    patch_many(monkeypatch, dns_config, _RESOLV_CONF_PATH=str(resolv), DEFAULT_LOGGER=logger)
+    monkeypatch.setattr(dns_config, "backup_resolv_conf", lambda dry_run: None)
+    monkeypatch.setattr(dns_config.os, "replace", _fail_replace)
+
+    dns_config.set_resolv_conf_manual_public(dry_run=False)
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["resolv.conf"]
+    assert resolv.read_text() == "nameserver 192.0.2.53\n"
+    assert logger.contains("Action failed")
+
+
+def test_backup_resolv_conf_uses_configured_path(monkeypatch, tmp_path):
+    """The backup should copy whichever resolv.conf path the module is configured with."""
+
+    resolv = tmp_path / "resolv.conf"
+    resolv.write_text("nameserver 192.0.2.53\n")
+    actions: list[list[str]] = []
+    monkeypatch.setattr(dns_config, "_RESOLV_CONF_PATH", str(resolv))
+    monkeypatch.setattr(dns_config, "apply_action", lambda label, cmd, dry_run: actions.append(cmd))
+
+    dns_config.backup_resolv_conf(dry_run=True)
+
+    assert actions == [["cp", str(resolv), f"{resolv}.bak"]]
+
+
+def test_status_report_matches_repair_wording(monkeypatch):
+    """The status panel and the DNS repair log should render identical status lines."""
+
+    status = {"active": True, "enabled": False}
+    mode = (ResolvConfMode.MANUAL, "regular file")
+    panel = RecordingLogger()
+    patch_many(
+        monkeypatch,
+        dns_config,
+        DEFAULT_LOGGER=panel,
+        systemd_resolved_status=lambda: status,
+        detect_resolv_conf_mode=lambda: mode,
+        read_resolv_conf_summary=lambda: [],
+    )
+    effects = DnsRepairSideEffects(logger=RecordingLogger())
+
+    dns_config.show_systemd_dns_status()
+    effects.log_dns_broken_details(status, *mode)
+
+    expected = [
+        "systemd-resolved active : True",
+        "systemd-resolved enabled: False",
+        "/etc/resolv.conf mode   : manual (regular file)",
+    ]
+    assert list(panel.messages)[2:5] == expected
+    assert list(effects.logger.messages)[2:] == expected
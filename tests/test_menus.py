@@ -1,18 +1,31 @@
 """Tests for menu side effects and control flow wiring."""
 
-import io
+import pytest
 
 from automatic_linux_network_repair.eth_repair import menus
-from tests.helpers import RecordingLogger
+from tests.helpers import InputScript, ListSink, RecordingLogger, patch_many
+
+_EXPECTED_OPTIONS = (
+    "1) Show interface & connectivity status",
+    "2) Run FULL fuzzy auto-diagnose & repair",
+    "3) Bring link UP on current interface",
+    "4) Obtain IPv4 / renew DHCP on interface",
+    "5) Restart network stack (routing / services)",
+    "6) Attempt DNS repair (may edit resolv.conf)",
+    "7) Change interface",
+    "8) Show ALL adapters & addresses",
+    "9) Advanced systemd / DNS controls",
+    "10) Quit",
+)
 
 
 def test_side_effects_render_main_menu_and_capture_input():
-    outputs = io.StringIO()
-    choices = iter(["5"])
+    outputs = ListSink()
+    choices = InputScript("5")
     effects = menus.EthernetMenuSideEffects(
         logger=RecordingLogger(),
         stdout=outputs,
-        input_func=lambda prompt: next(choices),
+        input_func=choices,
     )
 
     choice = effects.show_main_menu("eth0")
@@ -23,83 +36,58 @@ def test_side_effects_render_main_menu_and_capture_input():
     assert "Current interface: eth0" in text
 
 
-def test_menu_handles_invalid_choice_and_exit(monkeypatch):
-    logs = RecordingLogger()
-    outputs = io.StringIO()
-    choices = iter(["11", "10"])
-    effects = menus.EthernetMenuSideEffects(
-        logger=logs,
-        stdout=outputs,
-        input_func=lambda prompt: next(choices),
-    )
-
-    menu = menus.EthernetRepairMenu("eth0", False, effects)
-    menu.run()
-
-    assert any("Exiting menu" in msg for msg in logs.messages)
-    assert "Invalid choice" in outputs.getvalue()
-
+_ADVANCED_STUBS = {
+    "show_systemd_dns_status": lambda: None,
+    "set_systemd_resolved_enabled": lambda enabled, dry_run: None,
+    "set_resolv_conf_symlink": lambda path, dry_run: None,
+    "set_resolv_conf_manual_public": lambda dry_run: None,
+}
+
+
+@pytest.mark.parametrize(
+    ("inputs", "stubs", "expect_log", "expect_out"),
+    [
+        pytest.param(("11", "10"), {}, ("Exiting menu",), ("Invalid choice",), id="invalid-choice-then-exit"),
+        pytest.param(("9", "7", "10"), _ADVANCED_STUBS, ("Leaving advanced", "Exiting menu"), (), id="advanced-exit"),
+        pytest.param(("10",), {}, (), _EXPECTED_OPTIONS, id="lists-all-options"),
+        pytest.param(
+            ("7", "eth1", "10"),
+            {"list_candidate_interfaces": lambda: ["eth0", "eth1"], "show_status": lambda iface: None},
+            (),
+            ("Current interface: eth0", "Current interface: eth1"),
+            id="interface-change",
+        ),
+    ],
+)
+def test_menu_run(monkeypatch, inputs, stubs, expect_log, expect_out):
+    """Scripted menu sessions should log and render the expected markers."""
 
-def test_menu_logs_advanced_menu_exit(monkeypatch):
     logs = RecordingLogger()
-    outputs = io.StringIO()
-    choices = iter(["9", "7", "10"])
+    outputs = ListSink()
     effects = menus.EthernetMenuSideEffects(
         logger=logs,
         stdout=outputs,
-        input_func=lambda prompt: next(choices),
+        input_func=InputScript(*inputs),
     )
+    patch_many(monkeypatch, menus, **stubs)
 
-    menu = menus.EthernetRepairMenu("eth0", False, effects)
-
-    monkeypatch.setattr(menus, "show_systemd_dns_status", lambda: None)
-    monkeypatch.setattr(menus, "set_systemd_resolved_enabled", lambda enabled, dry_run: None)
-    monkeypatch.setattr(menus, "set_resolv_conf_symlink", lambda path, dry_run: None)
-    monkeypatch.setattr(menus, "set_resolv_conf_manual_public", lambda dry_run: None)
-
-    menu.run()
-
-    assert any("Leaving advanced" in msg for msg in logs.messages)
-    assert any("Exiting menu" in msg for msg in logs.messages)
-
-
-def test_main_menu_lists_all_options():
-    outputs = io.StringIO()
-    choices = iter(["10"])
-    effects = menus.EthernetMenuSideEffects(
-        logger=RecordingLogger(),
-        stdout=outputs,
-        input_func=lambda prompt: next(choices),
-    )
-
-    menu = menus.EthernetRepairMenu("eth0", False, effects)
-    menu.run()
+    menus.EthernetRepairMenu("eth0", False, effects).run()
 
+    logs.assert_contains_all(*expect_log)
     rendered = outputs.getvalue()
-    for option_text in [
-        "1) Show interface & connectivity status",
-        "2) Run FULL fuzzy auto-diagnose & repair",
-        "3) Bring link UP on current interface",
-        "4) Obtain IPv4 / renew DHCP on interface",
-        "5) Restart network stack (routing / services)",
-        "6) Attempt DNS repair (may edit resolv.conf)",
-        "7) Change interface",
-        "8) Show ALL adapters & addresses",
-        "9) Advanced systemd / DNS controls",
-        "10) Quit",
-    ]:
-        assert option_text in rendered
+    missing = [text for text in expect_out if text not in rendered]
+    assert not missing
 
 
 def test_main_menu_rerenders_after_repair(monkeypatch):
     """After performing a repair action, the main menu should render again."""
 
-    outputs = io.StringIO()
-    choices = iter(["3", "10"])
+    outputs = ListSink()
+    choices = InputScript("3", "10")
 
     class RecordingEffects(menus.EthernetMenuSideEffects):
         def __init__(self):
-            super().__init__(logger=RecordingLogger(), stdout=outputs, input_func=lambda prompt: next(choices))
+            super().__init__(logger=RecordingLogger(), stdout=outputs, input_func=choices)
             self.menu_calls: list[str] = []
 
         def show_main_menu(self, current_iface: str) -> str:  # type: ignore[override]
@@ -114,23 +102,3 @@ def test_main_menu_rerenders_after_repair(monkeypatch):
     menu.run()
 
     assert effects.menu_calls == ["eth0", "eth0"]
-
-
-def test_interface_change_updates_menu(monkeypatch):
-    outputs = io.StringIO()
-    choices = iter(["7", "eth1", "10"])
-    effects = menus.EthernetMenuSideEffects(
-        logger=RecordingLogger(),
-        stdout=outputs,
-        input_func=lambda prompt: next(choices),
-    )
-
-    monkeypatch.setattr(menus, "list_candidate_interfaces", lambda: ["eth0", "eth1"])
-    monkeypatch.setattr(menus, "show_status", lambda iface: None)
-
-    menu = menus.EthernetRepairMenu("eth0", False, effects)
-    menu.run()
-
-    rendered = outputs.getvalue()
-    assert "Current interface: eth0" in rendered
-    assert "Current interface: eth1" in rendered
@@ -1,7 +1,42 @@
 """Tests for network probe helpers."""
 
+import shutil
+import socket
+import threading
+
+import pytest
+
 from automatic_linux_network_repair.eth_repair import probes
-from automatic_linux_network_repair.eth_repair.types import CommandResult
+from automatic_linux_network_repair.eth_repair.shell import which
+from automatic_linux_network_repair.eth_repair.types import CommandResult, IfaceSnapshot, NetworkManagers
+
+
+@pytest.fixture(autouse=True)
+def _fresh_tool_lookup():
+    """Tests patch shutil.which, so drop the memoized tool lookups around each one."""
+
+    which.cache_clear()
+    yield
+    which.cache_clear()
+
+
+_SYSTEMCTL_VPN_STDOUT = """
+openvpn.service                  loaded active running   OpenVPN service
+network-manager.service          loaded active running   Network Manager
+wg-quick@wg0.service             loaded active running   WireGuard via wg-quick(8) for wg0
+zerotier-one.service             loaded active running   ZeroTier One
+ssh.service                      loaded active running   OpenBSD Secure Shell server
+"""
+
+_IP_LINK_STDOUT = """
+1: lo: <LOOPBACK> mtu 65536 qdisc noop state DOWN mode DEFAULT group default qlen 1000
+2: wlan0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
+3: enp3s0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state UP mode DEFAULT group default qlen 1000
+4: eth1: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
+5: wwan0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
+6: veth3f2a@if5: <BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue master docker0 state UP mode DEFAULT group default
+7: docker0: <BROADCAST,MULTICAST,UP> mtu 1500 qdisc noqueue state UP mode DEFAULT group default
+"""
 
 
 class _StubLogger:
@@ -26,16 +61,8 @@ class _StubShell:
 def test_detect_active_vpn_services_filters_services(monkeypatch):
     """VPN detection should surface only running VPN-like systemd units."""
 
-    stdout = """
-openvpn.service                  loaded active running   OpenVPN service
-network-manager.service          loaded active running   Network Manager
-wg-quick@wg0.service             loaded active running   WireGuard via wg-quick(8) for wg0
-zerotier-one.service             loaded active running   ZeroTier One
-ssh.service                      loaded active running   OpenBSD Secure Shell server
-"""
-
     logger = _StubLogger()
-    shell = _StubShell(stdout)
+    shell = _StubShell(_SYSTEMCTL_VPN_STDOUT)
     monkeypatch.setattr(probes, "DEFAULT_LOGGER", logger)
     monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
 
@@ -52,15 +79,268 @@ ssh.service                      loaded active running   OpenBSD Secure Shell se
 def test_list_candidate_interfaces_prioritizes_wired(monkeypatch):
     """Interface discovery should sort physical Ethernet before wireless."""
 
-    stdout = """
-1: lo: <LOOPBACK> mtu 65536 qdisc noop state DOWN mode DEFAULT group default qlen 1000
-2: wlan0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
-3: enp3s0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state UP mode DEFAULT group default qlen 1000
-4: eth1: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
-5: wwan0: <BROADCAST,MULTICAST> mtu 1500 qdisc noop state DOWN mode DEFAULT group default qlen 1000
-"""
+    shell = _StubShell(_IP_LINK_STDOUT)
+    monkeypatch.setattr(probes, "_IFACE_CACHE", None)
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    assert probes.list_candidate_interfaces() == ["enp3s0", "eth1", "wlan0", "wwan0"]
+
+    # A second lookup within the TTL is served from the cache.
+    assert probes.list_candidate_interfaces() == ["enp3s0", "eth1", "wlan0", "wwan0"]
+    assert len(shell.calls) == 1
+
+
+def test_detect_network_managers_uses_single_systemctl_call(monkeypatch):
+    """Manager probing should batch unit states into one is-active query."""
+
+    shell = _StubShell("inactive\nactive\n", returncode=3)
+    monkeypatch.setattr(probes, "_MGR_CACHE", None)
+    monkeypatch.setattr(probes, "DEFAULT_LOGGER", _StubLogger())
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+
+    managers = probes.detect_network_managers()
+
+    assert managers == NetworkManagers(network_manager=False, systemd_networkd=True, ifupdown=False)
+    assert managers.as_dict() == {"NetworkManager": False, "systemd-networkd": True, "ifupdown": False}
+    assert shell.calls == [["systemctl", "is-active", "NetworkManager", "systemd-networkd"]]
+
+
+def test_detect_network_managers_caches_until_invalidated(monkeypatch):
+    """Repeated probes within the TTL should reuse the cached result."""
+
+    shell = _StubShell("active\nactive\n")
+    monkeypatch.setattr(probes, "_MGR_CACHE", None)
+    monkeypatch.setattr(probes, "DEFAULT_LOGGER", _StubLogger())
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+
+    first = probes.detect_network_managers()
+    assert probes.detect_network_managers() is first
+    assert len(shell.calls) == 1
+
+    probes.invalidate_managers_cache()
+    probes.detect_network_managers()
+    assert len(shell.calls) == 2
+
+
+def test_units_active_prefers_dbus_when_pystemd_is_available(monkeypatch):
+    """Unit states should come from D-Bus without forking systemctl."""
+
+    class _FakeUnit:
+        def __init__(self, name: bytes, _autoload: bool = False) -> None:
+            state = b"active" if name == b"NetworkManager.service" else b"inactive"
+            self.Unit = type("UnitProps", (), {"ActiveState": state})
+
+    shell = _StubShell("")
+    monkeypatch.setattr(probes, "_PYSTEMD_UNIT", _FakeUnit)
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    assert probes.units_active(["NetworkManager", "systemd-networkd"]) == {
+        "NetworkManager": True,
+        "systemd-networkd": False,
+    }
+    assert shell.calls == []
+
+    monkeypatch.setattr(probes, "_PYSTEMD_UNIT", None)
+    probes.units_active(["NetworkManager"])
+    assert shell.calls == [["systemctl", "is-active", "NetworkManager"]]
+
 
+def test_probe_iface_parses_link_state_and_addresses(monkeypatch, tmp_path):
+    """A single ip addr call should yield link state plus IPv4/IPv6 addresses."""
+
+    stdout = """2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc fq_codel state UP group default qlen 1000
+    link/ether 52:54:00:12:34:56 brd ff:ff:ff:ff:ff:ff
+    inet 192.0.2.10/24 brd 192.0.2.255 scope global dynamic eth0
+       valid_lft 86300sec preferred_lft 86300sec
+    inet6 fe80::5054:ff:fe12:3456/64 scope link
+       valid_lft forever preferred_lft forever
+"""
     shell = _StubShell(stdout)
+    (tmp_path / "eth0").mkdir()
+    monkeypatch.setattr(probes, "_SYS_CLASS_NET", str(tmp_path))
+    monkeypatch.setattr(probes, "_NETLINK", None)
     monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
 
-    assert probes.list_candidate_interfaces() == ["enp3s0", "eth1", "wlan0", "wwan0"]
+    snapshot = probes.probe_iface("eth0")
+
+    assert snapshot.exists is True
+    assert snapshot.link_up is True
+    assert snapshot.ipv4 == ("192.0.2.10/24",)
+    assert snapshot.ipv6 == ("fe80::5054:ff:fe12:3456/64",)
+    assert shell.calls == [["ip", "addr", "show", "dev", "eth0"]]
+
+
+def test_interface_state_is_read_from_sysfs(monkeypatch, tmp_path):
+    """Existence and link state should come from sysfs without running ip."""
+
+    (tmp_path / "eth0").mkdir()
+    (tmp_path / "eth0" / "operstate").write_text("up\n")
+    (tmp_path / "eth1").mkdir()
+    (tmp_path / "eth1" / "operstate").write_text("down\n")
+    shell = _StubShell("")
+    monkeypatch.setattr(probes, "_SYS_CLASS_NET", str(tmp_path))
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    assert probes.interface_exists("eth0") is True
+    assert probes.interface_exists("eth9") is False
+    assert probes.interface_link_up("eth0") is True
+    assert probes.interface_link_up("eth1") is False
+    assert probes.probe_iface("eth9").exists is False
+    assert shell.calls == []
+
+
+@pytest.mark.parametrize("name", ["", ".", "..", "../eth0", "eth0/operstate"])
+def test_interface_probes_reject_names_outside_sysfs(monkeypatch, tmp_path, name):
+    """Empty names and names that escape the sysfs directory should never exist."""
+
+    # "../eth0" would resolve to this directory, which looks like a live link.
+    (tmp_path / "eth0").mkdir()
+    (tmp_path / "eth0" / "operstate").write_text("up\n")
+    (tmp_path / "net" / "eth0").mkdir(parents=True)
+    monkeypatch.setattr(probes, "_SYS_CLASS_NET", str(tmp_path / "net"))
+    shell = _StubShell("")
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    assert probes.interface_exists(name) is False
+    assert probes.interface_link_up(name) is False
+    assert probes.probe_iface(name).exists is False
+    assert shell.calls == []
+
+
+def test_has_default_route_reads_proc_net_route(monkeypatch, tmp_path):
+    """A default entry in /proc/net/route should count without running ip."""
+
+    header = "Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT\n"
+    link_route = "eth0\t0002000A\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0\n"
+    default_route = "eth0\t00000000\t0102000A\t0003\t0\t0\t100\t00000000\t0\t0\t0\n"
+    route_file = tmp_path / "route"
+    shell = _StubShell("")
+    monkeypatch.setattr(probes, "_PROC_NET_ROUTE", str(route_file))
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    route_file.write_text(header + link_route)
+    assert probes.has_default_route() is False
+
+    route_file.write_text(header + link_route + default_route)
+    assert probes.has_default_route() is True
+    assert shell.calls == []
+
+
+def test_probe_iface_reports_missing_interface(monkeypatch, tmp_path):
+    """A failing ip call should mark the interface as absent."""
+
+    monkeypatch.setattr(probes, "_SYS_CLASS_NET", str(tmp_path / "unmounted"))
+    monkeypatch.setattr(probes, "_NETLINK", None)
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", _StubShell("", returncode=1))
+
+    snapshot = probes.probe_iface("eth9")
+
+    assert snapshot.exists is False
+    assert probes.interface_has_ipv4("eth9") is False
+
+
+def test_icmp_checksum_matches_reference_value():
+    """The echo checksum should follow RFC 1071 one's complement arithmetic."""
+
+    header = bytes([8, 0, 0, 0, 0, 0, 0, 1])
+
+    assert probes._icmp_checksum(header) == 0xF7FE
+    assert probes._icmp_checksum(header + b"a") == probes._icmp_checksum(header + b"a\0")
+
+
+def test_ping_host_falls_back_to_tcp_when_icmp_denied(monkeypatch):
+    """Without ping-socket permission, reachability should use a TCP connect."""
+
+    def _denied(host, count, timeout):
+        raise PermissionError("ping sockets disabled")
+
+    attempts: list[str] = []
+    monkeypatch.setattr(probes, "DEFAULT_LOGGER", _StubLogger())
+    monkeypatch.setattr(probes, "_icmp_ping", _denied)
+    monkeypatch.setattr(probes, "_tcp_reachable", lambda host: attempts.append(host) or True)
+
+    assert probes.ping_host("8.8.8.8") is True
+    assert attempts == ["8.8.8.8"]
+
+
+def test_dns_resolves_uses_getaddrinfo(monkeypatch):
+    """DNS checks should resolve in-process and treat resolver errors as failure."""
+
+    answers = {"deb.debian.org": [(socket.AF_INET, socket.SOCK_STREAM, 6, "", ("192.0.2.1", 0))]}
+
+    def _fake_getaddrinfo(name, port, type=0):  # noqa: A002 - mirrors socket.getaddrinfo
+        if name not in answers:
+            raise socket.gaierror("Name or service not known")
+        return answers[name]
+
+    monkeypatch.setattr(probes.socket, "getaddrinfo", _fake_getaddrinfo)
+
+    assert probes.dns_resolves() is True
+    assert probes.dns_resolves("missing.invalid") is False
+
+
+def test_dns_resolves_gives_up_on_hung_lookup_without_blocking_exit(monkeypatch):
+    """A lookup that outlives the timeout should fail on a daemon thread."""
+
+    started = threading.Event()
+    release = threading.Event()
+    workers: list[threading.Thread] = []
+
+    def _hung_getaddrinfo(name, port, type=0):  # noqa: A002 - mirrors socket.getaddrinfo
+        workers.append(threading.current_thread())
+        started.set()
+        release.wait(5)
+        return []
+
+    monkeypatch.setattr(probes.socket, "getaddrinfo", _hung_getaddrinfo)
+
+    try:
+        assert probes.dns_resolves(timeout=0.01) is False
+        assert started.wait(1)
+        assert workers[0].daemon
+    finally:
+        release.set()
+
+
+class _NetlinkMsg(dict):
+    def __init__(self, attrs: dict[str, str], **fields: int) -> None:
+        super().__init__(fields)
+        self.attrs = attrs
+
+    def get_attr(self, name: str) -> str | None:
+        return self.attrs.get(name)
+
+
+class _FakeIPRoute:
+    def link_lookup(self, ifname: str) -> list[int]:
+        return [2] if ifname == "eth0" else []
+
+    def get_links(self, index: int) -> list[_NetlinkMsg]:
+        return [_NetlinkMsg({"IFLA_OPERSTATE": "UP"})]
+
+    def get_addr(self, index: int) -> list[_NetlinkMsg]:
+        return [
+            _NetlinkMsg({"IFA_ADDRESS": "192.0.2.10"}, family=socket.AF_INET, prefixlen=24),
+            _NetlinkMsg({"IFA_ADDRESS": "fe80::1"}, family=socket.AF_INET6, prefixlen=64),
+        ]
+
+
+def test_probe_iface_prefers_netlink_when_pyroute2_is_available(monkeypatch, tmp_path):
+    """A netlink dump should replace the ip addr call entirely."""
+
+    shell = _StubShell("")
+    monkeypatch.setattr(probes, "_SYS_CLASS_NET", str(tmp_path / "unmounted"))
+    monkeypatch.setattr(probes, "_NETLINK", _FakeIPRoute())
+    monkeypatch.setattr(probes, "DEFAULT_SHELL", shell)
+
+    assert probes.probe_iface("eth0") == IfaceSnapshot(
+        iface="eth0",
+        exists=True,
+        link_up=True,
+        ipv4=("192.0.2.10/24",),
+        ipv6=("fe80::1/64",),
+    )
+    assert probes.probe_iface("eth9").exists is False
+    assert shell.calls == []
@@ -1,24 +1,96 @@
 """Tests for DNS repair helpers and side effects."""
 
+from types import SimpleNamespace
+
+import pytest
+
 from automatic_linux_network_repair.eth_repair import repairs
-from tests.helpers import RecordingLogger
+from automatic_linux_network_repair.eth_repair.types import NetworkManagers, ResolvConfMode
+from tests.helpers import RecordingLogger, ReturnSequence, patch_many
+
+Suspicion = repairs.Suspicion
+Diagnosis = repairs.Diagnosis
+Coordinator = repairs.EthernetRepairCoordinator
+
+
+@pytest.fixture(autouse=True)
+def fake_clock(monkeypatch):
+    """Drive the post-action backoff polling from a fake clock so tests never sleep."""
+
+    clock = SimpleNamespace(now=0.0, sleeps=[])
 
+    def _sleep(seconds: float) -> None:
+        clock.sleeps.append(seconds)
+        clock.now += seconds
 
-class _StubStdin:
-    def __init__(self, is_tty: bool):
-        self._is_tty = is_tty
+    patch_many(monkeypatch, repairs.time, sleep=_sleep, monotonic=lambda: clock.now)
+    return clock
 
-    def isatty(self) -> bool:
-        return self._is_tty
 
+_TTY_STDIN = SimpleNamespace(isatty=lambda: True)
+_NOTTY_STDIN = SimpleNamespace(isatty=lambda: False)
 
-def _stub_mode(label: str):
-    return type("Mode", (), {"value": label})()
 
+@pytest.fixture
+def make_effects():
+    """Build DNS side effects with a recording logger, a stub stdin and a fixed answer."""
+
+    def _make(is_tty: bool = True, answer: str = "y") -> repairs.DnsRepairSideEffects:
+        return repairs.DnsRepairSideEffects(
+            logger=RecordingLogger(),
+            stdin=_TTY_STDIN if is_tty else _NOTTY_STDIN,
+            input_func=lambda prompt: answer,
+        )
+
+    return _make
 
-def _apply_dns_common_stubs(monkeypatch):
-    monkeypatch.setattr(repairs, "detect_resolv_conf_mode", lambda: (_stub_mode("stub"), "detail"))
-    monkeypatch.setattr(repairs, "systemd_resolved_status", lambda: {"active": True, "enabled": False})
+
+@pytest.fixture
+def dns_stubs(monkeypatch):
+    """Report a systemd stub resolv.conf, an active resolved and failing DNS; return an override hook."""
+
+    def _apply(**overrides):
+        patch_many(monkeypatch, repairs, **overrides)
+
+    _apply(
+        detect_resolv_conf_mode=lambda: (ResolvConfMode.SYSTEMD_STUB, "detail"),
+        systemd_resolved_status=lambda: {"active": True, "enabled": False},
+        dns_resolves=lambda timeout=3.0: False,
+    )
+    return _apply
+
+
+@pytest.fixture
+def repairs_stubs(monkeypatch):
+    """Install quiet manager/VPN probes that tests can override on the returned namespace."""
+
+    stubs = SimpleNamespace(
+        logger=RecordingLogger(),
+        detect_network_managers=lambda: NetworkManagers(),
+        tailscale_status=lambda: {"installed": False, "active": False},
+        detect_active_vpn_services=lambda: [],
+    )
+    patch_many(
+        monkeypatch,
+        repairs,
+        DEFAULT_LOGGER=stubs.logger,
+        detect_network_managers=lambda: stubs.detect_network_managers(),
+        tailscale_status=lambda: stubs.tailscale_status(),
+        detect_active_vpn_services=lambda: stubs.detect_active_vpn_services(),
+    )
+    return stubs
+
+
+def _record_actions(calls: list[list[str]]):
+    """Return an apply_action stub that records commands and honours ``verify``."""
+
+    def _record(label, cmd, dry_run, *, verify=None):
+        calls.append(cmd)
+        if verify is None:
+            return True
+        return not dry_run and verify()
+
+    return _record
 
 
 def _record_dns_core_calls(calls: list[tuple[bool, bool]]):
@@ -28,95 +100,72 @@ def _record_dns_core_calls(calls: list[tuple[bool, bool]]):
     return _record
 
 
-def test_fuzzy_dns_skips_prompt_on_non_tty(monkeypatch):
+def test_fuzzy_dns_skips_prompt_on_non_tty(dns_stubs, make_effects):
     """The fuzzy DNS path should not prompt when stdin is not a TTY."""
 
     calls: list[tuple[bool, bool]] = []
-    monkeypatch.setattr(repairs, "repair_dns_core", _record_dns_core_calls(calls))
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
-    _apply_dns_common_stubs(monkeypatch)
+    dns_stubs(repair_dns_core=_record_dns_core_calls(calls))
 
-    effects = repairs.DnsRepairSideEffects(
-        logger=RecordingLogger(),
-        stdin=_StubStdin(False),
-        input_func=lambda prompt: "y",
-    )
+    effects = make_effects(is_tty=False)
 
     repairs.repair_dns_fuzzy_with_confirm(dry_run=True, side_effects=effects)
 
     assert calls == [(False, True)]
-    assert any("Not running on a TTY" in msg for msg in effects.logger.messages)
+    assert effects.logger.contains("Not running on a TTY")
 
 
-def test_fuzzy_dns_confirms_and_runs_full_repair(monkeypatch):
+def test_fuzzy_dns_confirms_and_runs_full_repair(dns_stubs, make_effects):
     """When the user confirms, the fuzzy flow should escalate to a full repair."""
 
     calls: list[tuple[bool, bool]] = []
-    monkeypatch.setattr(repairs, "repair_dns_core", _record_dns_core_calls(calls))
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
-    _apply_dns_common_stubs(monkeypatch)
+    dns_stubs(repair_dns_core=_record_dns_core_calls(calls))
 
-    effects = repairs.DnsRepairSideEffects(
-        logger=RecordingLogger(),
-        stdin=_StubStdin(True),
-        input_func=lambda prompt: "y",
-    )
+    effects = make_effects()
 
     repairs.repair_dns_fuzzy_with_confirm(dry_run=True, side_effects=effects)
 
     assert calls == [(False, True), (True, True)]
-    assert any("DNS still appears broken" in msg for msg in effects.logger.messages)
+    assert effects.logger.contains("DNS still appears broken")
+    assert "/etc/resolv.conf mode   : systemd_stub (detail)" in effects.logger.messages
 
 
-def test_dns_menu_declines_manual_rewrite_on_non_tty(monkeypatch):
+def test_dns_menu_declines_manual_rewrite_on_non_tty(dns_stubs, make_effects):
     """The interactive DNS menu should not prompt when stdin is not a TTY."""
 
-    monkeypatch.setattr(repairs, "apply_action", lambda *args, **kwargs: None)
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
-    _apply_dns_common_stubs(monkeypatch)
+    dns_stubs(apply_action=lambda *args, **kwargs: None)
 
-    effects = repairs.DnsRepairSideEffects(
-        logger=RecordingLogger(),
-        stdin=_StubStdin(False),
-        input_func=lambda prompt: "n",
-    )
+    effects = make_effects(is_tty=False, answer="n")
 
     repairs.repair_dns_interactive(dry_run=True, side_effects=effects)
 
-    assert any("Not running on a TTY" in msg for msg in effects.logger.messages)
-    assert not any("User declined manual" in msg for msg in effects.logger.messages)
+    assert effects.logger.contains("Not running on a TTY")
+    assert not effects.logger.contains("User declined manual")
 
 
-def test_repair_no_internet_reports_active_vpn_services(monkeypatch):
+def test_repair_no_internet_reports_active_vpn_services(repairs_stubs):
     """Active VPN services should be surfaced during generic repair attempts."""
 
-    logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "detect_network_managers", lambda: {})
-    monkeypatch.setattr(repairs, "tailscale_status", lambda: {"installed": False, "active": False})
-    monkeypatch.setattr(repairs, "detect_active_vpn_services", lambda: ["openvpn.service", "wg-quick@wg0.service"])
+    repairs_stubs.detect_active_vpn_services = lambda: ["openvpn.service", "wg-quick@wg0.service"]
 
     repairs.repair_no_internet(dry_run=True)
 
-    assert any("Active VPN services detected" in msg for msg in logger.messages)
-    assert any("openvpn.service" in msg for msg in logger.messages)
-    assert any("wg-quick@wg0.service" in msg for msg in logger.messages)
+    repairs_stubs.logger.assert_contains_all("Active VPN services detected", "openvpn.service", "wg-quick@wg0.service")
 
 
 def test_repair_no_ipv4_prioritizes_networkmanager(monkeypatch):
     """NetworkManager-managed hosts should renew DHCP via nmcli before other fallbacks."""
 
     calls: list[list[str]] = []
+    monkeypatch.setattr(repairs, "apply_action", _record_actions(calls))
+
+    # IPv4 only appears once the reconnect has been issued.
     monkeypatch.setattr(
         repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
+        "interface_has_ipv4",
+        lambda iface: ["nmcli", "device", "connect", "eth0"] in calls,
     )
 
-    ipv4_states = iter([False, False, True])
-    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: next(ipv4_states))
-
-    managers = {"NetworkManager": True, "systemd-networkd": False, "ifupdown": False}
+    managers = NetworkManagers(network_manager=True)
 
     repairs.repair_no_ipv4("eth0", managers=managers, dry_run=False)
 
@@ -129,63 +178,41 @@ def test_repair_no_ipv4_prioritizes_networkmanager(monkeypatch):
     assert calls[: len(expected_first_actions)] == expected_first_actions
 
 
-def test_perform_repairs_iterates_until_scores_drop(monkeypatch):
-    """Repairs should progress through multiple suspicions while re-running diagnosis."""
+@pytest.mark.parametrize(
+    ("initial", "followups", "expected_applied", "expected_logs"),
+    [
+        pytest.param(
+            {Suspicion.NO_IPV4: 0.9, Suspicion.NO_ROUTE: 0.7},
+            [{Suspicion.NO_ROUTE: 0.65}, {Suspicion.NO_ROUTE: 0.2}],
+            [Suspicion.NO_IPV4, Suspicion.NO_ROUTE],
+            ("Repair iteration 1", "Re-running diagnosis after attempted repair"),
+            id="iterates-until-scores-drop",
+        ),
+        pytest.param(
+            {Suspicion.NO_ROUTE: 0.8},
+            [{Suspicion.NO_ROUTE: 0.75}],
+            [Suspicion.NO_ROUTE],
+            ("No further repair actions remain",),
+            id="stops-when-no-actions-remain",
+        ),
+    ],
+)
+def test_perform_repairs_loop(monkeypatch, initial, followups, expected_applied, expected_logs):
+    """Repairs should re-diagnose after each attempt and stop once nothing actionable remains."""
 
     logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-
-    diag1 = repairs.Diagnosis(
-        "eth0",
-        {
-            repairs.Suspicion.NO_IPV4: 0.9,
-            repairs.Suspicion.NO_ROUTE: 0.7,
-        },
-    )
-    diag2 = repairs.Diagnosis("eth0", {repairs.Suspicion.NO_ROUTE: 0.65})
-    diag3 = repairs.Diagnosis("eth0", {repairs.Suspicion.NO_ROUTE: 0.2})
-
-    diagnoses = iter([diag2, diag3])
-    monkeypatch.setattr(repairs, "fuzzy_diagnose", lambda iface: next(diagnoses))
-
-    applied: list[repairs.Suspicion] = []
-
-    def _fake_apply(self, suspicion):
-        applied.append(suspicion)
-
-    monkeypatch.setattr(repairs.EthernetRepairCoordinator, "_apply_repair", _fake_apply, raising=False)
+    applied: list[Suspicion] = []
+    diagnoses = ReturnSequence(*(Diagnosis("eth0", scores) for scores in followups))
 
-    coordinator = repairs.EthernetRepairCoordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
-    coordinator.perform_repairs(diag1)
-
-    assert applied == [repairs.Suspicion.NO_IPV4, repairs.Suspicion.NO_ROUTE]
-    assert any("Repair iteration 1" in msg for msg in logger.messages)
-    assert any("Re-running diagnosis after attempted repair" in msg for msg in logger.messages)
-
-
-def test_perform_repairs_stops_when_no_actions_remain(monkeypatch):
-    """Once all actionable suspicions are attempted, the loop should exit."""
-
-    logger = RecordingLogger()
     monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
+    monkeypatch.setattr(repairs, "fuzzy_diagnose", diagnoses)
+    monkeypatch.setattr(Coordinator, "_apply_repair", lambda self, suspicion: applied.append(suspicion), raising=False)
 
-    diag1 = repairs.Diagnosis("eth0", {repairs.Suspicion.NO_ROUTE: 0.8})
-    diag2 = repairs.Diagnosis("eth0", {repairs.Suspicion.NO_ROUTE: 0.75})
-
-    monkeypatch.setattr(repairs, "fuzzy_diagnose", lambda iface: diag2)
+    coordinator = Coordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
+    coordinator.perform_repairs(Diagnosis("eth0", initial))
 
-    applied: list[repairs.Suspicion] = []
-
-    def _fake_apply(self, suspicion):
-        applied.append(suspicion)
-
-    monkeypatch.setattr(repairs.EthernetRepairCoordinator, "_apply_repair", _fake_apply, raising=False)
-
-    coordinator = repairs.EthernetRepairCoordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
-    coordinator.perform_repairs(diag1)
-
-    assert applied == [repairs.Suspicion.NO_ROUTE]
-    assert any("No further repair actions remain" in msg for msg in logger.messages)
+    assert applied == expected_applied
+    logger.assert_contains_all(*expected_logs)
 
 
 def test_repair_interface_missing_logs_hint(monkeypatch):
@@ -196,8 +223,7 @@ def test_repair_interface_missing_logs_hint(monkeypatch):
 
     repairs.repair_interface_missing("eth9")
 
-    assert any("Interface does not exist" in msg for msg in logger.messages)
-    assert any("Check dmesg" in msg for msg in logger.messages)
+    logger.assert_contains_all("Interface does not exist", "Check dmesg")
 
 
 def test_repair_link_down_invokes_ip(monkeypatch):
@@ -221,101 +247,72 @@ def test_repair_link_down_invokes_ip(monkeypatch):
     ]
 
 
-def test_repair_no_ipv4_succeeds_after_nm_reapply(monkeypatch):
-    """When NM reapply returns IPv4, the flow should stop early."""
+@pytest.mark.parametrize(
+    ("managers", "expected"),
+    [
+        pytest.param(NetworkManagers(network_manager=True), [["nmcli", "device", "reapply", "eth0"]], id="nm-reapply"),
+        pytest.param(
+            NetworkManagers(systemd_networkd=True), [["systemctl", "restart", "systemd-networkd"]], id="networkd"
+        ),
+        pytest.param(NetworkManagers(ifupdown=True), [["ifdown", "eth0"], ["ifup", "eth0"]], id="ifupdown"),
+    ],
+)
+def test_repair_no_ipv4_stops_after_manager_restores_address(monkeypatch, managers, expected):
+    """The first manager step that restores IPv4 should short-circuit the remaining fallbacks."""
 
     calls: list[list[str]] = []
-    monkeypatch.setattr(
-        repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
-    )
-    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: True)
+    patch_many(monkeypatch, repairs, apply_action=_record_actions(calls), interface_has_ipv4=lambda iface: True)
 
-    repairs.repair_no_ipv4(
-        "eth0",
-        managers={"NetworkManager": True, "systemd-networkd": False, "ifupdown": False},
-        dry_run=False,
-    )
+    repairs.repair_no_ipv4("eth0", managers=managers, dry_run=False)
 
-    assert calls == [["nmcli", "device", "reapply", "eth0"]]
+    assert calls == expected
 
 
-def test_repair_no_ipv4_succeeds_after_networkd(monkeypatch):
-    """systemd-networkd restart should short-circuit when it restores IPv4."""
+def test_repair_no_ipv4_falls_back_to_dhclient(monkeypatch):
+    """When all managers fail, dhclient should be invoked and warn about DHCP."""
 
+    logger = RecordingLogger()
+    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
     calls: list[list[str]] = []
-    monkeypatch.setattr(
-        repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
-    )
-    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: True)
+    monkeypatch.setattr(repairs, "apply_action", _record_actions(calls))
+    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: False)
 
     repairs.repair_no_ipv4(
         "eth0",
-        managers={"NetworkManager": False, "systemd-networkd": True, "ifupdown": False},
+        managers=NetworkManagers(),
         dry_run=False,
     )
 
-    assert calls == [["systemctl", "restart", "systemd-networkd"]]
+    assert calls == [["dhclient", "-v", "eth0"]]
+    assert logger.last_matching("Still no IPv4")
 
 
-def test_repair_no_ipv4_succeeds_after_ifupdown(monkeypatch):
-    """ifupdown-managed hosts should ifdown/ifup before dhclient."""
+def test_repair_no_ipv4_shares_one_wait_budget_across_stages(monkeypatch, fake_clock):
+    """Polling for an address should stop once the shared budget is spent."""
 
-    calls: list[list[str]] = []
-    monkeypatch.setattr(
+    patch_many(
+        monkeypatch,
         repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
-    )
-    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: True)
-
-    repairs.repair_no_ipv4(
-        "eth0",
-        managers={"NetworkManager": False, "systemd-networkd": False, "ifupdown": True},
-        dry_run=False,
+        DEFAULT_LOGGER=RecordingLogger(),
+        apply_action=_record_actions([]),
+        interface_has_ipv4=lambda iface: False,
     )
 
-    assert calls == [["ifdown", "eth0"], ["ifup", "eth0"]]
-
-
-def test_repair_no_ipv4_falls_back_to_dhclient(monkeypatch):
-    """When all managers fail, dhclient should be invoked and warn about DHCP."""
-
-    logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(
-        repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: logger.log(f"ACTION: {cmd}"),
-    )
-    monkeypatch.setattr(repairs, "interface_has_ipv4", lambda iface: False)
-
-    repairs.repair_no_ipv4(
-        "eth0",
-        managers={"NetworkManager": False, "systemd-networkd": False, "ifupdown": False},
-        dry_run=False,
-    )
+    managers = NetworkManagers(network_manager=True, systemd_networkd=True, ifupdown=True)
+    repairs.repair_no_ipv4("eth0", managers=managers, dry_run=False)
 
-    assert any("dhclient" in msg for msg in logger.messages)
-    assert any("Still no IPv4" in msg for msg in logger.messages)
+    assert fake_clock.now == repairs._IPV4_WAIT_BUDGET
 
 
 def test_repair_no_route_prefers_network_manager(monkeypatch):
     """The default route repair should restart the detected manager."""
 
     calls: list[list[str]] = []
-    monkeypatch.setattr(
-        repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
-    )
+    monkeypatch.setattr(repairs, "apply_action", _record_actions(calls))
     monkeypatch.setattr(
         repairs,
         "detect_network_managers",
-        lambda: {"NetworkManager": True, "systemd-networkd": False, "ifupdown": False},
+        lambda: NetworkManagers(network_manager=True),
     )
 
     repairs.repair_no_route(dry_run=True)
@@ -328,48 +325,46 @@ def test_repair_no_route_logs_when_manager_unknown(monkeypatch):
 
     logger = RecordingLogger()
     monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "detect_network_managers", lambda: {})
+    monkeypatch.setattr(repairs, "detect_network_managers", lambda: NetworkManagers())
     monkeypatch.setattr(repairs, "apply_action", lambda *args, **kwargs: None)
 
     repairs.repair_no_route(dry_run=False)
 
-    assert any("No known network manager" in msg for msg in logger.messages)
+    assert logger.contains("No known network manager")
+
+
+def test_repair_no_route_uses_supplied_managers(monkeypatch):
+    """Callers that already probed managers should not trigger another probe."""
+
+    calls: list[list[str]] = []
+    monkeypatch.setattr(repairs, "apply_action", _record_actions(calls))
+
+    def _unexpected_probe() -> NetworkManagers:
+        raise AssertionError("detect_network_managers should not be called")
+
+    monkeypatch.setattr(repairs, "detect_network_managers", _unexpected_probe)
 
+    repairs.repair_no_route(dry_run=True, managers=NetworkManagers(systemd_networkd=True))
 
-def test_repair_no_internet_handles_tailscale(monkeypatch):
+    assert calls == [["systemctl", "restart", "systemd-networkd"]]
+
+
+def test_repair_no_internet_handles_tailscale(repairs_stubs):
     """Tailscale installation state should be surfaced in generic repair."""
 
-    logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "detect_network_managers", lambda: {})
-    monkeypatch.setattr(
-        repairs,
-        "tailscale_status",
-        lambda: {"installed": True, "active": True},
-    )
-    monkeypatch.setattr(repairs, "detect_active_vpn_services", lambda: [])
+    repairs_stubs.tailscale_status = lambda: {"installed": True, "active": True}
 
     repairs.repair_no_internet(dry_run=True)
 
-    assert any("Tailscale detected" in msg for msg in logger.messages)
+    assert repairs_stubs.logger.contains("Tailscale detected")
 
 
-def test_repair_no_internet_uses_network_manager(monkeypatch):
+def test_repair_no_internet_uses_network_manager(monkeypatch, repairs_stubs):
     """Restart NetworkManager immediately when it is present."""
 
     calls: list[list[str]] = []
-    monkeypatch.setattr(
-        repairs,
-        "apply_action",
-        lambda label, cmd, dry_run: calls.append(cmd),
-    )
-    monkeypatch.setattr(
-        repairs,
-        "detect_network_managers",
-        lambda: {"NetworkManager": True},
-    )
-    monkeypatch.setattr(repairs, "tailscale_status", lambda: {"installed": False, "active": False})
-    monkeypatch.setattr(repairs, "detect_active_vpn_services", lambda: [])
+    monkeypatch.setattr(repairs, "apply_action", _record_actions(calls))
+    repairs_stubs.detect_network_managers = lambda: NetworkManagers(network_manager=True)
 
     repairs.repair_no_internet(dry_run=False)
 
@@ -387,26 +382,30 @@ def test_repair_dns_core_restarts_systemd_resolved(monkeypatch):
         "apply_action",
         lambda label, cmd, dry_run: logger.log(f"ACTION: {cmd}"),
     )
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: True)
+    monkeypatch.setattr(repairs, "dns_resolves", lambda timeout=3.0: True)
 
     repairs.repair_dns_core(allow_resolv_conf_edit=False, dry_run=False)
 
-    assert any("systemd-resolved" in msg for msg in logger.messages)
-    assert not any("resolv.conf editing" in msg for msg in logger.messages)
+    assert logger.contains("systemd-resolved")
+    assert not logger.contains("resolv.conf editing")
 
 
 def test_repair_dns_core_respects_no_edit_flag(monkeypatch):
     """Without resolv.conf permission, the function should return early."""
 
     logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "systemd_resolved_status", lambda: {"active": False})
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
-    monkeypatch.setattr(repairs, "apply_action", lambda *args, **kwargs: None)
+    patch_many(
+        monkeypatch,
+        repairs,
+        DEFAULT_LOGGER=logger,
+        systemd_resolved_status=lambda: {"active": False},
+        dns_resolves=lambda timeout=3.0: False,
+        apply_action=lambda *args, **kwargs: None,
+    )
 
     repairs.repair_dns_core(allow_resolv_conf_edit=False, dry_run=True)
 
-    assert any("resolv.conf editing is disabled" in msg for msg in logger.messages)
+    assert logger.last_matching("resolv.conf editing is disabled")
 
 
 def test_repair_dns_core_rewrites_resolv_conf(monkeypatch):
@@ -415,7 +414,7 @@ def test_repair_dns_core_rewrites_resolv_conf(monkeypatch):
     logger = RecordingLogger()
     monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
     monkeypatch.setattr(repairs, "systemd_resolved_status", lambda: {"active": False})
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
+    monkeypatch.setattr(repairs, "dns_resolves", lambda timeout=3.0: False)
 
     actions: list[str] = []
     monkeypatch.setattr(repairs, "backup_resolv_conf", lambda dry_run: actions.append("backup"))
@@ -424,41 +423,40 @@ def test_repair_dns_core_rewrites_resolv_conf(monkeypatch):
     repairs.repair_dns_core(allow_resolv_conf_edit=True, dry_run=False)
 
     assert actions == ["backup", "rewrite"]
-    assert any("resolv.conf rewrite" in msg for msg in logger.messages)
+    assert logger.contains("resolv.conf rewrite")
 
 
-def test_repair_dns_fuzzy_returns_after_limited_fix(monkeypatch):
+def test_repair_dns_fuzzy_returns_after_limited_fix(dns_stubs, make_effects):
     """The fuzzy flow should stop if DNS is OK after limited repair."""
 
-    logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "repair_dns_core", lambda allow_resolv_conf_edit, dry_run: None)
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: True)
-    monkeypatch.setattr(repairs, "detect_resolv_conf_mode", lambda: (_stub_mode("stub"), "detail"))
-    monkeypatch.setattr(repairs, "systemd_resolved_status", lambda: {"active": True, "enabled": True})
-
-    effects = repairs.DnsRepairSideEffects(logger=logger, stdin=_StubStdin(True), input_func=lambda p: "n")
+    effects = make_effects(answer="n")
+    logger = effects.logger
+    dns_stubs(
+        DEFAULT_LOGGER=logger,
+        repair_dns_core=lambda allow_resolv_conf_edit, dry_run: None,
+        dns_resolves=lambda timeout=3.0: True,
+        systemd_resolved_status=lambda: {"active": True, "enabled": True},
+    )
 
     repairs.repair_dns_fuzzy_with_confirm(dry_run=True, side_effects=effects)
 
-    assert any("DNS OK after limited DNS repair" in msg for msg in logger.messages)
+    assert logger.last_matching("DNS OK") == "[INFO] DNS OK after limited DNS repair."
 
 
-def test_repair_dns_interactive_logs_decline(monkeypatch):
+def test_repair_dns_interactive_logs_decline(dns_stubs, make_effects):
     """Interactive DNS menu should log when the user declines a rewrite."""
 
-    logger = RecordingLogger()
-    monkeypatch.setattr(repairs, "DEFAULT_LOGGER", logger)
-    monkeypatch.setattr(repairs, "systemd_resolved_status", lambda: {"active": False, "enabled": True})
-    monkeypatch.setattr(repairs, "dns_resolves", lambda: False)
-    monkeypatch.setattr(repairs, "detect_resolv_conf_mode", lambda: (_stub_mode("stub"), "detail"))
-    monkeypatch.setattr(repairs, "apply_action", lambda *args, **kwargs: None)
-
-    effects = repairs.DnsRepairSideEffects(logger=logger, stdin=_StubStdin(True), input_func=lambda p: "n")
+    effects = make_effects(answer="n")
+    logger = effects.logger
+    dns_stubs(
+        DEFAULT_LOGGER=logger,
+        systemd_resolved_status=lambda: {"active": False, "enabled": True},
+        apply_action=lambda *args, **kwargs: None,
+    )
 
     repairs.repair_dns_interactive(dry_run=True, side_effects=effects)
 
-    assert any("User declined manual" in msg for msg in logger.messages)
+    assert logger.last_matching("User declined manual")
 
 
 def test_coordinator_apply_repair_routes_to_dns(monkeypatch):
@@ -472,11 +470,12 @@ def test_coordinator_apply_repair_routes_to_dns(monkeypatch):
         lambda allow_resolv_conf_edit, dry_run: called.append(f"core-{allow_resolv_conf_edit}-{dry_run}"),
     )
 
-    coord = repairs.EthernetRepairCoordinator("eth0", dry_run=False, allow_resolv_conf_edit=True)
+    coord = Coordinator("eth0", dry_run=False, allow_resolv_conf_edit=True)
     coord._repair_dns()
 
-    coord_allow_false = repairs.EthernetRepairCoordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
-    coord_allow_false._repair_dns()
+    coord.dry_run = True
+    coord.allow_resolv_conf_edit = False
+    coord._repair_dns()
 
     assert called == ["fuzzy", "core-False-True"]
 
@@ -484,31 +483,116 @@ def test_coordinator_apply_repair_routes_to_dns(monkeypatch):
 def test_coordinator_apply_repair_dispatches(monkeypatch):
     """Each suspicion should dispatch to its corresponding repair function."""
 
-    calls: list[str] = []
-    monkeypatch.setattr(repairs, "repair_interface_missing", lambda iface: calls.append(f"missing:{iface}"))
-    monkeypatch.setattr(repairs, "repair_link_down", lambda iface, dry_run: calls.append(f"link:{iface}:{dry_run}"))
+    calls: set[str] = set()
+    monkeypatch.setattr(repairs, "repair_interface_missing", lambda iface: calls.add(f"missing:{iface}"))
+    monkeypatch.setattr(repairs, "repair_link_down", lambda iface, dry_run: calls.add(f"link:{iface}:{dry_run}"))
     monkeypatch.setattr(
         repairs,
         "repair_no_ipv4",
-        lambda iface, managers, dry_run: calls.append(f"ipv4:{iface}:{dry_run}:{managers}"),
+        lambda iface, managers, dry_run: calls.add(f"ipv4:{iface}:{dry_run}:{managers.network_manager}"),
+    )
+    probes: list[str] = []
+
+    def _detect_managers():
+        probes.append("detect")
+        return NetworkManagers(network_manager=True)
+
+    monkeypatch.setattr(repairs, "detect_network_managers", _detect_managers)
+    monkeypatch.setattr(
+        repairs,
+        "repair_no_route",
+        lambda dry_run, managers: calls.add(f"route:{dry_run}:{managers.network_manager}"),
     )
-    monkeypatch.setattr(repairs, "detect_network_managers", lambda: {"NetworkManager": True})
-    monkeypatch.setattr(repairs, "repair_no_route", lambda dry_run: calls.append(f"route:{dry_run}"))
     monkeypatch.setattr(repairs, "DEFAULT_LOGGER", RecordingLogger())
 
-    coord = repairs.EthernetRepairCoordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
+    coord = Coordinator("eth0", dry_run=True, allow_resolv_conf_edit=False)
 
     for suspicion in (
-        repairs.Suspicion.INTERFACE_MISSING,
-        repairs.Suspicion.LINK_DOWN,
-        repairs.Suspicion.NO_IPV4,
-        repairs.Suspicion.NO_ROUTE,
-        repairs.Suspicion.NO_INTERNET,
-        repairs.Suspicion.DNS_BROKEN,
+        Suspicion.INTERFACE_MISSING,
+        Suspicion.LINK_DOWN,
+        Suspicion.NO_IPV4,
+        Suspicion.NO_ROUTE,
+        Suspicion.NO_INTERNET,
+        Suspicion.DNS_BROKEN,
     ):
         coord._apply_repair(suspicion)
 
-    assert "missing:eth0" in calls
-    assert "link:eth0:True" in calls
-    assert any(call.startswith("ipv4:eth0:True") for call in calls)
-    assert "route:True" in calls
+    assert calls == {"missing:eth0", "link:eth0:True", "ipv4:eth0:True:True", "route:True:True"}
+    assert probes == ["detect"]
+
+
+def test_default_side_effects_are_shared_and_follow_stdin(monkeypatch):
+    """The fallback side effects should be built once and read sys.stdin lazily."""
+
+    monkeypatch.setattr(repairs, "_DEFAULT_SIDE_EFFECTS", None)
+    first = repairs._default_side_effects()
+
+    assert repairs._default_side_effects() is first
+
+    monkeypatch.setattr(repairs.sys, "stdin", _TTY_STDIN)
+    assert first.is_tty() is True
+
+
+def test_side_effects_accept_logger_without_log_block():
+    """Loggers that only implement log should still receive multi-line reports."""
+
+    lines: list[str] = []
+    effects = repairs.DnsRepairSideEffects(logger=SimpleNamespace(log=lines.append), stdin=_TTY_STDIN)
+
+    effects.log_menu_intro({"active": True, "enabled": False})
+
+    assert lines == [
+        "[INFO] DNS repair menu...",
+        "systemd-resolved active : True",
+        "systemd-resolved enabled: False",
+    ]
+
+
+def test_wait_until_backs_off_exponentially(fake_clock):
+    """Polling should double its delay and stop once the total wait is spent."""
+
+    assert repairs._wait_until(lambda remaining: False, deadline=4.0, start=0.25) is False
+    assert fake_clock.sleeps == [0.25, 0.5, 1.0, 2.0, 0.25]
+
+    fake_clock.sleeps.clear()
+    assert repairs._wait_until(ReturnSequence(False, False, True)) is True
+    assert fake_clock.sleeps == [0.25, 0.5]
+
+
+def test_wait_until_counts_slow_predicates_against_deadline(fake_clock):
+    """A blocking check should get the remaining time and the whole wait should stay within the deadline."""
+
+    offered: list[float] = []
+
+    def _slow_lookup(remaining: float) -> bool:
+        offered.append(remaining)
+        fake_clock.now += min(3.0, remaining)
+        return False
+
+    start = fake_clock.now
+    assert repairs._wait_until(_slow_lookup, deadline=4.0) is False
+
+    assert fake_clock.now - start == 4.0
+    assert offered == [4.0, 0.75]
+
+
+def test_dns_recheck_caps_lookup_timeout_to_remaining_time(monkeypatch, fake_clock):
+    """Post-restart DNS polling should stay within the deadline even when every lookup times out."""
+
+    def _timing_out(timeout: float = 3.0) -> bool:
+        fake_clock.now += timeout
+        return False
+
+    patch_many(
+        monkeypatch,
+        repairs,
+        DEFAULT_LOGGER=RecordingLogger(),
+        apply_action=_record_actions([]),
+        systemd_resolved_status=lambda: {"active": True, "enabled": True},
+        invalidate_dns_status_cache=lambda: None,
+        dns_resolves=_timing_out,
+    )
+
+    repairs.repair_dns_core(allow_resolv_conf_edit=False, dry_run=False)
+
+    assert fake_clock.now == 4.0
@@ -2,24 +2,46 @@
 
 import io
 import logging
+import re
+import sys
+
+import pytest
 
 from automatic_linux_network_repair.eth_repair import logging_utils, shell
 
 
-def test_cmd_str_quotes_arguments():
+@pytest.fixture
+def manager():
+    """One shared logging manager, reset to a handler-less, unset level after each test."""
+
+    shared = logging_utils.LoggingManager("shell_logging_tests")
+    yield shared
+    for handler in shared.logger.handlers:
+        handler.close()
+    shared.logger.handlers.clear()
+    shared.logger.setLevel(logging.NOTSET)
+
+
+def _capture(manager: logging_utils.LoggingManager, fmt: str = "%(message)s") -> io.StringIO:
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter(fmt))
+    manager.logger.handlers = [handler]
+    return stream
+
+
+def test_cmd_str_quotes_arguments(manager):
     """cmd_str should shell-escape each argument for readability."""
 
-    runner = shell.ShellRunner(logger=logging_utils.LoggingManager("test_logger"))
+    runner = shell.ShellRunner(logger=manager)
     rendered = runner.cmd_str(["echo", "hello world", "special&chars"])
 
     assert rendered == "echo 'hello world' 'special&chars'"
 
 
-def test_logging_manager_sets_level():
+def test_logging_manager_sets_level(manager):
     """setup should configure the logger with the requested verbosity."""
 
-    manager = logging_utils.LoggingManager("level_test")
-
     manager.setup(verbose=False)
     assert manager.logger.level == logging.INFO
 
@@ -27,18 +49,74 @@ def test_logging_manager_sets_level():
     assert manager.logger.level == logging.DEBUG
 
 
-def test_logging_manager_formats_debug_arguments():
+def test_logging_manager_formats_debug_arguments(manager):
     """debug should accept formatting args like the stdlib logger."""
 
-    manager = logging_utils.LoggingManager("arg_formatting")
-    stream = io.StringIO()
-    handler = logging.StreamHandler(stream)
-    handler.setFormatter(logging.Formatter("%(message)s"))
-
-    manager.logger.handlers = [handler]
+    stream = _capture(manager)
     manager.logger.setLevel(logging.DEBUG)
 
     manager.debug("iface=%s attempts=%s", "eth0", 3)
 
-    handler.flush()
     assert "iface=eth0 attempts=3" in stream.getvalue()
+
+
+def test_logging_manager_log_block_emits_record_per_line(manager):
+    """log_block should emit one record per line and skip empty batches."""
+
+    stream = _capture(manager, "%(message)s|")
+    manager.logger.setLevel(logging.INFO)
+
+    manager.log_block(["first", "second"])
+    manager.log_block([])
+
+    assert stream.getvalue() == "first|\nsecond|\n"
+
+
+def test_logging_manager_log_block_prefixes_every_line(manager, capsys):
+    """Every line of a block should carry the configured timestamp and level prefix."""
+
+    manager.setup(verbose=False)
+
+    manager.log_block(["Status:", "  eth0 UP"])
+
+    lines = capsys.readouterr().err.splitlines()
+    assert len(lines) == 2
+    assert all(re.match(r"\d{4}-\d{2}-\d{2} [\d:,]+ \[INFO\] ", line) for line in lines)
+    assert lines[1].endswith("[INFO]   eth0 UP")
+
+
+def test_run_cmd_tolerates_non_utf8_output(manager):
+    """run_cmd should decode undecodable bytes instead of failing the command."""
+
+    runner = shell.ShellRunner(logger=manager)
+    res = runner.run_cmd([sys.executable, "-c", "import sys; sys.stdout.buffer.write(b'eth0\\xff\\n')"])
+
+    assert res.returncode == 0
+    assert res.stdout == "eth0\ufffd\n"
+
+
+def test_run_cmd_feeds_input_on_stdin(manager):
+    """run_cmd should pass input text to the child's stdin."""
+
+    runner = shell.ShellRunner(logger=manager)
+    res = runner.run_cmd([sys.executable, "-c", "import sys; print(sys.stdin.read().upper())"], input="ok\n")
+
+    assert res.returncode == 0
+    assert res.stdout == "OK\n\n"
+
+
+def test_run_cmd_debug_lines_are_rendered_lazily(manager):
+    """Command lines should be quoted only when debug output is enabled."""
+
+    stream = _capture(manager)
+    runner = shell.ShellRunner(logger=manager)
+    cmd = [sys.executable, "-c", "print('hi there')"]
+
+    manager.logger.setLevel(logging.INFO)
+    runner.run_cmd(cmd)
+    assert stream.getvalue() == ""
+
+    manager.logger.setLevel(logging.DEBUG)
+    runner.run_cmd(cmd)
+    assert f"Running: {runner.cmd_str(cmd)}" in stream.getvalue()
+    assert "stdout='hi there\\n'" in stream.getvalue()
@@ -0,0 +1,56 @@
+"""Tests for status rendering helpers."""
+
+from automatic_linux_network_repair.eth_repair import status
+from automatic_linux_network_repair.eth_repair.types import IfaceSnapshot, NetworkManagers
+from tests.helpers import RecordingLogger, patch_many
+
+
+def test_show_full_report_appends_adapters_after_status(monkeypatch):
+    """The combined report should render status first, then the adapter dump."""
+
+    logger = RecordingLogger()
+    monkeypatch.setattr(status, "DEFAULT_LOGGER", logger)
+    monkeypatch.setattr(status, "_show_status", lambda iface, executor: logger.log(f"status:{iface}"))
+    monkeypatch.setattr(status, "list_all_interfaces_detailed", lambda: ["eth0 UP 10.0.0.2/24"])
+
+    status.show_full_report("eth0")
+
+    assert logger.messages[0] == "status:eth0"
+    assert "  eth0 UP 10.0.0.2/24" in logger.messages
+    assert logger.messages.index("status:eth0") < logger.messages.index("  eth0 UP 10.0.0.2/24")
+
+
+class _BlockCountingLogger(RecordingLogger):
+    def __init__(self) -> None:
+        super().__init__()
+        self.blocks = 0
+
+    def log_block(self, lines: list[str]) -> None:
+        self.blocks += 1
+        super().log_block(lines)
+
+
+def test_show_status_renders_as_single_block(monkeypatch):
+    """The status report should reach the logger as one log_block call."""
+
+    logger = _BlockCountingLogger()
+    patch_many(
+        monkeypatch,
+        status,
+        DEFAULT_LOGGER=logger,
+        probe_iface=lambda iface: IfaceSnapshot(iface, True, True, ("10.0.0.2/24",)),
+        has_default_route=lambda: True,
+        ping_host=lambda host: True,
+        dns_resolves=lambda: True,
+        detect_network_managers=lambda: NetworkManagers(network_manager=True),
+        tailscale_status=lambda: {"installed": False, "active": False},
+        detect_active_vpn_services=lambda: [],
+        read_resolv_conf_summary=lambda: ["nameserver 1.1.1.1"],
+    )
+
+    status.show_status("eth0")
+
+    assert logger.blocks == 1
+    assert "IPv4 addresses:      10.0.0.2/24" in logger.messages
+    assert "  NetworkManager   : active" in logger.messages
+    assert "  nameserver 1.1.1.1" in logger.messages
@@ -1,14 +1,16 @@
 """Tests for rendering systemd configuration dumps as panels."""
 
 import json
+import shutil
 
 import pytest
-from rich.console import Console
 from typer.testing import CliRunner
 
 from automatic_linux_network_repair import systemd_panel, systemd_schemas
-from automatic_linux_network_repair.cli import app
+from automatic_linux_network_repair.cli import app, cli
+from automatic_linux_network_repair.eth_repair.shell import which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
+from tests.helpers import InputScript, text_console
 
 SAMPLE_SCHEMA = systemd_schemas.load_sample_schema()
 SYSTEMD_DUMP = systemd_panel.systemd_dump_from_schema(SAMPLE_SCHEMA)
@@ -51,6 +53,15 @@ def test_systemd_schema_from_dump_contains_active_settings():
     assert resolved_settings["Resolve"]["DNS"] == "1.1.1.1 8.8.8.8"
 
 
+def test_systemd_schema_from_dump_returns_independent_copies():
+    first = systemd_panel.systemd_schema_from_dump(SYSTEMD_DUMP)
+    first["/etc/systemd/logind.conf"]["active_settings"]["Login"]["HandlePowerKey"] = "changed"
+
+    second = systemd_panel.systemd_schema_from_dump(SYSTEMD_DUMP)
+
+    assert second["/etc/systemd/logind.conf"]["active_settings"]["Login"]["HandlePowerKey"] == "ignore"
+
+
 def test_systemd_schema_includes_commented_settings():
     schema = systemd_panel.systemd_schema_from_dump(SYSTEMD_DUMP)
 
@@ -91,45 +102,44 @@ def test_dump_round_trips_schema():
 def test_render_systemd_panel_shows_active_values():
     files = systemd_panel.parse_systemd_dump(SYSTEMD_DUMP)
     panel = systemd_panel.render_systemd_panel(files)
-    console = Console(record=True, force_terminal=False)
+    console, buffer = text_console()
     console.print(panel)
-    output = console.export_text()
+    output = buffer.getvalue()
 
     assert "HandlePowerKey=ignore" in output
     assert "MulticastDNS=no" in output
     assert "RuntimeWatchdogSec=5min" in output
 
 
-def test_cli_command_prints_panel(tmp_path):
+def test_print_systemd_panel_writes_plain_text_when_piped(monkeypatch, capsys):
+    monkeypatch.setattr(systemd_panel.sys.stdout, "isatty", lambda: False)
+
+    systemd_panel.print_systemd_panel(SYSTEMD_DUMP)
+    output = capsys.readouterr().out
+
+    assert "=== /etc/systemd/logind.conf ===" in output
+    assert "[Login]\nHandlePowerKey=ignore" in output
+    assert "Systemd configuration" not in output
+
+
+def test_cli_command_prints_panel(tmp_path, capsys):
     dump_path = tmp_path / "dump.txt"
     dump_path.write_text(SYSTEMD_DUMP)
-    runner = CliRunner()
 
-    result = runner.invoke(app, ["systemd-panel", "--dump-file", str(dump_path)])
+    cli._systemd_panel(dump_file=str(dump_path), path="/etc/systemd", schema_json=None)
 
-    assert result.exit_code == 0
-    assert "Systemd configuration" in result.output
-    assert "HandlePowerKey=ignore" in result.output
+    output = capsys.readouterr().out
+    assert "Systemd configuration" in output
+    assert "HandlePowerKey=ignore" in output
 
 
 def test_cli_command_writes_schema_json(tmp_path):
     dump_path = tmp_path / "dump.txt"
     dump_path.write_text(SYSTEMD_DUMP)
     schema_path = tmp_path / "schema.json"
-    runner = CliRunner()
 
-    result = runner.invoke(
-        app,
-        [
-            "systemd-panel",
-            "--dump-file",
-            str(dump_path),
-            "--schema-json",
-            str(schema_path),
-        ],
-    )
+    cli._systemd_panel(dump_file=str(dump_path), path="/etc/systemd", schema_json=str(schema_path))
 
-    assert result.exit_code == 0
     saved_schema = json.loads(schema_path.read_text())
     assert saved_schema["/etc/systemd/logind.conf"]["active_settings"]["Login"]["HandlePowerKey"] == "ignore"
     assert saved_schema["/etc/systemd/journald.conf"]["commented_settings"]["Journal"]["Storage"] == "auto"
@@ -165,7 +175,8 @@ def test_generate_systemd_dump_runs_cat_config(monkeypatch, tmp_path):
             self.calls.append((cmd, timeout))
             return CommandResult(cmd=cmd, returncode=0, stdout="dumped", stderr="")
 
-    monkeypatch.setattr(systemd_panel.shutil, "which", lambda name: "/usr/bin/systemd-analyze")
+    monkeypatch.setattr(shutil, "which", lambda name: "/usr/bin/systemd-analyze")
+    which.cache_clear()
     shell = StubShell()
 
     result = systemd_panel.generate_systemd_dump(str(tmp_path), shell=shell)
@@ -177,19 +188,50 @@ def test_generate_systemd_dump_runs_cat_config(monkeypatch, tmp_path):
     assert timeout == 30
     assert str(tmp_path / "one.conf") in cat_cmd
     assert str(nested / "two.service") in cat_cmd
+    which.cache_clear()
 
 
-def test_cli_command_generates_dump_when_no_file(monkeypatch, tmp_path):
-    runner = CliRunner()
+def test_generate_systemd_dump_chunks_large_trees(monkeypatch, tmp_path):
+    for name in ("a.conf", "b.conf", "c.conf"):
+        (tmp_path / name).write_text(name)
+
+    class StubShell:
+        def __init__(self) -> None:
+            self.calls: list[list[str]] = []
+
+        def run_cmd(self, cmd: list[str], timeout: int = 5) -> CommandResult:
+            self.calls.append(cmd)
+            rc = 1 if len(self.calls) == 2 else 0
+            body = "".join(f"# {path}\n" for path in cmd[2:])
+            return CommandResult(cmd=cmd, returncode=rc, stdout=body, stderr="warn\n" if rc else "")
+
+    monkeypatch.setattr(shutil, "which", lambda name: "/usr/bin/systemd-analyze")
+    monkeypatch.setattr(systemd_panel, "_CAT_CONFIG_CHUNK", 2)
+    which.cache_clear()
+    shell = StubShell()
+
+    result = systemd_panel.generate_systemd_dump(str(tmp_path), shell=shell)
+    which.cache_clear()
+
+    assert [len(call) for call in shell.calls] == [4, 3]
+    assert list(systemd_panel.parse_systemd_dump(result.stdout)) == [
+        str(tmp_path / n) for n in ("a.conf", "b.conf", "c.conf")
+    ]
+    assert result.returncode == 1
+    assert result.stderr == "warn\n"
+    assert result.cmd[2:] == [str(tmp_path / n) for n in ("a.conf", "b.conf", "c.conf")]
+
+
+def test_cli_command_generates_dump_when_no_file(monkeypatch, tmp_path, capsys):
     fake_result = CommandResult(cmd=[], returncode=0, stdout=SYSTEMD_DUMP, stderr="")
 
     monkeypatch.setattr(systemd_panel, "generate_systemd_dump", lambda base_dir: fake_result)
 
-    result = runner.invoke(app, ["systemd-panel", "--path", str(tmp_path)])
+    cli._systemd_panel(dump_file=None, path=str(tmp_path), schema_json=None)
 
-    assert result.exit_code == 0
-    assert "Systemd configuration" in result.output
-    assert "HandlePowerKey=ignore" in result.output
+    output = capsys.readouterr().out
+    assert "Systemd configuration" in output
+    assert "HandlePowerKey=ignore" in output
 
 
 def test_build_dropin_path_uses_override_dir(tmp_path):
@@ -210,13 +252,13 @@ def test_build_dropin_path_rejects_world_writable(tmp_path):
 
 
 def test_interactive_edit_systemd_dump_writes_dropin(tmp_path):
-    responses = iter(["2", "1", "1", "new-ignore", "y"])
-    console = Console(record=True, force_terminal=False)
+    responses = InputScript("2", "1", "1", "new-ignore", "y")
+    console, _ = text_console()
 
     dropin_path = systemd_panel.interactive_edit_systemd_dump(
         SYSTEMD_DUMP,
         dropin_dir=str(tmp_path),
-        prompt=lambda message: next(responses),
+        prompt=responses,
         console=console,
     )
 
@@ -226,13 +268,13 @@ def test_interactive_edit_systemd_dump_writes_dropin(tmp_path):
 
 
 def test_interactive_edit_systemd_dump_respects_abort(tmp_path):
-    responses = iter(["2", "1", "1", "new-val", "n"])
-    console = Console(record=True, force_terminal=False)
+    responses = InputScript("2", "1", "1", "new-val", "n")
+    console, _ = text_console()
 
     dropin_path = systemd_panel.interactive_edit_systemd_dump(
         SYSTEMD_DUMP,
         dropin_dir=str(tmp_path),
-        prompt=lambda message: next(responses),
+        prompt=responses,
         console=console,
     )
 
@@ -256,3 +298,15 @@ def test_cli_systemd_edit_writes_dropin(tmp_path):
     assert result.exit_code == 0
     assert expected_path.exists()
     assert expected_path.read_text() == "[Login]\nHandlePowerKey=new-ignore\n"
+
+
+def test_active_settings_parse_is_cached_and_copied():
+    body = "[Resolve]\nDNS=1.1.1.1\n#FallbackDNS=8.8.8.8\n"
+    systemd_panel._parse_active_lines.cache_clear()
+
+    first = systemd_panel._extract_active_settings(body)
+    first["Resolve"]["DNS"] = "mutated"
+    second = systemd_panel._extract_active_settings(body)
+
+    assert second == {"Resolve": {"DNS": "1.1.1.1"}}
+    assert systemd_panel._parse_active_lines.cache_info().hits == 1
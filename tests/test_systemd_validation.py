@@ -1,15 +1,25 @@
 """Tests for systemd validation helpers."""
 
+import json
+import shutil
+
+import pytest
+import typer
+
+from automatic_linux_network_repair import cli
 from automatic_linux_network_repair import systemd_validation as sv
+from automatic_linux_network_repair.eth_repair.shell import which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
+from tests.helpers import RecordingLogger
 
 
-class _StubLogger:
-    def __init__(self) -> None:
-        self.messages: list[str] = []
+@pytest.fixture(autouse=True)
+def _fresh_tool_lookup():
+    """Tests patch shutil.which, so drop the memoized tool lookups around each one."""
 
-    def log(self, msg: str) -> None:  # pragma: no cover - trivial logging helper
-        self.messages.append(msg)
+    which.cache_clear()
+    yield
+    which.cache_clear()
 
 
 class _StubShell:
@@ -26,8 +36,8 @@ class _StubShell:
 def test_validate_systemd_tree_skips_without_tools(monkeypatch, tmp_path):
     """Validation should short-circuit when systemd tooling is unavailable."""
 
-    monkeypatch.setattr(sv.shutil, "which", lambda name: None)
-    logger = _StubLogger()
+    monkeypatch.setattr(shutil, "which", lambda name: None)
+    logger = RecordingLogger()
     shell = _StubShell({})
 
     report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=logger)
@@ -35,14 +45,14 @@ def test_validate_systemd_tree_skips_without_tools(monkeypatch, tmp_path):
     assert report.available is False
     assert report.validations == []
     assert report.config_issues == []
-    assert any("skipping systemd validation" in msg for msg in logger.messages)
+    assert logger.contains("skipping systemd validation")
 
 
 def test_validate_systemd_tree_handles_empty_directory(monkeypatch, tmp_path):
     """If no unit files exist, validation should report availability and exit early."""
 
-    monkeypatch.setattr(sv.shutil, "which", lambda name: f"/usr/bin/{name}")
-    logger = _StubLogger()
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    logger = RecordingLogger()
     shell = _StubShell({})
 
     report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=logger)
@@ -51,13 +61,13 @@ def test_validate_systemd_tree_handles_empty_directory(monkeypatch, tmp_path):
     assert report.unit_files == []
     assert report.validations == []
     assert report.config_issues == []
-    assert any("No systemd unit files" in msg for msg in logger.messages)
+    assert logger.contains("No systemd unit files")
 
 
 def test_validate_systemd_tree_runs_verifications(monkeypatch, tmp_path):
     """Unit files should be validated and their results returned."""
 
-    monkeypatch.setattr(sv.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
     (tmp_path / "network").mkdir()
     good = tmp_path / "network" / "eth0.service"
     good.write_text("[Unit]\nDescription=good service\n")
@@ -66,37 +76,28 @@ def test_validate_systemd_tree_runs_verifications(monkeypatch, tmp_path):
     ignored = tmp_path / "readme.txt"
     ignored.write_text("ignore me")
 
-    logger = _StubLogger()
-    results = {
-        str(good): CommandResult(cmd=[], returncode=0, stdout="", stderr=""),
-        str(bad): CommandResult(cmd=[], returncode=1, stdout="", stderr="invalid section"),
-    }
-    shell = _StubShell(results)
+    logger = RecordingLogger()
+    batch = CommandResult(cmd=[], returncode=1, stdout="", stderr=f"{bad}:1: invalid section\n")
+    shell = _StubShell({str(good): batch})
 
     report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=logger)
 
     assert report.available is True
     assert len(report.unit_files) == 2
-    expected_calls = {
-        ("systemd-analyze", "verify", str(good)),
-        ("systemd-analyze", "verify", str(bad)),
-    }
-    assert {tuple(call[0]) for call in shell.calls} == expected_calls
-    assert all(timeout == 15 for _, timeout in shell.calls)
+    assert shell.calls == [(["systemd-analyze", "verify", str(bad), str(good)], 15)]
 
     statuses = {validation.path: validation.result.returncode for validation in report.validations}
     assert statuses[str(good)] == 0
     assert statuses[str(bad)] == 1
     assert report.config_issues == []
-    assert any("[OK]" in msg for msg in logger.messages)
-    assert any("[FAIL]" in msg for msg in logger.messages)
+    logger.assert_contains_all("[OK]", "[FAIL]")
     assert str(ignored) not in report.unit_files
 
 
 def test_validate_systemd_tree_reports_resolved_conf_issues(monkeypatch, tmp_path):
     """Misconfigured resolved.conf entries should be surfaced as config issues."""
 
-    monkeypatch.setattr(sv.shutil, "which", lambda name: None)
+    monkeypatch.setattr(shutil, "which", lambda name: None)
     resolved = tmp_path / "resolved.conf"
     resolved.write_text(
         """
@@ -112,22 +113,24 @@ ReadEtcHosts=perhaps
 """.strip()
     )
 
-    logger = _StubLogger()
+    logger = RecordingLogger()
     report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=_StubShell({}), logger=logger)
 
     assert report.available is False
     assert len(report.config_issues) >= 5
-    assert any("invalid address '127.0.0.300'" in issue for issue in report.config_issues)
-    assert any("DNSSEC" in issue for issue in report.config_issues)
-    assert any("DNSOverTLS" in issue for issue in report.config_issues)
+    issues_text = "\n".join(report.config_issues)
+    assert "invalid address '127.0.0.300'" in issues_text
+    assert "DNSSEC" in issues_text
+    assert "DNSOverTLS" in issues_text
+    assert f"{resolved}: DNSSEC should be one of ['allow-downgrade', 'no', 'yes'], got 'maybe'" in report.config_issues
     assert any(issue.startswith(str(resolved)) for issue in report.config_issues)
-    assert any("[FAIL]" in msg for msg in logger.messages)
+    assert logger.contains("[FAIL]")
 
 
 def test_validate_systemd_tree_accepts_valid_resolved_conf(monkeypatch, tmp_path):
     """Well-formed resolved.conf entries should not produce issues."""
 
-    monkeypatch.setattr(sv.shutil, "which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
     resolved = tmp_path / "resolved.conf"
     resolved.write_text(
         """
@@ -143,7 +146,7 @@ ReadEtcHosts=yes
 """.strip()
     )
 
-    report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=_StubShell({}), logger=_StubLogger())
+    report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=_StubShell({}), logger=RecordingLogger())
 
     assert report.available is True
     assert report.config_issues == []
@@ -161,9 +164,228 @@ def test_validate_resolved_conf_flags_empty_dns_when_resolution_fails(tmp_path):
         calls.append(host)
         return False
 
-    logger = _StubLogger()
+    logger = RecordingLogger()
     issues = sv.validate_resolved_conf(str(tmp_path), logger=logger, resolver=fake_resolver)
 
     assert any("empty" in issue and "example.com" in issue for issue in issues)
     assert calls == ["example.com"]
-    assert any("[FAIL]" in msg for msg in logger.messages)
+    assert logger.contains("[FAIL]")
+
+
+def test_validate_resolved_conf_ignores_missing_file(tmp_path):
+    """A tree without resolved.conf has nothing to lint."""
+
+    logger = RecordingLogger()
+
+    assert sv.validate_resolved_conf(str(tmp_path), logger=logger) == []
+    assert not logger.messages
+
+
+def test_validate_systemd_tree_skips_missing_base_dir(monkeypatch, tmp_path):
+    """A missing tree returns an empty report without probing for tools."""
+
+    def fail_which(name: str) -> str:
+        raise AssertionError(f"unexpected lookup of {name}")
+
+    monkeypatch.setattr(shutil, "which", fail_which)
+    logger = RecordingLogger()
+
+    report = sv.validate_systemd_tree(str(tmp_path / "missing"), shell=_StubShell({}), logger=logger)
+
+    assert report == sv.SystemdValidationReport(available=False, unit_files=[], validations=[], config_issues=[])
+    assert logger.contains("does not exist")
+
+
+def test_validate_systemd_tree_falls_back_to_per_file_runs(monkeypatch, tmp_path):
+    """A failed batch without attributable diagnostics should retry each file."""
+
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    first = tmp_path / "a.service"
+    first.write_text("[Unit]\n")
+    second = tmp_path / "b.service"
+    second.write_text("[Unit]\n")
+
+    ok = CommandResult(cmd=[], returncode=0, stdout="", stderr="")
+    shell = _StubShell(
+        {
+            str(first): ok,
+            str(second): CommandResult(cmd=[], returncode=124, stdout="", stderr="timed out"),
+        }
+    )
+    # The batch command also ends with the second path, so it reports the timeout.
+    report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=RecordingLogger())
+
+    assert shell.calls[0][0] == ["systemd-analyze", "verify", str(first), str(second)]
+    # The per-file runs happen concurrently, so only their set is deterministic.
+    assert sorted(call[0] for call in shell.calls[1:]) == [
+        ["systemd-analyze", "verify", str(first)],
+        ["systemd-analyze", "verify", str(second)],
+    ]
+    assert [v.result.returncode for v in report.validations] == [0, 124]
+
+
+def test_validate_systemd_tree_keeps_warning_only_files_ok(monkeypatch, tmp_path):
+    """Warnings attributed to a file should be kept without failing it."""
+
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    warned = tmp_path / "a.service"
+    warned.write_text("[Unit]\n")
+    broken = tmp_path / "b.service"
+    broken.write_text("[Unit]\n")
+    warning = f"{warned}:2: Unknown key name 'Foo' in section 'Unit', ignoring."
+    batch = CommandResult(
+        cmd=[], returncode=1, stdout="", stderr=f"{warning}\nb.service: Command /bin/nope is not executable.\n"
+    )
+    shell = _StubShell({str(broken): batch})
+
+    report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=RecordingLogger())
+
+    assert len(shell.calls) == 1
+    results = {v.path: v.result for v in report.validations}
+    assert results[str(warned)].returncode == 0
+    assert results[str(warned)].stderr == warning
+    assert results[str(broken)].returncode == 1
+
+
+def test_validate_systemd_tree_retries_when_batch_error_names_no_file(monkeypatch, tmp_path):
+    """An unattributed error in a failed batch should not be dropped in favour of per-file lines."""
+
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    first = tmp_path / "a.service"
+    first.write_text("[Unit]\n")
+    second = tmp_path / "b.service"
+    second.write_text("[Unit]\n")
+
+    batch = CommandResult(
+        cmd=[], returncode=1, stdout="", stderr=f"{first}:1: invalid section\nFailed to initialize manager: Bad\n"
+    )
+    shell = _StubShell({str(first): CommandResult(cmd=[], returncode=1, stdout="", stderr="bad"), str(second): batch})
+
+    report = sv.validate_systemd_tree(base_dir=str(tmp_path), shell=shell, logger=RecordingLogger())
+
+    assert len(shell.calls) == 3
+    assert [v.result.returncode for v in report.validations] == [1, 1]
+
+
+def test_systemd_tools_available_looks_up_path_once(monkeypatch):
+    """Repeated availability checks should reuse the first PATH lookup."""
+
+    lookups: list[str] = []
+
+    def fake_which(name: str) -> str:
+        lookups.append(name)
+        return f"/usr/bin/{name}"
+
+    monkeypatch.setattr(shutil, "which", fake_which)
+
+    assert sv.systemd_tools_available() is True
+    assert sv.systemd_tools_available() is True
+    assert lookups == ["systemctl", "systemd-analyze"]
+
+
+def test_find_systemd_unit_files_keeps_symlinks_without_descending(tmp_path):
+    """Enablement symlinks count as unit files; symlinked directories are not walked."""
+
+    target = tmp_path / "lib" / "foo.service"
+    target.parent.mkdir()
+    target.write_text("[Unit]\n")
+    wants = tmp_path / "etc" / "multi-user.target.wants"
+    wants.mkdir(parents=True)
+    (wants / "foo.service").symlink_to(target)
+    (tmp_path / "etc" / "linked").symlink_to(target.parent)
+
+    assert sv.find_systemd_unit_files(str(tmp_path / "etc")) == [str(wants / "foo.service")]
+
+
+def test_parse_systemd_ini_merges_sections_and_rejects_stray_lines():
+    """The systemd INI parser should merge repeats and reject malformed lines."""
+
+    text = "# comment\n[Resolve]\nDNS = 1.1.1.1\n; note\n[Resolve]\nDNS=9.9.9.9\nLLMNR=no\n"
+
+    assert sv.parse_systemd_ini(text) == {"Resolve": {"DNS": "9.9.9.9", "LLMNR": "no"}}
+
+    for bad in ("DNS=1.1.1.1\n", "[Resolve]\njust words\n", "[Resolve]\n=value\n"):
+        with pytest.raises(ValueError):
+            sv.parse_systemd_ini(bad)
+
+
+def test_can_resolve_host_reuses_recent_result(monkeypatch):
+    """Resolver health checks should be cached for the TTL."""
+
+    lookups: list[tuple[str, float]] = []
+
+    def fake_dns_resolves(name: str, timeout: float) -> bool:
+        lookups.append((name, timeout))
+        return True
+
+    monkeypatch.setattr(sv, "dns_resolves", fake_dns_resolves)
+    monkeypatch.setattr(sv, "_RESOLVE_CACHE", {})
+
+    assert sv._can_resolve_host("example.com") is True
+    assert sv._can_resolve_host("example.com") is True
+    assert lookups == [("example.com", sv._RESOLVE_TIMEOUT)]
+
+
+def test_validate_systemd_tree_skips_unchanged_files_with_cache(monkeypatch, tmp_path):
+    """A second run should reuse cached verdicts until a file changes."""
+
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    units = tmp_path / "units"
+    units.mkdir()
+    unit = units / "a.service"
+    unit.write_text("[Unit]\n")
+    cache_path = str(tmp_path / "cache" / "verify.json")
+    ok = CommandResult(cmd=[], returncode=0, stdout="", stderr="")
+
+    shell = _StubShell({str(unit): ok})
+    sv.validate_systemd_tree(base_dir=str(units), shell=shell, logger=RecordingLogger(), cache_path=cache_path)
+    report = sv.validate_systemd_tree(base_dir=str(units), shell=shell, logger=RecordingLogger(), cache_path=cache_path)
+
+    assert len(shell.calls) == 1
+    assert report.validations[0].result.returncode == 0
+
+    unit.write_text("[Unit]\nDescription=changed\n")
+    sv.validate_systemd_tree(base_dir=str(units), shell=shell, logger=RecordingLogger(), cache_path=cache_path)
+
+    assert len(shell.calls) == 2
+
+
+def test_validate_systemd_tree_reverifies_corrupt_cache_entries(monkeypatch, tmp_path):
+    """Malformed cache entries should count as misses instead of crashing the run."""
+
+    monkeypatch.setattr(shutil, "which", lambda name: f"/usr/bin/{name}")
+    units = tmp_path / "units"
+    units.mkdir()
+    unit = units / "a.service"
+    unit.write_text("[Unit]\n")
+    key = sv._verify_cache_key(str(unit))
+    cache_file = tmp_path / "verify.json"
+    ok = CommandResult(cmd=[], returncode=0, stdout="", stderr="")
+
+    for entry in ("stale", {"returncode": "0", "stderr": ""}, {"returncode": 0}, {"stderr": ""}):
+        cache_file.write_text(json.dumps({key: entry}))
+        shell = _StubShell({str(unit): ok})
+        report = sv.validate_systemd_tree(
+            base_dir=str(units), shell=shell, logger=RecordingLogger(), cache_path=str(cache_file)
+        )
+
+        assert len(shell.calls) == 1
+        assert report.validations[0].result.returncode == 0
+
+
+@pytest.mark.parametrize(("use_cache", "expected"), [(False, None), (True, sv.SYSTEMD_VERIFY_CACHE)])
+def test_validate_systemd_command_caches_only_on_request(monkeypatch, tmp_path, use_cache, expected):
+    """validate-systemd should only pass a cache path when --cache is given."""
+
+    seen: list[str | None] = []
+
+    def _fake_validate(base_dir, cache_path=None):
+        seen.append(cache_path)
+        return sv.SystemdValidationReport(available=True, unit_files=[], validations=[], config_issues=[])
+
+    monkeypatch.setattr(cli, "validate_systemd_tree", _fake_validate)
+
+    with pytest.raises(typer.Exit):
+        cli.cli._validate_systemd(path=str(tmp_path), cache=use_cache)
+
+    assert seen == [expected]
@@ -3,13 +3,24 @@
 from __future__ import annotations
 
 import shutil
+import socket
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
 
+import pytest
+
+from automatic_linux_network_repair import wifi
+from automatic_linux_network_repair.eth_repair.shell import which
 from automatic_linux_network_repair.eth_repair.types import CommandResult
 from automatic_linux_network_repair.wifi import (
+    ConnectionResult,
+    IwctlBackend,
     IwlistBackend,
     NmcliBackend,
     SecurityType,
     WirelessManager,
+    WirelessNetwork,
     WpaCliBackend,
 )
 from tests.helpers import RecordingLogger
@@ -19,20 +30,108 @@ from tests.helpers import RecordingLogger
 TEST_WEP_KEY = "example-wep-key"
 TEST_WPA_KEY = "example-wpa-key-12345678"
 
+NMCLI_SCAN = (
+    "nmcli",
+    "-t",
+    "-e",
+    "no",
+    "-f",
+    "BSSID,SECURITY,SIGNAL,SSID",
+    "--separator",
+    "|",
+    "device",
+    "wifi",
+    "list",
+)
+
+
+_NO_RESPONSES: Mapping[tuple[str, ...], CommandResult] = MappingProxyType({})
+
+_WPA_CLI_ADD = ("wpa_cli", "-i", "wlan0", "add_network")
+_WPA_CLI_BATCH = ("wpa_cli", "-i", "wlan0")
+
+_WPA_CLI_WEP_RESPONSES = MappingProxyType(
+    {
+        _WPA_CLI_ADD: CommandResult(cmd=[], returncode=0, stdout="0\n", stderr=""),
+        _WPA_CLI_BATCH: CommandResult(
+            cmd=[],
+            returncode=0,
+            stdout="wpa_cli v2.10\n\nInteractive mode\n\n> OK\n> OK\n> OK\n> OK\n> OK\n> OK\n> ",
+            stderr="",
+        ),
+    }
+)
+
+_WPA_CLI_REJECTED_RESPONSES = MappingProxyType(
+    {
+        _WPA_CLI_ADD: CommandResult(cmd=[], returncode=0, stdout="3\n", stderr=""),
+        _WPA_CLI_BATCH: CommandResult(cmd=[], returncode=0, stdout="> OK\n> OK\n> FAIL\n", stderr=""),
+    }
+)
+
 
 class DummyShell:
     """Record issued commands and return canned results."""
 
-    def __init__(self, responses: dict[tuple[str, ...], CommandResult] | None = None):
-        self.responses = responses or {}
+    def __init__(self, responses: Mapping[tuple[str, ...], CommandResult] | None = None):
+        self.responses = responses or _NO_RESPONSES
         self.calls: list[list[str]] = []
+        self.inputs: list[str | None] = []
 
-    def run_cmd(self, cmd: list[str], timeout: int = 5) -> CommandResult:  # pragma: no cover - exercised in tests
+    def run_cmd(
+        self, cmd: list[str], timeout: int = 5, input: str | None = None
+    ) -> CommandResult:  # pragma: no cover - exercised in tests
         self.calls.append(cmd)
-        key = tuple(cmd)
-        if key in self.responses:
-            return self.responses[key]
-        return CommandResult(cmd=list(cmd), returncode=1, stdout="", stderr="missing response")
+        self.inputs.append(input)
+        result = self.responses.get(tuple(cmd))
+        if result is None:
+            return CommandResult(cmd=list(cmd), returncode=1, stdout="", stderr="missing response")
+        return result
+
+
+@pytest.fixture(autouse=True)
+def _fresh_which_cache():
+    """Each test patches shutil.which, so drop memoized PATH lookups."""
+
+    which.cache_clear()
+    yield
+    which.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def _no_wpa_ctrl_socket(monkeypatch, tmp_path):
+    """Keep wpa_cli tests on the subprocess path even where wpa_supplicant runs."""
+
+    monkeypatch.setattr(wifi, "_WPA_CTRL_DIR", str(tmp_path / "no-wpa-ctrl"))
+
+
+class _FakeSupplicant:
+    """Datagram control socket that answers each request from a script."""
+
+    def __init__(self, path: str, replies: dict[str, str]):
+        self.requests: list[str] = []
+        self._replies = replies
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.bind(path)
+        self._sock.settimeout(0.05)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while not self._stop.is_set():
+            try:
+                data, sender = self._sock.recvfrom(4096)
+            except TimeoutError:
+                continue
+            request = data.decode()
+            self.requests.append(request)
+            self._sock.sendto(self._replies.get(request.split(" ", 1)[0], "OK").encode() + b"\n", sender)
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join(timeout=5)
+        self._sock.close()
 
 
 def test_security_from_label_aliases():
@@ -42,28 +141,18 @@ def test_security_from_label_aliases():
     assert SecurityType.from_label("wpa-1") == SecurityType.WPA
     assert SecurityType.from_label("sae") == SecurityType.WPA3
     assert SecurityType.from_label(None) == SecurityType.WPA2
+    assert SecurityType.from_label("WPA_3") == SecurityType.WPA3
+    assert SecurityType.from_label("bogus") == SecurityType.WPA2
 
 
 def test_nmcli_scan_parses_networks():
     """nmcli scan output should be parsed into WirelessNetwork objects."""
 
     responses = {
-        (
-            "nmcli",
-            "-t",
-            "-f",
-            "BSSID,SSID,SECURITY,SIGNAL",
-            "--separator",
-            "|",
-            "device",
-            "wifi",
-            "list",
-            "ifname",
-            "wlan0",
-        ): CommandResult(
+        (*NMCLI_SCAN, "ifname", "wlan0", "--rescan", "auto"): CommandResult(
             cmd=[],
             returncode=0,
-            stdout="AA:BB|Home|WPA2 WPA3|70\n|Cafe|OPEN|45\n",
+            stdout="AA:BB:CC:DD:EE:FF|WPA2 WPA3|70|Home\n|OPEN|45|Cafe|Bar\n",
             stderr="",
         )
     }
@@ -74,47 +163,31 @@ def test_nmcli_scan_parses_networks():
 
     assert len(nets) == 2
     assert nets[0].ssid == "Home"
-    assert nets[0].bssid == "AA:BB"
+    assert nets[0].bssid == "AA:BB:CC:DD:EE:FF"
     assert nets[0].security == ["WPA2", "WPA3"]
-    assert nets[1].ssid == "Cafe"
+    assert nets[1].ssid == "Cafe|Bar"
+    assert nets[1].bssid is None
 
 
-def test_wpa_cli_connect_configures_wep(monkeypatch):
-    """Connecting with WEP should push correct wpa_cli commands."""
+def test_nmcli_scan_pads_short_rows():
+    """Rows missing trailing fields should still yield a network entry."""
 
     responses = {
-        ("wpa_cli", "-i", "wlan0", "add_network"): CommandResult(cmd=[], returncode=0, stdout="0\n", stderr=""),
-        ("wpa_cli", "-i", "wlan0", "set_network", "0", "ssid", '"Cafe"'): CommandResult(
-            cmd=[], returncode=0, stdout="OK\n", stderr=""
-        ),
-        ("wpa_cli", "-i", "wlan0", "set_network", "0", "scan_ssid", "1"): CommandResult(
-            cmd=[], returncode=0, stdout="OK\n", stderr=""
-        ),
-        ("wpa_cli", "-i", "wlan0", "set_network", "0", "key_mgmt", "NONE"): CommandResult(
-            cmd=[], returncode=0, stdout="OK\n", stderr=""
-        ),
-        (
-            "wpa_cli",
-            "-i",
-            "wlan0",
-            "set_network",
-            "0",
-            "wep_key0",
-            f'"{TEST_WEP_KEY}"',
-        ): CommandResult(
-            cmd=[],
-            returncode=0,
-            stdout="OK\n",
-            stderr="",
-        ),
-        ("wpa_cli", "-i", "wlan0", "enable_network", "0"): CommandResult(
-            cmd=[], returncode=0, stdout="OK\n", stderr=""
-        ),
-        ("wpa_cli", "-i", "wlan0", "select_network", "0"): CommandResult(
-            cmd=[], returncode=0, stdout="OK\n", stderr=""
-        ),
+        (*NMCLI_SCAN, "ifname", "wlan0", "--rescan", "yes"): CommandResult(
+            cmd=[], returncode=0, stdout="AA:BB|WPA2\n   \n", stderr=""
+        )
     }
-    shell = DummyShell(responses)
+    backend = NmcliBackend(shell=DummyShell(responses), logger=RecordingLogger())
+
+    assert backend.scan("wlan0", rescan=True) == [
+        WirelessNetwork(ssid="", bssid="AA:BB", signal=None, security=["WPA2"])
+    ]
+
+
+def test_wpa_cli_connect_configures_wep():
+    """Connecting with WEP should push correct wpa_cli commands in one batch."""
+
+    shell = DummyShell(_WPA_CLI_WEP_RESPONSES)
     backend = WpaCliBackend(shell=shell, logger=RecordingLogger())
 
     result = backend.connect(
@@ -125,7 +198,54 @@ def test_wpa_cli_connect_configures_wep(monkeypatch):
     )
 
     assert result.success is True
-    assert any("wep_key0" in cmd for cmd in shell.calls)
+    assert shell.calls == [list(_WPA_CLI_ADD), list(_WPA_CLI_BATCH)]
+    assert shell.inputs[1] == (
+        'set_network 0 ssid "Cafe"\n'
+        "set_network 0 scan_ssid 1\n"
+        "set_network 0 key_mgmt NONE\n"
+        f'set_network 0 wep_key0 "{TEST_WEP_KEY}"\n'
+        "enable_network 0\n"
+        "select_network 0\n"
+    )
+
+
+def test_wpa_cli_connect_reports_rejected_command():
+    """A FAIL reply should name the rejected command without leaking the key."""
+
+    backend = WpaCliBackend(shell=DummyShell(_WPA_CLI_REJECTED_RESPONSES), logger=RecordingLogger())
+
+    result = backend.connect("wlan0", "Home", TEST_WPA_KEY, SecurityType.WPA2)
+
+    assert result.success is False
+    assert result.message == "wpa_cli rejected set_network 3 psk"
+
+
+def test_wpa_cli_connect_uses_control_socket_when_present(monkeypatch, tmp_path):
+    """A live wpa_supplicant control socket should replace the wpa_cli subprocesses."""
+
+    ctrl_dir = tmp_path / "ctrl"
+    ctrl_dir.mkdir()
+    monkeypatch.setattr(wifi, "_WPA_CTRL_DIR", str(ctrl_dir))
+    supplicant = _FakeSupplicant(str(ctrl_dir / "wlan0"), {"ADD_NETWORK": "4"})
+    shell = DummyShell()
+    backend = WpaCliBackend(shell=shell, logger=RecordingLogger())
+
+    try:
+        result = backend.connect("wlan0", "Home", TEST_WPA_KEY, SecurityType.WPA2)
+    finally:
+        supplicant.close()
+
+    assert result == ConnectionResult("wpa_cli", True, "Connected")
+    assert shell.calls == []
+    assert supplicant.requests == [
+        "ADD_NETWORK",
+        'SET_NETWORK 4 ssid "Home"',
+        "SET_NETWORK 4 scan_ssid 1",
+        f'SET_NETWORK 4 psk "{TEST_WPA_KEY}"',
+        "SET_NETWORK 4 key_mgmt WPA-PSK",
+        "ENABLE_NETWORK 4",
+        "SELECT_NETWORK 4",
+    ]
 
 
 def test_manager_prefers_available_backends(monkeypatch):
@@ -145,6 +265,60 @@ def test_manager_prefers_available_backends(monkeypatch):
     assert called[:2] == ["nmcli", "iwctl"]
 
 
+def test_iwctl_scan_slices_table_columns():
+    """iwctl rows should be split by header offsets, keeping spaces in SSIDs."""
+
+    stdout = (
+        "                               Available networks\n"
+        "--------------------------------------------------------------------------------\n"
+        "      Network name                      Security            Signal\n"
+        "--------------------------------------------------------------------------------\n"
+        "  \x1b[1;90m>\x1b[0m   Home                              psk                 ****\n"
+        "      Corner Cafe                       open                \x1b[1;90m**\x1b[0m\n"
+        "\n"
+    )
+    responses = {
+        ("iwctl", "station", "wlan0", "scan"): CommandResult(cmd=[], returncode=0, stdout="", stderr=""),
+        ("iwctl", "station", "wlan0", "get-networks"): CommandResult(cmd=[], returncode=0, stdout=stdout, stderr=""),
+    }
+    backend = IwctlBackend(shell=DummyShell(responses), logger=RecordingLogger())
+
+    nets = backend.scan("wlan0")
+
+    assert [(net.ssid, net.security, net.signal) for net in nets] == [
+        ("Home", ["psk"], None),
+        ("Corner Cafe", ["open"], None),
+    ]
+
+
+def test_iwlist_scan_groups_fields_by_cell():
+    """Quality and encryption should belong to the cell they appear in."""
+
+    stdout = """wlan0     Scan completed :
+          Cell 01 - Address: AA:BB:CC:DD:EE:01
+                    Channel:6
+                    Quality=70/70  Signal level=-40 dBm
+                    Encryption key:on
+                    ESSID:"Home"
+          Cell 02 - Address: AA:BB:CC:DD:EE:02
+                    Quality=30/70  Signal level=-80 dBm
+                    Encryption key:off
+                    ESSID:"Cafe"
+          Cell 03 - Address: AA:BB:CC:DD:EE:03
+                    Encryption key:on
+                    ESSID:""
+"""
+    responses = {("iwlist", "wlan0", "scanning"): CommandResult(cmd=[], returncode=0, stdout=stdout, stderr="")}
+    backend = IwlistBackend(shell=DummyShell(responses), logger=RecordingLogger())
+
+    nets = backend.scan("wlan0")
+
+    assert nets == [
+        WirelessNetwork(ssid="Home", bssid="AA:BB:CC:DD:EE:01", signal=70, security=["wep"]),
+        WirelessNetwork(ssid="Cafe", bssid="AA:BB:CC:DD:EE:02", signal=30, security=["open"]),
+    ]
+
+
 def test_iwlist_backend_rejects_secure_connect():
     """iwlist/iwconfig backend should fail for unsupported secure networks."""
 
@@ -218,3 +392,204 @@ def test_detect_interface_uses_ip_link(monkeypatch):
     manager = WirelessManager(shell=DummyShell(responses), logger=RecordingLogger())
 
     assert manager.detect_interface() == "wlp5s0"
+
+
+class CountingBackend(NmcliBackend):
+    """Backend stub that counts scans and always connects."""
+
+    def __init__(self) -> None:
+        super().__init__(shell=DummyShell(), logger=RecordingLogger())
+        self.scans = 0
+        self.rescans = 0
+
+    def scan(self, interface: str, *, rescan: bool = False):
+        self.scans += 1
+        self.rescans += rescan
+        return [WirelessNetwork(ssid="Home", bssid=None, signal=70, security=["WPA2"])]
+
+    def connect(self, interface, ssid, password, security):
+        return ConnectionResult(self.name, True, "Connected")
+
+
+def test_manager_scan_reuses_recent_results():
+    """Repeated scans within the TTL should not call the backend again."""
+
+    backend = CountingBackend()
+    manager = WirelessManager(shell=DummyShell(), logger=RecordingLogger(), backends=[backend])
+
+    first = manager.scan("wlan0")
+    second = manager.scan("wlan0")
+
+    assert first == second
+    assert backend.scans == 1
+
+    manager.scan("wlan0", force_refresh=True)
+    assert backend.scans == 2
+    assert backend.rescans == 1
+
+    manager.scan("wlan1")
+    assert backend.scans == 3
+
+
+def test_manager_scan_cache_expires_and_clears_on_connect():
+    """Expired entries and successful connections should force a fresh scan."""
+
+    backend = CountingBackend()
+    manager = WirelessManager(shell=DummyShell(), logger=RecordingLogger(), backends=[backend], scan_ttl=0.0)
+
+    manager.scan("wlan0")
+    manager.scan("wlan0")
+    assert backend.scans == 2
+    assert manager._scan_pending == {}
+
+    manager.scan_ttl = 60.0
+    manager.scan("wlan0")
+    assert backend.scans == 2
+
+    manager.connect("wlan0", "Home", password=TEST_WPA_KEY)
+    manager.scan("wlan0")
+    assert backend.scans == 3
+
+
+def test_detect_interface_is_remembered(monkeypatch, tmp_path):
+    """A detected interface and PATH lookups should be reused on later calls."""
+
+    (tmp_path / "wlan1").mkdir()
+    monkeypatch.setattr(wifi, "_SYS_CLASS_NET", str(tmp_path))
+
+    responses = {("iw", "dev"): CommandResult(cmd=[], returncode=0, stdout="\tInterface wlan1\n", stderr="")}
+    looked_up: list[str] = []
+
+    def fake_which(binary: str):
+        looked_up.append(binary)
+        return f"/usr/bin/{binary}" if binary == "iw" else None
+
+    monkeypatch.setattr(shutil, "which", fake_which)
+    shell = DummyShell(responses)
+    manager = WirelessManager(shell=shell, logger=RecordingLogger())
+
+    assert manager.detect_interface() == "wlan1"
+    assert manager.detect_interface() == "wlan1"
+    assert shell.calls == [["iw", "dev"]]
+    assert looked_up.count("iw") == 1
+
+    uncached = WirelessManager(shell=shell, logger=RecordingLogger(), cache_interface=False)
+    uncached.detect_interface()
+    uncached.detect_interface()
+    assert shell.calls.count(["iw", "dev"]) == 3
+    assert looked_up.count("iw") == 1
+
+
+def test_backends_share_a_lazily_created_default_logger():
+    """Backends built without a logger should share one fallback instance."""
+
+    first = NmcliBackend(shell=DummyShell())
+    second = IwlistBackend(shell=DummyShell())
+
+    assert first.logger is second.logger
+    assert WirelessManager(shell=DummyShell(), backends=[first]).logger is not first.logger
+
+
+def test_manager_scan_refreshes_stale_results_in_background(monkeypatch):
+    """Stale entries are served while refreshing; expired ones block for a new scan."""
+
+    clock = [0.0]
+    monkeypatch.setattr(wifi.time, "monotonic", lambda: clock[0])
+    backend = CountingBackend()
+    manager = WirelessManager(shell=DummyShell(), logger=RecordingLogger(), backends=[backend], scan_ttl=10.0)
+
+    first = manager.scan("wlan0")
+    clock[0] = 6.0
+    stale = manager.scan("wlan0")
+    pending = manager._scan_pending[("nmcli", "wlan0")]
+    manager.close(timeout=5)
+
+    assert stale == first
+    assert pending.daemon
+    assert backend.scans == 2
+    assert manager._scan_pending == {}
+
+    clock[0] = 60.0
+    manager.scan("wlan0")
+
+    assert backend.scans == 3
+    assert manager._scan_pending == {}
+
+
+def test_manager_tries_preferred_backend_first():
+    """A known preferred backend should lead; unknown names keep the default order."""
+
+    nmcli = NmcliBackend(shell=DummyShell())
+    iwlist = IwlistBackend(shell=DummyShell())
+    manager = WirelessManager(shell=DummyShell(), backends=[nmcli, iwlist])
+
+    assert list(manager._candidate_backends("iwlist")) == [iwlist, nmcli]
+    assert list(manager._candidate_backends("iwctl")) == [nmcli, iwlist]
+    assert list(manager._candidate_backends(None)) == [nmcli, iwlist]
+
+
+def test_scan_result_types_use_slots():
+    """Scan and connection results should not carry a per-instance __dict__."""
+
+    network = WirelessNetwork(ssid="Home", bssid=None, signal=70, security=["WPA2"])
+    result = ConnectionResult("nmcli", True, "Connected")
+
+    assert not hasattr(network, "__dict__")
+    assert not hasattr(result, "__dict__")
+
+
+def test_manager_scan_orders_by_signal():
+    """Scan results should come back strongest first with unknown signals last."""
+
+    class UnsortedBackend(CountingBackend):
+        def scan(self, interface: str, *, rescan: bool = False):
+            return [
+                WirelessNetwork(ssid="Weak", bssid=None, signal=20, security=[]),
+                WirelessNetwork(ssid="Hidden", bssid=None, signal=None, security=[]),
+                WirelessNetwork(ssid="Strong", bssid=None, signal=80, security=[]),
+            ]
+
+    manager = WirelessManager(shell=DummyShell(), logger=RecordingLogger(), backends=[UnsortedBackend()])
+
+    assert [net.ssid for net in manager.scan("wlan0")] == ["Strong", "Weak", "Hidden"]
+
+
+def test_detect_interface_redetects_when_interface_vanishes(monkeypatch, tmp_path):
+    """A remembered name should be dropped once sysfs no longer lists it."""
+
+    responses = {("iw", "dev"): CommandResult(cmd=[], returncode=0, stdout="\tInterface wlan1\n", stderr="")}
+    monkeypatch.setattr(shutil, "which", lambda binary: "/usr/bin/iw" if binary == "iw" else None)
+    monkeypatch.setattr(wifi, "_SYS_CLASS_NET", str(tmp_path))
+    (tmp_path / "wlan1").mkdir()
+    shell = DummyShell(responses)
+    manager = WirelessManager(shell=shell, logger=RecordingLogger())
+
+    manager.detect_interface()
+    manager.detect_interface()
+    assert len(shell.calls) == 1
+
+    (tmp_path / "wlan1").rmdir()
+    manager.detect_interface()
+    assert len(shell.calls) == 2
+
+    (tmp_path / "wlan1").mkdir()
+    manager.invalidate_interface_cache()
+    manager.detect_interface()
+    assert len(shell.calls) == 3
+
+
+def test_manager_scan_collapses_duplicate_rows():
+    """Repeated SSID/BSSID rows should collapse, keeping the strongest entry."""
+
+    class DuplicateBackend(CountingBackend):
+        def scan(self, interface: str, *, rescan: bool = False):
+            return [
+                WirelessNetwork(ssid="Office", bssid="AA:01", signal=40, security=["WPA2"]),
+                WirelessNetwork(ssid="Office", bssid="AA:02", signal=75, security=["WPA2"]),
+                WirelessNetwork(ssid="Office", bssid="AA:02", signal=75, security=["WPA2"]),
+            ]
+
+    manager = WirelessManager(shell=DummyShell(), logger=RecordingLogger(), backends=[DuplicateBackend()])
+
+    assert [net.bssid for net in manager.scan("wlan0")] == ["AA:02", "AA:01"]
+    assert [net.bssid for net in manager.scan("wlan0", unique_by="ssid")] == ["AA:02"]